@@ -5,18 +5,43 @@
 import pandas as pd
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse, urljoin
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, FeatureNotFound
 import re
+import json
 from datetime import datetime, timedelta
 import time
 import os
+import socket
+import threading
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+from http_cache import HttpCache
+from http_pool import PortalSessionPool
+from detail_queue import DetailFetchQueue
+from skill_matcher import SkillMatcher
+from row_checkpoint import RowCheckpoint
+from job_history import JobHistoryStore, canonical_job_url
+from job_dedup import assign_canonical_job_ids, dedup_summary
+from page_archive import PageArchive
+from crawl_telemetry import CrawlTelemetry, url_hash
+from province_resolver import ProvinceResolver
+from rate_controller import AdaptiveRateController, parse_retry_after
+from search_prefetch import SearchPagePrefetcher
+from task_queue import CrawlTaskQueue
+from thai_dates import parse_jobbkk_posted_dates, parse_jobsdb_posted_dates, parse_jobthai_posted_dates
+
+# The crawl cells only run when this file is executed (script or notebook); importing it
+# (benchmarks, maintenance commands) just loads the functions and settings.
+RUN_SCRAPE = __name__ == "__main__"
+
 BASE_DIR = Path(__file__).resolve().parent
-SCRAPED_EACH_DIR = BASE_DIR / "Scraped_Each"
-SCRAPED_ALL_DIR = BASE_DIR / "Scraped_All"
+# SCRAPE_OUTPUT_DIR moves the CSV/Parquet/history/checkpoint output elsewhere (e.g. offline load tests).
+OUTPUT_DIR = Path(os.getenv("SCRAPE_OUTPUT_DIR", str(BASE_DIR)))
+SCRAPED_EACH_DIR = OUTPUT_DIR / "Scraped_Each"
+SCRAPED_ALL_DIR = OUTPUT_DIR / "Scraped_All"
+CHECKPOINT_DIR = OUTPUT_DIR / "Checkpoints"
 SCRAPED_EACH_DIR.mkdir(parents=True, exist_ok=True)
 SCRAPED_ALL_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -215,6 +240,14 @@ EN_TO_THAI_PROVINCE = {
     "yasothon": "ยโสธร"
 }
 
+THAI_PROVINCE_ALIASES = {
+    "กรุงเทพฯ": "กรุงเทพมหานคร",
+    "กทม.": "กรุงเทพมหานคร",
+    "โคราช": "นครราชสีมา",
+}
+
+PROVINCE_RESOLVER = ProvinceResolver(EN_TO_THAI_PROVINCE, THAI_PROVINCE_ALIASES)
+
 headers = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
     "Accept-Language": "th-TH,th;q=0.9,en-US;q=0.8,en;q=0.7",
@@ -226,14 +259,446 @@ JOBSDB_PROXIES = {
 }
 JOBSDB_PROXIES = {k: v for k, v in JOBSDB_PROXIES.items() if v}
 
+# Detail phase: DETAIL_WORKERS > 1 fetches detail pages concurrently.
+DETAIL_WORKERS = int(os.getenv("DETAIL_WORKERS", "1"))
+
+# Every portal request is paced per host by an adaptive (AIMD) rate controller. It starts at RATE_INITIAL_QPS,
+# adds RATE_INCREASE_QPS after each healthy response up to RATE_MAX_QPS, and multiplies the rate by
+# RATE_DECREASE_FACTOR on 403/429/5xx, failed requests or latency above RATE_LATENCY_FACTOR x the host's average
+# (never below RATE_MIN_QPS). Retry-After is honoured; ADAPTIVE_RATE=0 keeps a fixed RATE_INITIAL_QPS.
+# 429/5xx responses, timeouts and dropped connections are retried up to PORTAL_RETRIES times by portal_get, the
+# only retry layer (the connection pool itself only retries connections that could not be opened).
+ADAPTIVE_RATE = os.getenv("ADAPTIVE_RATE", "1").strip() != "0"
+RATE_INITIAL_QPS = float(os.getenv("RATE_INITIAL_QPS", "2"))
+RATE_MIN_QPS = float(os.getenv("RATE_MIN_QPS", "0.2"))
+RATE_MAX_QPS = float(os.getenv("RATE_MAX_QPS", "5"))
+RATE_INCREASE_QPS = float(os.getenv("RATE_INCREASE_QPS", "0.1"))
+RATE_DECREASE_FACTOR = float(os.getenv("RATE_DECREASE_FACTOR", "0.5"))
+RATE_LATENCY_FACTOR = float(os.getenv("RATE_LATENCY_FACTOR", "2"))
+PORTAL_RETRIES = int(os.getenv("PORTAL_RETRIES", "2"))
+
+# CRAWL_ENGINE="async" crawls every portal in one event loop instead of portal by portal,
+# with at most ASYNC_DOMAIN_CONCURRENCY requests in flight per domain (paced by the rate controller).
+CRAWL_ENGINE = os.getenv("CRAWL_ENGINE", "sequential").strip().lower()
+ASYNC_DOMAIN_CONCURRENCY = int(os.getenv("ASYNC_DOMAIN_CONCURRENCY", "4"))
+
+# CRAWL_ENGINE="queue" runs the crawl as (portal, keyword, page) and (portal, detail URL) tasks in the SQLite task
+# queue at TASK_QUEUE_PATH (task_queue.py), worked by QUEUE_WORKERS threads. Every process or runner started with the
+# same QUEUE_RUN_ID works on the same crawl (QUEUE_DOMAINS=JobsDB,JOBBKK limits one to some portals), and an
+# interrupted crawl resumes where it stopped when it is started again with that id. Tasks are leased for
+# QUEUE_LEASE_SECONDS and tried QUEUE_MAX_ATTEMPTS times. Request pacing is per process. Each runner waits until
+# the run's tasks are finished and then writes the outputs from all results; extra worker processes sharing one
+# output directory should set QUEUE_EXPORT=0 so only one of them writes the snapshot and history.
+TASK_QUEUE_PATH = Path(os.getenv("TASK_QUEUE_PATH", str(OUTPUT_DIR / "Queue" / "crawl_queue.sqlite3")))
+QUEUE_RUN_ID = os.getenv("QUEUE_RUN_ID", "").strip()
+QUEUE_WORKERS = int(os.getenv("QUEUE_WORKERS", str(max(1, DETAIL_WORKERS))))
+QUEUE_DOMAINS = [domain.strip() for domain in os.getenv("QUEUE_DOMAINS", "").split(",") if domain.strip()]
+QUEUE_LEASE_SECONDS = float(os.getenv("QUEUE_LEASE_SECONDS", "300"))
+QUEUE_MAX_ATTEMPTS = int(os.getenv("QUEUE_MAX_ATTEMPTS", "3"))
+QUEUE_EXPORT = os.getenv("QUEUE_EXPORT", "1").strip() != "0"
+
+# All three portals send their requests through one keep-alive connection pool per portal (http_pool.py) instead of
+# a new TCP+TLS handshake per page. HTTP_POOL_SIZE caps the open connections per host (threads wait for a free one);
+# connect/read failures are retried in the pool with the portal's retries/backoff_factor (429/5xx stay with portal_get).
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", str(max(DETAIL_WORKERS, ASYNC_DOMAIN_CONCURRENCY))))
+PORTAL_HTTP_SETTINGS = {
+    "JobThai": {"pool_size": HTTP_POOL_SIZE, "retries": 3, "backoff_factor": 1.0},
+    "JobsDB": {"pool_size": HTTP_POOL_SIZE, "retries": 3, "backoff_factor": 1.0},
+    "JOBBKK": {"pool_size": HTTP_POOL_SIZE, "retries": 3, "backoff_factor": 1.0},
+}
+
+# SEARCH_PREFETCH_PAGES > 1 keeps that many upcoming search pages of a keyword in flight while the current one is
+# parsed (both engines). Pages are still parsed in order and pagination stops at the same page as before; requests
+# for pages past it are cancelled or their responses dropped. 1 (default) requests each page after the previous one.
+SEARCH_PREFETCH_PAGES = int(os.getenv("SEARCH_PREFETCH_PAGES", "1"))
+
+# Detail pages are cached on disk between runs (HTTP_CACHE=0 disables it).
+# Entries younger than the TTL are reused without a request, older ones are revalidated with a conditional GET.
+# The cache lives with the other run output (SCRAPE_OUTPUT_DIR) unless HTTP_CACHE_DIR points elsewhere.
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE", "1").strip() != "0"
+HTTP_CACHE_DIR = Path(os.getenv("HTTP_CACHE_DIR", str(OUTPUT_DIR / ".http_cache")))
+HTTP_CACHE_TTL_HOURS = float(os.getenv("HTTP_CACHE_TTL_HOURS", "24"))
+HTTP_CACHE_MAX_MB = float(os.getenv("HTTP_CACHE_MAX_MB", "200"))
+
+# INCREMENTAL_CRAWL=1 stops paginating at the first page that only lists postings from earlier
+# Scraped_All snapshots, fetches details for new postings only and carries the known rows forward.
+# Known rows not listed again this run are kept while their posted_date is within INCREMENTAL_MAX_AGE_DAYS.
+INCREMENTAL_CRAWL = os.getenv("INCREMENTAL_CRAWL", "0").strip() == "1"
+INCREMENTAL_MAX_AGE_DAYS = int(os.getenv("INCREMENTAL_MAX_AGE_DAYS", "60"))
+
+# Each run is recorded in Scraped_All/job_history.jsonl (only new postings and changed values are stored);
+# `python Moss/job_history.py snapshot <run_id>` rebuilds any run. KEEP_TIMESTAMPED_SNAPSHOTS=1 also
+# writes the old full jobs_all_scraped_<run_id>.csv copy.
+KEEP_TIMESTAMPED_SNAPSHOTS = os.getenv("KEEP_TIMESTAMPED_SNAPSHOTS", "0").strip() == "1"
+
+# BeautifulSoup tree builder for every search/detail page: "lxml" (C-backed, default; builds the tree about a
+# third faster) or "html.parser" (pure Python, used when lxml is not installed). The parse functions and
+# selectors are the same for both; benchmarks/bench_html_parser.py checks that their output is identical.
+HTML_PARSER = os.getenv("HTML_PARSER", "lxml").strip()
+
+# Finished rows are streamed to Checkpoints/<portal>_rows.jsonl as they are produced (CHECKPOINT_ROWS=0 disables it).
+# RESUME_CRAWL=1 keeps the existing checkpoint files and skips detail fetches for URLs already in them.
+# Rows whose detail fetch failed (no detail text) are not checkpointed, so a resumed run fetches them again.
+CHECKPOINT_ROWS = os.getenv("CHECKPOINT_ROWS", "1").strip() != "0"
+RESUME_CRAWL = os.getenv("RESUME_CRAWL", "0").strip() == "1"
+
+# PORTAL_BASE_URL sends every portal request to a stand-in server (see portal_replay.py) as
+# <base>/<host>/<path>?<query>. Job URLs, cache keys and outputs keep the real portal URLs.
+PORTAL_BASE_URL = os.getenv("PORTAL_BASE_URL", "").strip().rstrip("/")
+
+# Every portal request and page parse is logged to Telemetry/crawl_<timestamp>.jsonl (CRAWL_TELEMETRY=0 disables
+# the file); the final cell prints per-portal p50/p95 latency and throughput and writes a _summary.json next to it.
+CRAWL_TELEMETRY = os.getenv("CRAWL_TELEMETRY", "1").strip() != "0"
+TELEMETRY_DIR = OUTPUT_DIR / "Telemetry"
+
+# Scraped_All rows get a canonical_job_id: the same posting on several portals (or re-posted under a new URL)
+# shares one id, found with MinHash/LSH over title, company and matched skills (see job_dedup.py). Pairs need an
+# estimated similarity of at least DEDUP_THRESHOLD, the same company and posted dates at most
+# job_dedup.POSTED_DATE_WINDOW_DAYS apart. CROSS_PORTAL_DEDUP=0 disables it.
+CROSS_PORTAL_DEDUP = os.getenv("CROSS_PORTAL_DEDUP", "1").strip() != "0"
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+
+# Every fetched search and detail page is kept in Archive/page_archive.sqlite3, content-addressed and compressed
+# with a dictionary trained per portal (PAGE_ARCHIVE=0 disables it). `python Moss/reparse_archive.py --run <run_id>`
+# rebuilds that run's snapshot from the archive with the current parse/extract functions, without network access.
+PAGE_ARCHIVE_ENABLED = os.getenv("PAGE_ARCHIVE", "1").strip() != "0"
+ARCHIVE_DIR = OUTPUT_DIR / "Archive"
+
 # For Debugging Start
-print("Search URLs:")
-for platform, urls in SEARCH_URLS.items():
-    print(f"{platform}:")
-    for url in urls:
-        print(f"  {url}")
+if RUN_SCRAPE:
+    print("Search URLs:")
+    for platform, urls in SEARCH_URLS.items():
+        print(f"{platform}:")
+        for url in urls:
+            print(f"  {url}")
 # For Debugging End     
 
+# %% [markdown]
+# ## Shared Crawl Helpers
+
+# %%
+PORTAL_HOST_DOMAINS = {
+    "www.jobthai.com": "JobThai",
+    "th.jobsdb.com": "JobsDB",
+    "jobbkk.com": "JOBBKK",
+}
+
+RUN_ID = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+TELEMETRY_PATH = TELEMETRY_DIR / f"crawl_{RUN_ID}.jsonl"
+TELEMETRY = CrawlTelemetry(TELEMETRY_PATH if RUN_SCRAPE and CRAWL_TELEMETRY else None)
+
+PAGE_ARCHIVE = PageArchive(ARCHIVE_DIR / "page_archive.sqlite3") if RUN_SCRAPE and PAGE_ARCHIVE_ENABLED else None
+
+
+def portal_domain(url: str) -> str:
+    host = urlparse(url).netloc
+    return PORTAL_HOST_DOMAINS.get(host, host)
+
+
+def record_parse(url: str, phase: str, parse_started: float, rows_kept: int) -> None:
+    TELEMETRY.record(
+        "parse",
+        domain=portal_domain(url),
+        phase=phase,
+        url_hash=url_hash(url),
+        parse_ms=round((time.perf_counter() - parse_started) * 1000, 1),
+        rows_kept=rows_kept,
+    )
+
+
+def archive_page(url: str, html: str, phase: str, keyword: str = "", page_num: int = 0) -> None:
+    # Search pages are archived under their page URL, detail pages under their cache key. The archive is a
+    # by-product of the crawl: a failed store is logged and never fails the scrape.
+    if PAGE_ARCHIVE is None:
+        return
+    try:
+        PAGE_ARCHIVE.store(RUN_ID, url, html, domain=portal_domain(url), phase=phase, keyword=keyword, page=page_num)
+    except Exception as e:
+        print(f"[Warn] Could not archive {url}: {type(e).__name__}: {e}")
+
+
+def route_portal_url(url: str) -> str:
+    if not PORTAL_BASE_URL:
+        return url
+
+    parsed = urlparse(url)
+    query = f"?{parsed.query}" if parsed.query else ""
+    return f"{PORTAL_BASE_URL}/{parsed.netloc}{parsed.path or '/'}{query}"
+
+
+RATE_CONTROLLER = AdaptiveRateController(
+    initial_qps=RATE_INITIAL_QPS,
+    min_qps=RATE_MIN_QPS if ADAPTIVE_RATE else RATE_INITIAL_QPS,
+    max_qps=RATE_MAX_QPS if ADAPTIVE_RATE else RATE_INITIAL_QPS,
+    increase_qps=RATE_INCREASE_QPS,
+    decrease_factor=RATE_DECREASE_FACTOR,
+    latency_factor=RATE_LATENCY_FACTOR,
+)
+PORTAL_RETRY_STATUSES = {429, 500, 502, 503, 504}
+HTTP_POOL = PortalSessionPool(PORTAL_HTTP_SETTINGS)
+
+
+def portal_get(
+    url: str,
+    session: requests.Session | None = None,
+    phase: str = "search",
+    retry_statuses: set[int] = PORTAL_RETRY_STATUSES,
+    before_retry=None,
+    **kwargs,
+) -> requests.Response:
+    # Every portal request goes through here: PORTAL_BASE_URL reroutes it, RATE_CONTROLLER paces it,
+    # retry_statuses, timeouts and dropped connections are retried once the controller has backed off (and
+    # Retry-After has passed). before_retry(response) runs before each retry (e.g. a cookie warmup).
+    for attempt in range(PORTAL_RETRIES + 1):
+        try:
+            response = send_portal_request(url, session, phase, attempt, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == PORTAL_RETRIES:
+                raise
+            response = None
+
+        if response is not None and (response.status_code not in retry_statuses or attempt == PORTAL_RETRIES):
+            return response
+        if before_retry is not None:
+            before_retry(response)
+
+
+def send_portal_request(url: str, session: requests.Session | None, phase: str, retries: int, **kwargs) -> requests.Response:
+    # One paced attempt, one telemetry record. Without a session the calling thread's pooled session for the
+    # portal is used. retries counts portal_get's earlier attempts; connect retries done inside the pool are read
+    # from the response.
+    RATE_CONTROLLER.wait(url)
+    started = time.perf_counter()
+    response = None
+    error = ""
+    try:
+        response = (session or HTTP_POOL.session(portal_domain(url))).get(route_portal_url(url), **kwargs)
+        return response
+    except Exception as exc:
+        error = type(exc).__name__
+        raise
+    finally:
+        latency = time.perf_counter() - started
+        RATE_CONTROLLER.observe(
+            url,
+            response.status_code if response is not None else None,
+            latency,
+            retry_after=parse_retry_after(response.headers.get("Retry-After")) if response is not None else 0.0,
+        )
+        adapter_retries = getattr(getattr(getattr(response, "raw", None), "retries", None), "history", ())
+        TELEMETRY.record(
+            "request",
+            domain=portal_domain(url),
+            phase=phase,
+            url_hash=url_hash(url),
+            status=response.status_code if response is not None else None,
+            bytes=len(response.content) if response is not None else 0,
+            latency_ms=round(latency * 1000, 1),
+            retries=retries + len(adapter_retries or ()),
+            error=error,
+        )
+
+
+def resolve_html_parser(name: str) -> str:
+    if name == "html.parser":
+        return name
+    try:
+        BeautifulSoup("", name)
+    except FeatureNotFound:
+        print(f"[Warn] HTML parser '{name}' is not installed, falling back to html.parser")
+        return "html.parser"
+    return name
+
+
+HTML_PARSER_BACKEND = resolve_html_parser(HTML_PARSER)
+
+
+def make_soup(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, HTML_PARSER_BACKEND)
+
+
+ROW_CHECKPOINTS = {}
+ROW_CHECKPOINTS_LOCK = threading.Lock()
+HEAVY_ROW_FIELDS = ("raw_text", "job_detail_text", "job_qualification_text", "job_detail_full_text")
+# Detail page text per portal (JobThai: detail + qualification, JobsDB: detail, JOBBKK: full text).
+DETAIL_TEXT_FIELDS = ("job_detail_text", "job_qualification_text", "job_detail_full_text")
+
+
+def has_detail_text(detail: dict) -> bool:
+    # The detail extractors return empty text instead of raising when the fetch or the parse fails.
+    return any(detail.get(field) for field in DETAIL_TEXT_FIELDS)
+
+
+def get_row_checkpoint(domain: str) -> RowCheckpoint | None:
+    if not CHECKPOINT_ROWS:
+        return None
+
+    with ROW_CHECKPOINTS_LOCK:
+        if domain not in ROW_CHECKPOINTS:
+            checkpoint = RowCheckpoint(CHECKPOINT_DIR / f"{domain.lower()}_rows.jsonl", resume=RESUME_CRAWL)
+            if RESUME_CRAWL:
+                print(f"[Checkpoint] {domain}: resuming with {len(checkpoint.rows)} rows already fetched")
+            ROW_CHECKPOINTS[domain] = checkpoint
+        return ROW_CHECKPOINTS[domain]
+
+
+def is_checkpointed(domain: str, job_url: str) -> bool:
+    checkpoint = get_row_checkpoint(domain)
+    return checkpoint is not None and checkpoint.has(job_url) and has_detail_text(checkpoint.get(job_url))
+
+
+# One detail fetch per canonical job URL per run: a posting listed under several keywords is fetched by the first
+# row that reaches it and the other rows reuse the result.
+DETAIL_QUEUE = DetailFetchQueue()
+
+
+def checkpointed_fetch(domain: str, fetch_detail):
+    checkpoint = get_row_checkpoint(domain)
+
+    def fetch_once(row: dict) -> dict:
+        stored = checkpoint.get(row["job_url"]) if checkpoint is not None else None
+        if stored is not None and has_detail_text(stored):
+            detail_info = {key: value for key, value in stored.items() if key not in row}
+        else:
+            detail_info = fetch_detail(row)
+            # Failed fetches stay out of the checkpoint so RESUME_CRAWL=1 retries them.
+            if checkpoint is not None and has_detail_text(detail_info):
+                checkpoint.append({**row, **detail_info})
+
+        # The full texts live in the checkpoint file; the row lists of the crawl keep only the output columns.
+        return {key: value for key, value in detail_info.items() if key not in HEAVY_ROW_FIELDS}
+
+    def fetch(row: dict) -> dict:
+        detail_info = DETAIL_QUEUE.fetch(canonical_job_url(row["job_url"]), lambda: fetch_once(row))
+        row.pop("raw_text", None)
+        return detail_info
+
+    return fetch
+
+DETAIL_CACHE = (
+    HttpCache(
+        HTTP_CACHE_DIR,
+        ttl_seconds=HTTP_CACHE_TTL_HOURS * 3600,
+        max_bytes=int(HTTP_CACHE_MAX_MB * 1024 * 1024),
+    )
+    if HTTP_CACHE_ENABLED
+    else None
+)
+
+
+def cached_get_text(job_url: str, cache_key: str, send) -> str:
+    # send(extra_headers) performs the request; the cache adds If-None-Match / If-Modified-Since when it can.
+    if DETAIL_CACHE is None:
+        response = send({})
+        response.raise_for_status()
+        html = response.text
+    else:
+        html = DETAIL_CACHE.get_text(cache_key, job_url, send)
+    archive_page(cache_key, html, "detail")
+    return html
+
+
+def fetch_details_concurrently(rows: list[dict], fetch_detail, workers: int = DETAIL_WORKERS) -> None:
+    # Rows are updated in place, so the output order is the search order regardless of completion order.
+    # Pacing per portal is done by RATE_CONTROLLER inside portal_get.
+    total = len(rows)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(fetch_detail, row): idx for idx, row in enumerate(rows)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            rows[futures[future]].update(future.result())
+
+            if total <= 50 or done % 10 == 0 or done == total:
+                percent = (done / total) * 100 if total else 100
+                print(f"[Detail] {done}/{total} ({percent:.1f}%) | workers={workers}")
+
+# %% [markdown]
+# ## Incremental Crawl Helpers
+
+# %%
+def load_known_jobs(snapshot_dir: Path) -> pd.DataFrame:
+    # Legacy timestamped snapshots sort chronologically, the history store holds every job recorded since,
+    # and the static file is the newest, so the last row per URL wins.
+    frames = []
+    for csv_path in sorted(snapshot_dir.glob("jobs_all_scraped_*.csv")):
+        if csv_path.stat().st_size == 0:
+            continue
+        try:
+            frames.append(pd.read_csv(csv_path, dtype=str, keep_default_na=False))
+        except Exception as e:
+            print(f"[Incremental] Error reading {csv_path.name}: {e}")
+
+    history_df = JobHistoryStore(snapshot_dir).job_index()
+    if not history_df.empty:
+        frames.append(history_df.drop(columns=["first_seen", "last_seen", "in_latest_run"]))
+
+    static_path = snapshot_dir / "jobs_all_scraped.csv"
+    if static_path.exists() and static_path.stat().st_size > 0:
+        frames.append(pd.read_csv(static_path, dtype=str, keep_default_na=False))
+
+    frames = [frame for frame in frames if "job_url" in frame.columns and not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+
+    known_df = pd.concat(frames, ignore_index=True)
+    known_df["canonical_url"] = known_df["job_url"].map(canonical_job_url)
+    return known_df.drop_duplicates(subset=["canonical_url"], keep="last").reset_index(drop=True)
+
+
+KNOWN_JOBS_DF = load_known_jobs(SCRAPED_ALL_DIR) if INCREMENTAL_CRAWL else pd.DataFrame()
+KNOWN_JOB_URLS = set(KNOWN_JOBS_DF["canonical_url"]) if not KNOWN_JOBS_DF.empty else set()
+KNOWN_URLS_SEEN_THIS_RUN = set()
+
+if INCREMENTAL_CRAWL:
+    print(f"[Incremental] Loaded {len(KNOWN_JOB_URLS)} known job URLs from {SCRAPED_ALL_DIR.name}")
+
+
+def drop_known_rows(page_rows: list[dict]) -> list[dict]:
+    new_rows = []
+    for row in page_rows:
+        url_key = canonical_job_url(row["job_url"])
+        if url_key in KNOWN_JOB_URLS:
+            KNOWN_URLS_SEEN_THIS_RUN.add(url_key)
+        else:
+            new_rows.append(row)
+    return new_rows
+
+
+def carry_forward_known_jobs(cleaned_df: pd.DataFrame, domain: str) -> pd.DataFrame:
+    if KNOWN_JOBS_DF.empty:
+        return cleaned_df
+
+    known_df = KNOWN_JOBS_DF[KNOWN_JOBS_DF["domain"] == domain]
+    if not cleaned_df.empty:
+        scraped_urls = set(cleaned_df["job_url"].map(canonical_job_url))
+        known_df = known_df[~known_df["canonical_url"].isin(scraped_urls)]
+
+    posted = pd.to_datetime(known_df["posted_date"], format="%m/%d/%Y", errors="coerce")
+    cutoff = pd.Timestamp.now().normalize() - pd.Timedelta(days=INCREMENTAL_MAX_AGE_DAYS)
+    keep = known_df["canonical_url"].isin(KNOWN_URLS_SEEN_THIS_RUN) | (posted >= cutoff)
+    carried_df = known_df[keep].drop(columns=["canonical_url"])
+
+    print(f"[Incremental] {domain}: {len(cleaned_df)} new rows + {len(carried_df)} carried forward")
+    if cleaned_df.empty:
+        return carried_df.reset_index(drop=True)
+    return pd.concat([cleaned_df, carried_df.reindex(columns=cleaned_df.columns)], ignore_index=True)
+
+
+def format_posted_dates(cleaned_df: pd.DataFrame) -> pd.DataFrame:
+    # Cleaners may return posted_date as datetime64; the CSVs keep the MM/DD/YYYY text that
+    # carried-forward rows, the history store and the dashboard already use.
+    if "posted_date" in cleaned_df.columns and pd.api.types.is_datetime64_any_dtype(cleaned_df["posted_date"]):
+        cleaned_df = cleaned_df.assign(posted_date=cleaned_df["posted_date"].dt.strftime("%m/%d/%Y").fillna(""))
+    return cleaned_df
+
+
+def export_portal_csv(cleaned_df: pd.DataFrame, domain: str, file_name: str) -> pd.DataFrame:
+    cleaned_df = format_posted_dates(cleaned_df)
+    if INCREMENTAL_CRAWL:
+        cleaned_df = carry_forward_known_jobs(cleaned_df, domain)
+    cleaned_df.to_csv(SCRAPED_EACH_DIR / file_name, index=False, encoding="utf-8-sig")
+    return cleaned_df
+
 # %% [markdown]
 # ## JobThai Scraper Function
 
@@ -252,10 +717,6 @@ def normalize_for_match(text: str) -> str:
     return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
 
 
-def normalize_for_skill_match(text: str) -> str:
-    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
-
-
 def keyword_match_groups_from_query(keyword: str) -> list[list[str]]:
     tokens = [token for token in normalize_for_match(keyword).split() if token]
     groups = []
@@ -269,7 +730,7 @@ def keyword_match_groups_from_query(keyword: str) -> list[list[str]]:
     return groups
 
 
-def title_matches_keyword(title: str, keyword_groups: list[list[str]]) -> bool:
+def title_matches_keyword_in_order(title: str, keyword_groups: list[list[str]]) -> bool:
     if not keyword_groups:
         return True
 
@@ -298,29 +759,11 @@ def title_matches_keyword(title: str, keyword_groups: list[list[str]]) -> bool:
     return True
 
 
-def variant_matches_text(variant: str, normalized_text: str) -> bool:
-    variant_norm = normalize_for_skill_match(variant)
-    if not variant_norm:
-        return False
-    pattern = rf"(?<![a-z0-9]){re.escape(variant_norm).replace(r'\\ ', r'\\s+')}(?![a-z0-9])"
-    return re.search(pattern, normalized_text) is not None
+SKILL_MATCHER = SkillMatcher(SKILLS)
 
 
 def extract_skills(text: str) -> dict:
-    normalized_text = normalize_for_skill_match(text)
-    matched = []
-
-    for skill_name, variants in SKILLS.items():
-        if any(variant_matches_text(variant, normalized_text) for variant in variants):
-            matched.append(skill_name)
-
-    skill_flags = {f"skill_{name}": int(name in matched) for name in SKILLS}
-
-    return {
-        "matched_skills": "|".join(matched),
-        "matched_skill_count": len(matched),
-        **skill_flags,
-    }
+    return SKILL_MATCHER.extract(text)
 
 
 def normalize_jobthai_detail_url(job_url: str) -> str:
@@ -340,7 +783,7 @@ def clean_text(text: str) -> str:
     return " ".join((text or "").split())
 
 
-def extract_salary(text: str) -> str:
+def extract_jobthai_salary(text: str) -> str:
     patterns = [
         r"\d[\d,\s]*\s*-\s*\d[\d,\s]*\s*บาท",
         r"\d[\d,\s]*\s*บาท",
@@ -430,7 +873,7 @@ def parse_card_from_title(title_node, page_num: int, keyword: str) -> dict:
     raw_text = clean_text(" ".join(raw_lines))
 
     if not salary:
-        salary = extract_salary(raw_text)
+        salary = extract_jobthai_salary(raw_text)
     if not posted_date:
         posted_date = extract_posted_date(raw_text)
     if not location:
@@ -449,24 +892,132 @@ def parse_card_from_title(title_node, page_num: int, keyword: str) -> dict:
     }
 
 
-def extract_detail_from_job_page(job_url: str, headers: dict) -> dict:
-    base_detail = {
-        "province_code": "",
-        "province_name": "",
-        "job_detail_text": "",
-        "job_qualification_text": "",
-        "matched_skills": "",
-        "matched_skill_count": 0,
-        **{column: 0 for column in SKILL_COLUMNS},
-    }
+JOBTHAI_STATE_MARKER = 'id="__NEXT_DATA__"'
+JOBTHAI_CARD_SELECTOR = 'h2[id^="job-card-item-"]'
+
+
+def load_next_data(html: str) -> dict | None:
+    # JobThai is a Next.js site; the page props are embedded as plain JSON in
+    # <script id="__NEXT_DATA__" type="application/json">.
+    marker = html.find(JOBTHAI_STATE_MARKER)
+    if marker < 0:
+        return None
+    start = html.find(">", marker) + 1
+    end = html.find("</script>", start)
+    if start <= 0 or end < 0:
+        return None
 
     try:
-        response = requests.get(job_url, headers=headers, timeout=30)
-        response.raise_for_status()
-    except Exception:
-        return base_detail
+        state = json.loads(html[start:end])
+    except json.JSONDecodeError:
+        return None
+    return state if isinstance(state, dict) else None
+
+
+STATE_FALLBACK_WARNED = set()
+
+
+def warn_state_fallback(domain: str, reason: str) -> None:
+    # Once per portal and run: the embedded page state no longer matches what the state parser expects, so
+    # the slower HTML card parser is used instead. Usually means the portal changed its page data.
+    if domain not in STATE_FALLBACK_WARNED:
+        STATE_FALLBACK_WARNED.add(domain)
+        print(f"[Warn] {domain} page state {reason}; falling back to the HTML card parser")
+
+
+def state_rows_usable(rows: list[dict]) -> bool:
+    return bool(rows) and all(row["job_url"] and row["job_title"] for row in rows)
+
+
+def find_state_node(node, match):
+    # Depth-first search of the page props for the first node match() accepts. The job data sits under
+    # props.pageProps.initialState (searchJob.jobList.data / jobDetail.data) but moves between deploys.
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if match(current):
+            return current
+        if isinstance(current, dict):
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+    return None
+
+
+def is_jobthai_job_list(node) -> bool:
+    return isinstance(node, list) and bool(node) and all(isinstance(item, dict) and "jobTitle" in item for item in node)
+
+
+def jobthai_province_code(value) -> str:
+    try:
+        return normalize_province_code(value)
+    except ValueError:
+        return ""
+
 
-    soup = BeautifulSoup(response.text, "html.parser")
+def jobthai_row_from_state(job: dict, page_num: int, keyword: str) -> dict:
+    job_id = str(job.get("jobId") or job.get("id") or "")
+    title = clean_text(job.get("jobTitle") or "")
+    company = clean_text(job.get("companyName") or "")
+    province_name = clean_text(job.get("provinceName") or "")
+    location = clean_text(f"{province_name} {job.get('districtName') or ''}")
+    salary = clean_text(job.get("salary") or "")
+
+    return {
+        "keyword": keyword,
+        "page": page_num,
+        "province_code": jobthai_province_code(job.get("provinceId") or ""),
+        "province_name": province_name,
+        "job_title": title,
+        "company": company,
+        "location": location,
+        "salary": salary,
+        # ISO timestamp; the card only shows "5 ก.พ. 69".
+        "posted_date": job.get("postedDate") or "",
+        "job_url": f"https://www.jobthai.com/th/job/{job_id}" if job_id else "",
+        "raw_text": clean_text(" ".join([title, company, location, salary])),
+    }
+
+
+def parse_jobthai_search_page(html: str, page_num: int, keyword: str) -> list[dict]:
+    # Reads the job list from __NEXT_DATA__; the generated-class card parser runs when the state is missing or
+    # its rows lack a URL or title (the state keys are not a public schema and can change between deploys).
+    state = load_next_data(html)
+    jobs = find_state_node(state, is_jobthai_job_list) if state else None
+    if jobs is not None:
+        rows = [jobthai_row_from_state(job, page_num, keyword) for job in jobs]
+        if state_rows_usable(rows):
+            return rows
+        warn_state_fallback("JobThai", "has job rows without a URL or title")
+
+    cards = make_soup(html).select(JOBTHAI_CARD_SELECTOR)
+    return [parse_card_from_title(card, page_num=page_num, keyword=keyword) for card in cards]
+
+
+def jobthai_detail_from_state(html: str) -> dict | None:
+    state = load_next_data(html)
+    job = find_state_node(state, lambda node: isinstance(node, dict) and "jobDescription" in node) if state else None
+    if job is None or not (job.get("jobDescription") or job.get("qualifications")):
+        return None
+
+    description = job.get("jobDescription") or ""
+    if "<" in description:
+        description = make_soup(description).get_text("\n", strip=True)
+
+    qualifications = job.get("qualifications") or ""
+    if isinstance(qualifications, list):
+        qualifications = " ".join(str(item) for item in qualifications)
+
+    return {
+        "province_code": jobthai_province_code(job.get("provinceId") or ""),
+        "province_name": clean_text(job.get("provinceName") or ""),
+        "job_detail_text": clean_text(description),
+        "job_qualification_text": clean_text(qualifications),
+    }
+
+
+def jobthai_detail_from_html(html: str) -> dict:
+    soup = make_soup(html)
 
     province_code = ""
     province_name = ""
@@ -498,21 +1049,47 @@ def extract_detail_from_job_page(job_url: str, headers: dict) -> dict:
     qualification_node = soup.select_one("#job-properties-wrapper")
     job_qualification_text = clean_text(qualification_node.get_text(" ", strip=True)) if qualification_node else ""
 
-    combined_text = " ".join([text for text in [job_detail_text, job_qualification_text] if text])
-    skill_info = extract_skills(combined_text)
-
     return {
         "province_code": province_code,
         "province_name": province_name,
         "job_detail_text": job_detail_text,
         "job_qualification_text": job_qualification_text,
-        **skill_info,
     }
 
 
+def extract_detail_from_job_page(job_url: str, headers: dict) -> dict:
+    # No province keys on failure, so a province read from the search page survives row.update().
+    base_detail = {
+        "job_detail_text": "",
+        "job_qualification_text": "",
+        "matched_skills": "",
+        "matched_skill_count": 0,
+        **{column: 0 for column in SKILL_COLUMNS},
+    }
+
+    try:
+        html = cached_get_text(
+            job_url,
+            normalize_jobthai_detail_url(job_url),
+            lambda extra_headers: portal_get(job_url, phase="detail", headers={**headers, **extra_headers}, timeout=30),
+        )
+    except Exception:
+        return base_detail
+
+    parse_started = time.perf_counter()
+    detail = jobthai_detail_from_state(html) or jobthai_detail_from_html(html)
+
+    combined_text = " ".join([text for text in [detail["job_detail_text"], detail["job_qualification_text"]] if text])
+    skill_info = extract_skills(combined_text)
+
+    record_parse(job_url, "detail", parse_started, int(bool(combined_text)))
+    if not detail["province_code"]:
+        del detail["province_code"], detail["province_name"]
+    return {**detail, **skill_info}
+
+
 def scrape_job_jobthai(
     SEARCH_URLS: dict[str, list[str]],
-    SLEEP_SEC: float = 0.5,
 ) -> pd.DataFrame:
 
     collected_frames = []
@@ -527,56 +1104,65 @@ def scrape_job_jobthai(
 
             all_rows = []
             seen_urls = set()
+            with SearchPagePrefetcher(
+                lambda page_no: portal_get(search_url.replace("page=1", f"page={page_no}"), headers=headers, timeout=30),
+                max_pages=49,
+                window=SEARCH_PREFETCH_PAGES,
+            ) as prefetch:
+                for page_no in range(1, 50):
+                    page_url = search_url.replace("page=1", f"page={page_no}")
+                    print(f"\tFetching page {page_no}")
+
+                    response = prefetch.get(page_no)
+                    response.raise_for_status()
+
+                    if "nodata=true" in response.url.lower():
+                        print("No data found for this keyword.")
+                        break
 
-            for page_no in range(1, 50):
-                page_url = search_url.replace("page=1", f"page={page_no}")
-                print(f"\tFetching page {page_no}")
-
-                response = requests.get(page_url, headers=headers, timeout=30)
-                response.raise_for_status()
-
-                if "nodata=true" in response.url.lower():
-                    print("No data found for this keyword.")
-                    break
-
-                soup = BeautifulSoup(response.text, "html.parser")
-                title_cards_html = soup.select('h2[id^="job-card-item-"]')
-
-                page_rows = []
-                for title_card_html in title_cards_html:
-                    row = parse_card_from_title(
-                        title_card_html,
-                        page_num=page_no,
-                        keyword=keyword,
-                    )
-
-                    if not row["job_url"]:
-                        continue
-                    if not title_matches_keyword(row["job_title"], keyword_groups):
-                        continue
-                    if row["job_url"] in seen_urls:
-                        continue
-
-                    seen_urls.add(row["job_url"])
-                    page_rows.append(row)
-
-                if not page_rows:
-                    break
+                    archive_page(page_url, response.text, "search", keyword, page_no)
+                    parse_started = time.perf_counter()
+                    parsed_rows = parse_jobthai_search_page(response.text, page_no, keyword)
+
+                    page_rows = []
+                    for row in parsed_rows:
+                        if not row["job_url"]:
+                            continue
+                        if not title_matches_keyword_in_order(row["job_title"], keyword_groups):
+                            continue
+                        if row["job_url"] in seen_urls:
+                            continue
+
+                        seen_urls.add(row["job_url"])
+                        page_rows.append(row)
+
+                    record_parse(page_url, "search", parse_started, len(page_rows))
+                    if not page_rows:
+                        print(f"\tNo new matching jobs on page {page_no} ({len(parsed_rows)} parsed), stopping")
+                        break
 
-                all_rows.extend(page_rows)
+                    if INCREMENTAL_CRAWL:
+                        page_rows = drop_known_rows(page_rows)
+                        if not page_rows:
+                            print("\tOnly known postings on this page, stopping (incremental)")
+                            break
 
-                if SLEEP_SEC > 0:
-                    time.sleep(SLEEP_SEC)
+                    all_rows.extend(page_rows)
 
             total_details = len(all_rows)
             print(f"[Detail] Starting detail extraction for {total_details} jobs")
 
-            for row in all_rows:
-                detail_info = extract_detail_from_job_page(row["job_url"], headers=headers)
-                row.update(detail_info)
+            fetch_detail = checkpointed_fetch(
+                "JobThai",
+                lambda row: extract_detail_from_job_page(row["job_url"], headers=headers),
+            )
 
-                if SLEEP_SEC > 0:
-                    time.sleep(SLEEP_SEC)
+            if DETAIL_WORKERS > 1:
+                fetch_details_concurrently(all_rows, fetch_detail)
+            else:
+                for row in all_rows:
+                    detail_info = fetch_detail(row)
+                    row.update(detail_info)
 
             job_df = pd.DataFrame(all_rows)
             if job_df.empty:
@@ -624,54 +1210,16 @@ def scrape_job_jobthai(
 # ## JobThai Scraper Run
 
 # %%
-if "JobThai" in SEARCH_URLS:
+if RUN_SCRAPE and CRAWL_ENGINE == "sequential" and "JobThai" in SEARCH_URLS:
     jobthai_scraped_df = scrape_job_jobthai(SEARCH_URLS)
 
 # %% [markdown]
 # ## Clean Data JobThai Function
 
 # %%
-THAI_MONTHS = {
-    "ม.ค.": 1,
-    "ก.พ.": 2,
-    "มี.ค.": 3,
-    "เม.ย.": 4,
-    "พ.ค.": 5,
-    "มิ.ย.": 6,
-    "ก.ค.": 7,
-    "ส.ค.": 8,
-    "ก.ย.": 9,
-    "ต.ค.": 10,
-    "พ.ย.": 11,
-    "ธ.ค.": 12,
-}
-
-def parse_thai_short_date(value: str) -> str:
-    text = str(value).strip()
-    if not text:
-        return ""
-
-    match = re.match(r"^(\d{1,2})\s+([ก-๙\.]+)\s+(\d{2})$", text)
-    if not match:
-        return ""
-
-    day = int(match.group(1))
-    month_text = match.group(2)
-    yy_be = int(match.group(3))  # e.g. 69 -> 2569 (B.E.)
-    month = THAI_MONTHS.get(month_text)
-    if month is None:
-        return ""
-
-    year_ad = (2500 + yy_be) - 543
-    try:
-        parsed = pd.Timestamp(year=year_ad, month=month, day=day)
-    except Exception:
-        return ""
-
-    return parsed.strftime("%m/%d/%Y")
-
-
 def clean_data_jobthai(job_df: pd.DataFrame) -> pd.DataFrame:
+    if job_df is None or job_df.empty:
+        return pd.DataFrame()
 
     # province_name: remove "จ." prefix
     job_df["province_name"] = (
@@ -691,22 +1239,17 @@ def clean_data_jobthai(job_df: pd.DataFrame) -> pd.DataFrame:
     job_df["min_salary"] = salary_parts[0].fillna("").str.replace(",", "", regex=False)
     job_df["max_salary"] = salary_parts[1].fillna("").str.replace(",", "", regex=False)
 
-    # 3) posted_date: convert Thai short date like to MM/DD/YYYY format
-    job_df["posted_date"] = (
-        job_df["posted_date"]
-        .fillna("")
-        .astype(str)
-        .apply(parse_thai_short_date)
-    )
+    # 3) posted_date: ISO page-state date or Thai short B.E. date like "5 ก.พ. 69" -> datetime64
+    job_df["posted_date"] = parse_jobthai_posted_dates(job_df["posted_date"])
     return job_df
 
 # %% [markdown]
 # ## Clean & Export Scraped JobThai Run
 
 # %%
-if "JobThai" in SEARCH_URLS:
+if RUN_SCRAPE and CRAWL_ENGINE == "sequential" and "JobThai" in SEARCH_URLS:
     jobthai_scraped_df = clean_data_jobthai(jobthai_scraped_df)
-    jobthai_scraped_df.to_csv(SCRAPED_EACH_DIR / "jobthai_jobs.csv", index=False, encoding="utf-8-sig")
+    jobthai_scraped_df = export_portal_csv(jobthai_scraped_df, "JobThai", "jobthai_jobs.csv")
 
 # %% [markdown]
 # ## JobsDB Scraper Function
@@ -720,6 +1263,13 @@ def update_query_in_url(url: str, **params) -> str:
     new_query = urlencode(query, doseq=True)
     return urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment))
 
+def jobsdb_page_url(search_url: str, page_num: int) -> str:
+    page_url = update_query_in_url(search_url, page=page_num)
+    if INCREMENTAL_CRAWL:
+        # Newest first, so the first all-known page means everything after it is known too.
+        page_url = update_query_in_url(page_url, sortmode="ListedDate")
+    return page_url
+
 def clean_text(text: str) -> str:
     return re.sub(r"\s+", " ", (text or "")).strip()
 
@@ -742,7 +1292,7 @@ def title_matches_keyword(title: str, keyword_groups: list[list[str]]) -> bool:
     title_norm = normalize_for_match(title)
     return all(any(variant in title_norm for variant in group) for group in keyword_groups)
 
-def extract_salary(text: str) -> str:
+def extract_jobsdb_salary(text: str) -> str:
     patterns = [
         r"THB\s*[\d,]+\s*[-–]\s*THB\s*[\d,]+",
         r"THB\s*[\d,]+",
@@ -766,44 +1316,12 @@ def is_probable_salary(text: str) -> bool:
     return bool(re.search(r"\d", text_norm) and re.search(r"[-–]", text_norm))
 
 def guess_province_name(location_text: str) -> str:
-    location_clean = clean_text(location_text)
-    if not location_clean:
-        return ""
-
-    for province in EN_TO_THAI_PROVINCE.values():
-        if province in location_clean:
-            return province
-
-    location_lower = location_clean.lower()
-    for english_name, thai_name in EN_TO_THAI_PROVINCE.items():
-        if re.search(rf"\b{re.escape(english_name)}\b", location_lower):
-            return thai_name
-
-    parts = [clean_text(part) for part in re.split(r",|\||/", location_clean) if clean_text(part)]
-    if not parts:
-        return ""
-
-    tail = parts[-1]
-    tail = re.sub(r"^(เขต|อ\.|อำเภอ|จ\.|จังหวัด)\s*", "", tail).strip()
-    return tail
+    return PROVINCE_RESOLVER.resolve(location_text)
 
 
 def create_retry_session() -> requests.Session:
-    session = requests.Session()
-    retry = Retry(
-        total=3,
-        connect=3,
-        read=3,
-        status=0,
-        backoff_factor=1,
-        allowed_methods=frozenset(["GET", "HEAD"]),
-        respect_retry_after_header=True,
-        raise_on_status=False,
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    return session
+    # Fresh JobsDB cookies on the shared JobsDB connection pool.
+    return HTTP_POOL.new_session("JobsDB")
 
 
 def jobsdb_headers(referer: str = "https://th.jobsdb.com/") -> dict:
@@ -822,90 +1340,108 @@ def jobsdb_headers(referer: str = "https://th.jobsdb.com/") -> dict:
     }
 
 
-def jobsdb_get(session: requests.Session, url: str, referer: str = "https://th.jobsdb.com/") -> requests.Response:
-    last_response = None
-
-    for attempt in range(1, 4):
-        response = session.get(
-            url,
-            headers=jobsdb_headers(referer=referer),
-            timeout=30,
-            proxies=JOBSDB_PROXIES or None,
-        )
-        last_response = response
+def jobsdb_get(
+    session: requests.Session,
+    url: str,
+    referer: str = "https://th.jobsdb.com/",
+    extra_headers: dict | None = None,
+    phase: str = "search",
+) -> requests.Response:
+    def warm_up(response: requests.Response | None) -> None:
+        # A 403 usually means the session lost its cookies: reload the home page before portal_get retries.
+        # The 403 has already slowed the rate controller, so the warmup and the retry are paced.
+        if response is None or response.status_code != 403:
+            return
+        try:
+            send_portal_request(
+                "https://th.jobsdb.com/",
+                session,
+                "warmup",
+                0,
+                headers=jobsdb_headers(),
+                timeout=30,
+                proxies=JOBSDB_PROXIES or None,
+            )
+        except Exception:
+            pass
+
+    response = portal_get(
+        url,
+        session,
+        phase=phase,
+        retry_statuses=PORTAL_RETRY_STATUSES | {403},
+        before_retry=warm_up,
+        headers={**jobsdb_headers(referer=referer), **(extra_headers or {})},
+        timeout=30,
+        proxies=JOBSDB_PROXIES or None,
+    )
+    response.raise_for_status()
+    return response
 
-        if response.status_code != 403:
-            response.raise_for_status()
-            return response
 
-        if attempt < 3:
-            try:
-                session.get(
-                    "https://th.jobsdb.com/",
-                    headers=jobsdb_headers(),
-                    timeout=30,
-                    proxies=JOBSDB_PROXIES or None,
-                )
-            except Exception:
-                pass
-            time.sleep(1.0 * attempt)
+def normalize_jobsdb_detail_url(job_url: str) -> str:
+    if not job_url:
+        return ""
 
-    if last_response is not None:
-        last_response.raise_for_status()
-    raise requests.HTTPError("JobsDB request failed without response")
+    parsed = urlparse(job_url)
+    return urlunparse((parsed.scheme, parsed.netloc, parsed.path, "", "", ""))
 
 
 def extract_job_detail_text(job_url: str, session: requests.Session | None = None) -> str:
     active_session = session or create_retry_session()
     try:
-        response = jobsdb_get(active_session, job_url, referer="https://th.jobsdb.com/")
+        html = cached_get_text(
+            job_url,
+            normalize_jobsdb_detail_url(job_url),
+            lambda extra_headers: jobsdb_get(
+                active_session,
+                job_url,
+                referer="https://th.jobsdb.com/",
+                extra_headers=extra_headers,
+                phase="detail",
+            ),
+        )
     except Exception:
         return ""
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    detail_el = soup.select_one("[data-automation='jobAdDetails']")
-    if detail_el:
-        return clean_text(detail_el.get_text("\n", strip=True))
+    parse_started = time.perf_counter()
+    soup = make_soup(html)
+    detail_el = soup.select_one("[data-automation='jobAdDetails']") or soup.select_one("section")
+    detail_text = clean_text(detail_el.get_text("\n", strip=True)) if detail_el else ""
 
-    section_el = soup.select_one("section")
-    if section_el:
-        return clean_text(section_el.get_text("\n", strip=True))
+    record_parse(job_url, "detail", parse_started, int(bool(detail_text)))
+    return detail_text
 
-    return ""
-
-def variant_matches_text(variant: str, normalized_text: str) -> bool:
-    variant_norm = normalize_for_match(variant)
-    if not variant_norm:
-        return False
+def get_thread_jobsdb_session() -> requests.Session:
+    # requests.Session is not thread-safe, so each worker thread keeps its own (all on the same pool).
+    return HTTP_POOL.session("JobsDB")
 
-    pattern = re.escape(variant_norm)
-    pattern = pattern.replace(r"\ ", r"\s+")
-    regex = rf"(?<![a-z0-9]){pattern}(?![a-z0-9])"
-    return re.search(regex, normalized_text) is not None
 
+def fetch_jobsdb_detail(row: dict, session: requests.Session | None = None) -> dict:
+    detail_text = extract_job_detail_text(row["job_url"], session=session or get_thread_jobsdb_session())
+    return {"job_detail_text": detail_text, **extract_skills(detail_text)}
 
-def extract_skills(detail_text: str) -> dict:
-    text_norm = normalize_for_match(detail_text)
-    found = []
-    flags = {}
+def first_automation(tagged: list, *matches: tuple[str, str | None], need_href: bool = False):
+    # First element (document order) whose data-automation value and tag name match one of (value, name);
+    # name None accepts any tag. Same result as card.select_one("a[data-automation='x'], [data-automation='y']").
+    for element in tagged:
+        value = element.get("data-automation")
+        if any(value == wanted and name in (None, element.name) for wanted, name in matches):
+            if not need_href or element.has_attr("href"):
+                return element
+    return None
 
-    for skill_key, variants in SKILLS.items():
-        matched = any(variant_matches_text(variant, text_norm) for variant in variants)
-        flags[f"skill_{skill_key}"] = int(matched)
-        if matched:
-            found.append(skill_key)
-
-    flags["matched_skills"] = "|".join(found)
-    flags["matched_skill_count"] = len(found)
-    return flags
 
 def parse_card(card, page_num: int, search_keyword: str) -> dict:
-    title_el = card.select_one("a[data-automation='jobTitle']")
-    company_el = card.select_one("a[data-automation='jobCompany'], [data-automation='jobCompany']")
-    location_el = card.select_one("a[data-automation='jobLocation'], [data-automation='jobCardLocation']")
-    date_el = card.select_one("[data-automation='jobListingDate']")
-    salary_el = card.select_one("[data-automation='jobSalary']")
-    overlay_link_el = card.select_one("a[data-automation='job-list-item-link-overlay'][href]")
+    # One walk over the card collects every data-automation element; six soupsieve select_one calls per card
+    # were most of the JobsDB card parse time.
+    tagged = card.find_all(attrs={"data-automation": True})
+    title_el = first_automation(tagged, ("jobTitle", "a"))
+    company_el = first_automation(tagged, ("jobCompany", None))
+    location_el = first_automation(tagged, ("jobLocation", "a"), ("jobCardLocation", None))
+    date_el = first_automation(tagged, ("jobListingDate", None))
+    salary_el = first_automation(tagged, ("jobSalary", None))
+    overlay_link_el = first_automation(tagged, ("job-list-item-link-overlay", "a"), need_href=True)
 
     title = clean_text(title_el.get_text(" ", strip=True) if title_el else "")
     company = clean_text(company_el.get_text(" ", strip=True) if company_el else "")
@@ -924,7 +1460,7 @@ def parse_card(card, page_num: int, search_keyword: str) -> dict:
 
     raw_text = clean_text(card.get_text("\n", strip=True))
     if not salary:
-        salary = extract_salary(raw_text)
+        salary = extract_jobsdb_salary(raw_text)
 
     province_name = guess_province_name(location_name)
 
@@ -942,7 +1478,89 @@ def parse_card(card, page_num: int, search_keyword: str) -> dict:
         "raw_text": raw_text,
     }
 
-def scrape_job_jobsdb(search_url: str = "", search_location: str = "", max_pages: int = 50, sleep_seconds: float = 0.5) -> pd.DataFrame:
+
+JOBSDB_STATE_MARKER = "window.SEEK_REDUX_DATA"
+JOBSDB_CARD_SELECTOR = "article[data-testid='job-card'], article[data-automation='normalJob']"
+
+
+def load_jobsdb_search_state(html: str) -> list[dict] | None:
+    # JobsDB (SEEK) server-renders the search results into window.SEEK_REDUX_DATA = {...};
+    # returns the job list, or None when the page has no usable payload.
+    marker = html.find(JOBSDB_STATE_MARKER)
+    if marker < 0:
+        return None
+    brace = html.find("{", marker)
+    if brace < 0:
+        return None
+
+    decoder = json.JSONDecoder()
+    try:
+        state, _ = decoder.raw_decode(html, brace)
+    except json.JSONDecodeError:
+        # The payload is a JS literal and can contain bare `undefined` values.
+        end = html.find("</script>", brace)
+        try:
+            state, _ = decoder.raw_decode(re.sub(r"\bundefined\b", "null", html[brace:end]))
+        except json.JSONDecodeError:
+            return None
+
+    results = (state.get("results") or {}).get("results") if isinstance(state, dict) else None
+    jobs = results.get("jobs") if isinstance(results, dict) else None
+    return jobs if isinstance(jobs, list) else None
+
+
+def jobsdb_row_from_state(job: dict, page_num: int, search_keyword: str) -> dict:
+    job_id = str(job.get("id") or "")
+    title = clean_text(job.get("title") or "")
+    company = clean_text(job.get("companyName") or (job.get("advertiser") or {}).get("description") or "")
+
+    locations = job.get("locations") or []
+    if locations and isinstance(locations[0], dict):
+        location_name = clean_text(locations[0].get("label") or "")
+    else:
+        location_name = clean_text(job.get("location") or "")
+
+    salary_candidate = clean_text(job.get("salaryLabel") or "")
+    salary = salary_candidate if is_probable_salary(salary_candidate) else ""
+
+    bullet_points = [clean_text(point) for point in job.get("bulletPoints") or [] if isinstance(point, str)]
+    raw_text = clean_text(" ".join([title, company, location_name, salary_candidate, *bullet_points, job.get("teaser") or ""]))
+    if not salary:
+        salary = extract_jobsdb_salary(raw_text)
+
+    return {
+        "keyword": search_keyword,
+        "province_code": "",
+        "province_name": guess_province_name(location_name),
+        "page": page_num,
+        "job_title": title,
+        "company": company,
+        "location": location_name,
+        "salary": salary,
+        # Absolute ISO timestamp; the card text only has "3 วันที่ผ่านมา".
+        "posted_date": job.get("listingDate") or clean_text(job.get("listingDateDisplay") or ""),
+        "job_url": f"https://th.jobsdb.com/th/job/{job_id}" if job_id else "",
+        "raw_text": raw_text,
+    }
+
+
+def parse_jobsdb_search_page(html: str, page_num: int, search_keyword: str) -> list[dict]:
+    # One json.loads for the whole page; the per-card CSS parser runs when the payload is missing or its rows lack
+    # an id or title (the SEEK_REDUX_DATA layout is not a public schema). An empty job list is a real last page.
+    jobs = load_jobsdb_search_state(html)
+    if jobs == []:
+        return []
+    if jobs is not None:
+        rows = [jobsdb_row_from_state(job, page_num, search_keyword) for job in jobs if isinstance(job, dict)]
+        if state_rows_usable(rows):
+            return rows
+        warn_state_fallback("JobsDB", "has job rows without an id or title")
+
+    cards = make_soup(html).select(JOBSDB_CARD_SELECTOR)
+    return [parse_card(card, page_num=page_num, search_keyword=search_keyword) for card in cards]
+
+
+def scrape_job_jobsdb(search_url: str = "", search_location: str = "", max_pages: int = 50) -> pd.DataFrame:
     collected_frames = []
     session = create_retry_session()
 
@@ -957,69 +1575,87 @@ def scrape_job_jobsdb(search_url: str = "", search_location: str = "", max_pages
 
             print(f"[Search] Starting JobsDB crawl: max_pages={max_pages}")
 
-            for page_num in range(1, max_pages + 1):
-                page_url = update_query_in_url(search_url, page=page_num)
+            def search_page_url(page_num: int) -> str:
+                page_url = jobsdb_page_url(search_url, page_num)
                 if search_location.strip():
                     page_url = update_query_in_url(page_url, where=search_location.strip())
-
-                print(f"[Search] Page {page_num}/{max_pages} -> request")
-                try:
-                    response = jobsdb_get(session, page_url, referer=search_url)
-                except requests.HTTPError as http_err:
-                    status_code = http_err.response.status_code if http_err.response is not None else None
-                    if status_code == 403:
-                        print("[Warn] JobsDB returned 403 (Forbidden).")
-                        print("[Warn] This is commonly IP-based blocking on cloud runners (e.g., GitHub Actions).")
-                        print("[Warn] Tip: set JOBSDB_PROXY_URL or run JobsDB scraping from a residential/local IP.")
+                return page_url
+
+            # Prefetch threads use their own sessions; requests.Session is not thread-safe.
+            with SearchPagePrefetcher(
+                lambda page_num: jobsdb_get(
+                    session if SEARCH_PREFETCH_PAGES <= 1 else get_thread_jobsdb_session(),
+                    search_page_url(page_num),
+                    referer=search_url,
+                ),
+                max_pages=max_pages,
+                window=SEARCH_PREFETCH_PAGES,
+            ) as prefetch:
+                for page_num in range(1, max_pages + 1):
+                    page_url = search_page_url(page_num)
+
+                    print(f"[Search] Page {page_num}/{max_pages} -> request")
+                    try:
+                        response = prefetch.get(page_num)
+                    except requests.HTTPError as http_err:
+                        status_code = http_err.response.status_code if http_err.response is not None else None
+                        if status_code == 403:
+                            print("[Warn] JobsDB returned 403 (Forbidden).")
+                            print("[Warn] This is commonly IP-based blocking on cloud runners (e.g., GitHub Actions).")
+                            print("[Warn] Tip: set JOBSDB_PROXY_URL or run JobsDB scraping from a residential/local IP.")
+                            break
+                        raise
+
+                    archive_page(page_url, response.text, "search", keyword, page_num)
+                    parse_started = time.perf_counter()
+                    parsed_rows = parse_jobsdb_search_page(response.text, page_num, keyword)
+                    print(f"[Search] Page {page_num}/{max_pages} -> found cards: {len(parsed_rows)}")
+
+                    if not parsed_rows:
+                        record_parse(page_url, "search", parse_started, 0)
+                        print(f"[Search] Page {page_num}/{max_pages} -> no cards, stopping")
                         break
-                    raise
-
-                soup = BeautifulSoup(response.text, "html.parser")
-                cards = soup.select("article[data-testid='job-card'], article[data-automation='normalJob']")
-                print(f"[Search] Page {page_num}/{max_pages} -> found cards: {len(cards)}")
-
-                if not cards:
-                    print(f"[Search] Page {page_num}/{max_pages} -> no cards, stopping")
-                    break
-
-                page_rows = []
-                for card in cards:
-                    row = parse_card(card, page_num=page_num, search_keyword=keyword)
-                    if not row["job_title"] or not row["job_url"]:
-                        continue
-                    if not title_matches_keyword(row["job_title"], keyword_groups):
-                        continue
-                    if row["job_url"] in seen_urls:
-                        continue
 
-                    seen_urls.add(row["job_url"])
-                    page_rows.append(row)
-
-                if not page_rows:
-                    print(f"[Search] Page {page_num}/{max_pages} -> no keyword matches, stopping")
-                    break
+                    page_rows = []
+                    for row in parsed_rows:
+                        if not row["job_title"] or not row["job_url"]:
+                            continue
+                        if not title_matches_keyword(row["job_title"], keyword_groups):
+                            continue
+                        if row["job_url"] in seen_urls:
+                            continue
+
+                        seen_urls.add(row["job_url"])
+                        page_rows.append(row)
+
+                    record_parse(page_url, "search", parse_started, len(page_rows))
+                    if not page_rows:
+                        print(f"[Search] Page {page_num}/{max_pages} -> no keyword matches, stopping")
+                        break
 
-                all_rows.extend(page_rows)
-                print(f"[Search] Page {page_num}/{max_pages} -> kept {len(page_rows)} | cumulative={len(all_rows)}")
+                    if INCREMENTAL_CRAWL:
+                        page_rows = drop_known_rows(page_rows)
+                        if not page_rows:
+                            print(f"[Search] Page {page_num}/{max_pages} -> only known postings, stopping (incremental)")
+                            break
 
-                if sleep_seconds > 0:
-                    time.sleep(sleep_seconds)
+                    all_rows.extend(page_rows)
+                    print(f"[Search] Page {page_num}/{max_pages} -> kept {len(page_rows)} | cumulative={len(all_rows)}")
 
             print(f"[Detail] Start detail scrape for {len(all_rows)} jobs")
 
-            for idx, row in enumerate(all_rows, start=1):
-                detail_text = extract_job_detail_text(row["job_url"], session=session)
-                row["job_detail_text"] = detail_text
+            if DETAIL_WORKERS > 1:
+                fetch_details_concurrently(all_rows, checkpointed_fetch("JobsDB", fetch_jobsdb_detail))
+            else:
+                fetch_detail = checkpointed_fetch("JobsDB", lambda row: fetch_jobsdb_detail(row, session=session))
 
-                skill_result = extract_skills(detail_text)
-                row.update(skill_result)
+                for idx, row in enumerate(all_rows, start=1):
+                    detail_info = fetch_detail(row)
+                    row.update(detail_info)
 
-                if len(all_rows) <= 50 or idx % 10 == 0 or idx == len(all_rows):
-                    percent = (idx / len(all_rows)) * 100 if all_rows else 100
-                    print(f"[Detail] {idx}/{len(all_rows)} ({percent:.1f}%)")
-
-                if  sleep_seconds > 0:
-                    time.sleep(sleep_seconds)
+                    if len(all_rows) <= 50 or idx % 10 == 0 or idx == len(all_rows):
+                        percent = (idx / len(all_rows)) * 100 if all_rows else 100
+                        print(f"[Detail] {idx}/{len(all_rows)} ({percent:.1f}%)")
 
             job_df = pd.DataFrame(all_rows)
 
@@ -1071,7 +1707,7 @@ def scrape_job_jobsdb(search_url: str = "", search_location: str = "", max_pages
 # ## JobsDB Scraper Run
 
 # %%
-if "JobsDB" in SEARCH_URLS:
+if RUN_SCRAPE and CRAWL_ENGINE == "sequential" and "JobsDB" in SEARCH_URLS:
     jobsdb_scraped_df = scrape_job_jobsdb(SEARCH_URLS)
 
 # %% [markdown]
@@ -1093,41 +1729,6 @@ def extract_jobsdb_salary_range(salary_text: str) -> tuple[str, str]:
     return min_salary, max_salary
 
 
-def parse_jobsdb_relative_posted_date(value: str, now_dt: datetime | None = None) -> str:
-    text = clean_text(str(value or ""))
-    if not text:
-        return ""
-
-    current = now_dt or datetime.now()
-
-    hour_match = re.search(r"(\d+)\s*ชั่วโมงที่ผ่านมา", text)
-    if hour_match:
-        dt = current - timedelta(hours=int(hour_match.group(1)))
-        return dt.strftime("%m/%d/%Y")
-
-    day_match = re.search(r"(\d+)\s*วันที่ผ่านมา", text)
-    if day_match:
-        dt = current - timedelta(days=int(day_match.group(1)))
-        return dt.strftime("%m/%d/%Y")
-
-    minute_match = re.search(r"(\d+)\s*นาทีที่ผ่านมา", text)
-    if minute_match:
-        dt = current - timedelta(minutes=int(minute_match.group(1)))
-        return dt.strftime("%m/%d/%Y")
-
-    week_match = re.search(r"(\d+)\s*สัปดาห์ที่ผ่านมา", text)
-    if week_match:
-        dt = current - timedelta(days=7 * int(week_match.group(1)))
-        return dt.strftime("%m/%d/%Y")
-
-    month_match = re.search(r"(\d+)\s*เดือนที่ผ่านมา", text)
-    if month_match:
-        dt = current - timedelta(days=30 * int(month_match.group(1)))
-        return dt.strftime("%m/%d/%Y")
-
-    return ""
-
-
 def clean_data_jobsdb(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
         return pd.DataFrame()
@@ -1138,7 +1739,7 @@ def clean_data_jobsdb(df: pd.DataFrame) -> pd.DataFrame:
     output["min_salary"] = salary_pairs.apply(lambda pair: pair[0])
     output["max_salary"] = salary_pairs.apply(lambda pair: pair[1])
 
-    output["posted_date"] = output["posted_date"].apply(parse_jobsdb_relative_posted_date)
+    output["posted_date"] = parse_jobsdb_posted_dates(output["posted_date"])
 
     return output
 
@@ -1146,9 +1747,9 @@ def clean_data_jobsdb(df: pd.DataFrame) -> pd.DataFrame:
 # ## JobsDB Clean & Export Run
 
 # %%
-if "JobsDB" in SEARCH_URLS:
+if RUN_SCRAPE and CRAWL_ENGINE == "sequential" and "JobsDB" in SEARCH_URLS:
     jobsdb_scraped_df = clean_data_jobsdb(jobsdb_scraped_df)
-    jobsdb_scraped_df.to_csv(SCRAPED_EACH_DIR / "jobsdb_jobs.csv", index=False, encoding="utf-8-sig")
+    jobsdb_scraped_df = export_portal_csv(jobsdb_scraped_df, "JobsDB", "jobsdb_jobs.csv")
 
 # %% [markdown]
 # ## JOBBKK Scraper Function
@@ -1161,10 +1762,6 @@ def clean_text(text: str) -> str:
 def normalize_for_match(text: str) -> str:
     return re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).strip()
 
-
-def normalize_for_skill_match(text: str) -> str:
-    return re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).strip()
-
 def keyword_match_groups_from_query(search_keyword: str) -> list[list[str]]:
 
     tokens = [token for token in normalize_for_match(search_keyword).split() if token]
@@ -1181,31 +1778,7 @@ def title_matches_keyword(title: str, keyword_groups: list[list[str]]) -> bool:
     title_norm = normalize_for_match(title)
     return all(any(variant in title_norm for variant in group) for group in keyword_groups)
 
-def variant_matches_text(variant: str, normalized_text: str) -> bool:
-    variant_norm = normalize_for_skill_match(variant)
-    if not variant_norm:
-        return False
-    pattern = rf"(?<![a-z0-9]){re.escape(variant_norm).replace(r'\\ ', r'\\s+')}(?![a-z0-9])"
-    return re.search(pattern, normalized_text) is not None
-
-
-def extract_skills(text: str) -> dict:
-    normalized_text = normalize_for_skill_match(text)
-    matched = []
-
-    for skill_name, variants in SKILLS.items():
-        if any(variant_matches_text(variant, normalized_text) for variant in variants):
-            matched.append(skill_name)
-
-    skill_flags = {f"skill_{name}": int(name in matched) for name in SKILLS}
-
-    return {
-        "matched_skills": "|".join(matched),
-        "matched_skill_count": len(matched),
-        **skill_flags,
-    }
-
-def extract_salary(text: str) -> str:
+def extract_jobbkk_salary(text: str) -> str:
     patterns = [
         r"\d[\d,\s]*\s*[-–]\s*\d[\d,\s]*\s*บาท",
         r"\d[\d,\s]*\s*บาท",
@@ -1229,14 +1802,9 @@ def extract_keyword_from_url(url: str) -> str:
     return ""
 
 
-def guess_province_name(location_text: str) -> str:
-    location_text = clean_text(location_text)
-    if not location_text:
-        return ""
-    for province in EN_TO_THAI_PROVINCE.values():
-        if province in location_text:
-            return province
-    return ""
+def guess_jobbkk_province_name(location_text: str) -> str:
+    # JOBBKK locations without a known province name are left blank rather than guessed from the tail.
+    return PROVINCE_RESOLVER.resolve(location_text, fallback_to_tail=False)
 
 def parse_jobbkk_card(card, page_num: int, keyword: str) -> dict:
     title_el = card.select_one(".joblist-name-urgent a[href*='/jobs/detail']")
@@ -1262,11 +1830,11 @@ def parse_jobbkk_card(card, page_num: int, keyword: str) -> dict:
 
     raw_text = clean_text(card.get_text("\n", strip=True))
     if not salary:
-        salary = extract_salary(raw_text)
+        salary = extract_jobbkk_salary(raw_text)
     if not posted_date and updated_el:
         posted_date = clean_text(updated_el.get_text(" ", strip=True))
 
-    province_name = guess_province_name(location)
+    province_name = guess_jobbkk_province_name(location)
 
     return {
         "keyword": keyword,
@@ -1282,6 +1850,11 @@ def parse_jobbkk_card(card, page_num: int, keyword: str) -> dict:
         "raw_text": raw_text,
     }
 
+
+def parse_jobbkk_search_page(html: str, page_num: int, keyword: str) -> list[dict]:
+    cards = make_soup(html).select("div.joblist-pos.jobbkk-list-company")
+    return [parse_jobbkk_card(card, page_num=page_num, keyword=keyword) for card in cards]
+
 def collect_list_items_text(container) -> str:
     if container is None:
         return ""
@@ -1310,6 +1883,13 @@ def find_section_by_heading(root, heading_pattern: str):
 
     return heading.find_parent("section") or heading.find_parent("div")
 
+def normalize_jobbkk_detail_url(job_url: str) -> str:
+    if not job_url:
+        return ""
+
+    parsed = urlparse(job_url)
+    return urlunparse((parsed.scheme, parsed.netloc, parsed.path, "", "", ""))
+
 def extract_jobbkk_detail(job_url: str, headers: dict) -> dict:
     base_detail = {
         "job_detail_full_text": "",
@@ -1319,18 +1899,23 @@ def extract_jobbkk_detail(job_url: str, headers: dict) -> dict:
     }
 
     try:
-        response = requests.get(job_url, headers=headers, timeout=30)
-        response.raise_for_status()
+        html = cached_get_text(
+            job_url,
+            normalize_jobbkk_detail_url(job_url),
+            lambda extra_headers: portal_get(job_url, phase="detail", headers={**headers, **extra_headers}, timeout=30),
+        )
     except Exception:
         return base_detail
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    parse_started = time.perf_counter()
+    soup = make_soup(html)
 
     detail_root = soup.select_one("article.row") or soup
     job_detail_full_text = clean_text(detail_root.get_text("\n", strip=True))
 
     skill_info = extract_skills(job_detail_full_text)
 
+    record_parse(job_url, "detail", parse_started, int(bool(job_detail_full_text)))
     return {
         "job_detail_full_text": job_detail_full_text,
         **skill_info,
@@ -1339,7 +1924,6 @@ def extract_jobbkk_detail(job_url: str, headers: dict) -> dict:
 def scrape_job_jobbkk(
     search_url: str = "",
     max_pages: int = 50,
-    sleep_seconds: float = 0.5,
 ) -> pd.DataFrame:
     
     collected_frames = []
@@ -1353,59 +1937,72 @@ def scrape_job_jobbkk(
             seen_urls = set()
 
             print(f"[Search] Starting JobBKK crawl: max_pages={max_pages}")
+            with SearchPagePrefetcher(
+                lambda page_num: portal_get(update_page_in_search_url(search_url, page_num), headers=headers, timeout=30),
+                max_pages=max_pages,
+                window=SEARCH_PREFETCH_PAGES,
+            ) as prefetch:
+                for page_num in range(1, max_pages + 1):
+                    page_url = update_page_in_search_url(search_url, page_num)
+                    print(f"[Search] Page {page_num}/{max_pages} -> request")
+
+                    response = prefetch.get(page_num)
+                    response.raise_for_status()
+
+                    archive_page(page_url, response.text, "search", keyword, page_num)
+                    parse_started = time.perf_counter()
+                    parsed_rows = parse_jobbkk_search_page(response.text, page_num, keyword)
+                    print(f"[Search] Page {page_num}/{max_pages} -> found cards: {len(parsed_rows)}")
+
+                    if not parsed_rows:
+                        record_parse(page_url, "search", parse_started, 0)
+                        print(f"[Search] Page {page_num}/{max_pages} -> no cards, stopping")
+                        break
 
-            for page_num in range(1, max_pages + 1):
-                page_url = update_page_in_search_url(search_url, page_num)
-                print(f"[Search] Page {page_num}/{max_pages} -> request")
-
-                response = requests.get(page_url, headers=headers, timeout=30)
-                response.raise_for_status()
-
-                soup = BeautifulSoup(response.text, "html.parser")
-                cards = soup.select("div.joblist-pos.jobbkk-list-company")
-                print(f"[Search] Page {page_num}/{max_pages} -> found cards: {len(cards)}")
-
-                if not cards:
-                    print(f"[Search] Page {page_num}/{max_pages} -> no cards, stopping")
-                    break
-
-                page_rows = []
-                for card in cards:
-                    row = parse_jobbkk_card(card, page_num=page_num, keyword=keyword)
-
-                    if not row["job_title"] or not row["job_url"]:
-                        continue
-                    if not title_matches_keyword(row["job_title"], keyword_groups):
-                        continue
-                    if row["job_url"] in seen_urls:
-                        continue
-
-                    seen_urls.add(row["job_url"])
-                    page_rows.append(row)
-
-                if not page_rows:
-                    print(f"[Search] Page {page_num}/{max_pages} -> no keyword matches, stopping")
-                    break
+                    page_rows = []
+                    for row in parsed_rows:
+                        if not row["job_title"] or not row["job_url"]:
+                            continue
+                        if not title_matches_keyword(row["job_title"], keyword_groups):
+                            continue
+                        if row["job_url"] in seen_urls:
+                            continue
+
+                        seen_urls.add(row["job_url"])
+                        page_rows.append(row)
+
+                    record_parse(page_url, "search", parse_started, len(page_rows))
+                    if not page_rows:
+                        print(f"[Search] Page {page_num}/{max_pages} -> no keyword matches, stopping")
+                        break
 
-                all_rows.extend(page_rows)
-                print(f"[Search] Page {page_num}/{max_pages} -> kept {len(page_rows)} | cumulative={len(all_rows)}")
+                    if INCREMENTAL_CRAWL:
+                        page_rows = drop_known_rows(page_rows)
+                        if not page_rows:
+                            print(f"[Search] Page {page_num}/{max_pages} -> only known postings, stopping (incremental)")
+                            break
 
-                if sleep_seconds > 0:
-                    time.sleep(sleep_seconds)
+                    all_rows.extend(page_rows)
+                    print(f"[Search] Page {page_num}/{max_pages} -> kept {len(page_rows)} | cumulative={len(all_rows)}")
 
             total_details = len(all_rows)
             print(f"[Detail] Starting detail extraction for {total_details} jobs")
 
-            for index, row in enumerate(all_rows, start=1):
-                detail_info = extract_jobbkk_detail(row["job_url"], headers=headers)
-                row.update(detail_info)
+            fetch_detail = checkpointed_fetch(
+                "JOBBKK",
+                lambda row: extract_jobbkk_detail(row["job_url"], headers=headers),
+            )
 
-                if total_details <= 50 or index % 10 == 0 or index == total_details:
-                    percent = (index / total_details) * 100 if total_details else 100
-                    print(f"[Detail] {index}/{total_details} ({percent:.1f}%)")
+            if DETAIL_WORKERS > 1:
+                fetch_details_concurrently(all_rows, fetch_detail)
+            else:
+                for index, row in enumerate(all_rows, start=1):
+                    detail_info = fetch_detail(row)
+                    row.update(detail_info)
 
-                if sleep_seconds > 0:
-                    time.sleep(sleep_seconds)
+                    if total_details <= 50 or index % 10 == 0 or index == total_details:
+                        percent = (index / total_details) * 100 if total_details else 100
+                        print(f"[Detail] {index}/{total_details} ({percent:.1f}%)")
 
             job_df = pd.DataFrame(all_rows)
 
@@ -1456,7 +2053,7 @@ def scrape_job_jobbkk(
 # ## JOBBKK Scraper Run
 
 # %%
-if "JOBBKK" in SEARCH_URLS:
+if RUN_SCRAPE and CRAWL_ENGINE == "sequential" and "JOBBKK" in SEARCH_URLS:
     jobbkk_scraped_df = scrape_job_jobbkk(SEARCH_URLS)
 
 # %% [markdown]
@@ -1476,12 +2073,7 @@ def clean_jobbkk_data(df: pd.DataFrame) -> pd.DataFrame:
     out["min_salary"] = salary_parts["min"].fillna("").str.replace(",", "", regex=False)
     out["max_salary"] = salary_parts["max"].fillna("").str.replace(",", "", regex=False)
 
-    parsed_dates = pd.to_datetime(
-        out["posted_date"].fillna("").astype(str),
-        format="%d/%m/%Y %H:%M",
-        errors="coerce",
-    )
-    out["posted_date"] = parsed_dates.dt.strftime("%m/%d/%Y").fillna("")
+    out["posted_date"] = parse_jobbkk_posted_dates(out["posted_date"])
 
     return out
 
@@ -1489,46 +2081,504 @@ def clean_jobbkk_data(df: pd.DataFrame) -> pd.DataFrame:
 # ## JOBBKK Clean & Export Run
 
 # %%
-if "JOBBKK" in SEARCH_URLS:
+if RUN_SCRAPE and CRAWL_ENGINE == "sequential" and "JOBBKK" in SEARCH_URLS:
     jobbkk_scraped_df = clean_jobbkk_data(jobbkk_scraped_df)
-    jobbkk_scraped_df.to_csv(SCRAPED_EACH_DIR / "jobbkk_jobs.csv", index=False, encoding="utf-8-sig")
+    jobbkk_scraped_df = export_portal_csv(jobbkk_scraped_df, "JOBBKK", "jobbkk_jobs.csv")
 
 # %% [markdown]
-# ## Final output run (Concat all domain data)
+# ## Async Crawl Engine Function
 
 # %%
-csv_files = sorted(SCRAPED_EACH_DIR.glob("*.csv"))
+class DomainScheduler:
+    def __init__(self, concurrency: int):
+        self.concurrency = max(1, concurrency)
+        self._semaphores = {}
+
+    async def fetch(self, url: str, send):
+        # send is a blocking requests call; it runs on a worker thread so the loop keeps scheduling other domains.
+        # Request pacing is done by RATE_CONTROLLER inside portal_get, shared with the sequential crawlers.
+        domain = urlparse(url).netloc
+        if domain not in self._semaphores:
+            self._semaphores[domain] = asyncio.Semaphore(self.concurrency)
+
+        async with self._semaphores[domain]:
+            return await asyncio.to_thread(send)
+
+
+def jobthai_search_get(page_url: str, search_url: str) -> requests.Response:
+    response = portal_get(page_url, headers=headers, timeout=30)
+    response.raise_for_status()
+    return response
+
+
+def jobbkk_search_get(page_url: str, search_url: str) -> requests.Response:
+    response = portal_get(page_url, headers=headers, timeout=30)
+    response.raise_for_status()
+    return response
+
+
+def jobsdb_search_get(page_url: str, search_url: str) -> requests.Response:
+    return jobsdb_get(get_thread_jobsdb_session(), page_url, referer=search_url)
+
+
+ASYNC_PORTALS = {
+    "JobThai": {
+        "max_pages": 49,
+        "page_url": lambda search_url, page_num: search_url.replace("page=1", f"page={page_num}"),
+        "search_get": jobthai_search_get,
+        "parse_page": parse_jobthai_search_page,
+        "title_matches": title_matches_keyword_in_order,
+        "require_title": False,
+        "detail": lambda row: extract_detail_from_job_page(row["job_url"], headers=headers),
+    },
+    "JobsDB": {
+        "max_pages": 50,
+        "page_url": jobsdb_page_url,
+        "search_get": jobsdb_search_get,
+        "parse_page": parse_jobsdb_search_page,
+        "title_matches": title_matches_keyword,
+        "require_title": True,
+        "detail": fetch_jobsdb_detail,
+    },
+    "JOBBKK": {
+        "max_pages": 50,
+        "page_url": update_page_in_search_url,
+        "search_get": jobbkk_search_get,
+        "parse_page": parse_jobbkk_search_page,
+        "title_matches": title_matches_keyword,
+        "require_title": True,
+        "detail": lambda row: extract_jobbkk_detail(row["job_url"], headers=headers),
+    },
+}
+
+PORTAL_EXPORTS = {
+    "JobThai": (clean_data_jobthai, "jobthai_jobs.csv"),
+    "JobsDB": (clean_data_jobsdb, "jobsdb_jobs.csv"),
+    "JOBBKK": (clean_jobbkk_data, "jobbkk_jobs.csv"),
+}
 
-if not csv_files:
-    print(f"No CSV files found in: {SCRAPED_EACH_DIR.resolve()}")
-    job_all_df = pd.DataFrame()
-else:
-    dataframes = []
 
-    for file in csv_files:
-        if file.stat().st_size > 0:   # check file size
+def build_portal_frame(rows: list[dict], domain: str) -> pd.DataFrame:
+    job_df = pd.DataFrame(rows)
+    if job_df.empty:
+        return job_df
+
+    job_df["domain"] = domain
+    job_df["min_salary"] = None
+    job_df["max_salary"] = None
+
+    ordered_cols = [
+        "domain",
+        "keyword",
+        "province_name",
+        "job_title",
+        "company",
+        "location",
+        "salary",
+        "min_salary",
+        "max_salary",
+        "posted_date",
+        "job_url",
+        "matched_skills",
+        "matched_skill_count",
+        *SKILL_COLUMNS,
+    ]
+    for column in ordered_cols:
+        if column not in job_df.columns:
+            job_df[column] = "" if column not in {"matched_skill_count", *SKILL_COLUMNS} else 0
+
+    return job_df[ordered_cols].drop_duplicates(subset=["job_url"])
+
+
+def export_portal_frames(portal_frames: dict[str, pd.DataFrame]) -> None:
+    for domain, scraped_df in portal_frames.items():
+        clean_fn, file_name = PORTAL_EXPORTS[domain]
+        if not scraped_df.empty:
+            scraped_df = clean_fn(scraped_df)
+        export_portal_csv(scraped_df, domain, file_name)
+
+
+async def cancel_search_tasks(search_tasks: dict) -> None:
+    # Prefetched pages past the stop page: cancelled if still waiting for a slot, otherwise the response is dropped.
+    for task in search_tasks.values():
+        task.cancel()
+    await asyncio.gather(*search_tasks.values(), return_exceptions=True)
+    search_tasks.clear()
+
+
+async def crawl_keyword_async(scheduler: DomainScheduler, domain: str, keyword: str, search_url: str) -> pd.DataFrame:
+    portal = ASYNC_PORTALS[domain]
+    keyword_groups = keyword_match_groups_from_query(keyword)
+    max_pages = portal["max_pages"]
+
+    all_rows = []
+    seen_urls = set()
+    # page number -> fetch task for the page and up to SEARCH_PREFETCH_PAGES - 1 pages after it.
+    search_tasks = {}
+
+    def request_search_page(page_num: int) -> None:
+        if page_num <= max_pages and page_num not in search_tasks:
+            page_url = portal["page_url"](search_url, page_num)
+            search_tasks[page_num] = asyncio.create_task(
+                scheduler.fetch(page_url, lambda: portal["search_get"](page_url, search_url))
+            )
+
+    try:
+        for page_num in range(1, max_pages + 1):
+            page_url = portal["page_url"](search_url, page_num)
+            print(f"[Async] {domain} '{keyword}' page {page_num}/{max_pages} -> request")
+
+            for ahead in range(page_num, page_num + max(1, SEARCH_PREFETCH_PAGES)):
+                request_search_page(ahead)
             try:
-                df = pd.read_csv(file)
-                if not df.empty:
-                    dataframes.append(df)
-                else:
-                    print(f"{file.name} has header but no rows.")
-            except Exception as e:
-                print(f"Error reading {file.name}: {e}")
+                response = await search_tasks.pop(page_num)
+            except requests.HTTPError as http_err:
+                status_code = http_err.response.status_code if http_err.response is not None else None
+                if domain == "JobsDB" and status_code == 403:
+                    print("[Warn] JobsDB returned 403 (Forbidden). Tip: set JOBSDB_PROXY_URL.")
+                    break
+                raise
+
+            if domain == "JobThai" and "nodata=true" in response.url.lower():
+                break
+
+            archive_page(page_url, response.text, "search", keyword, page_num)
+            parse_started = time.perf_counter()
+            parsed_rows = portal["parse_page"](response.text, page_num, keyword)
+            if not parsed_rows:
+                record_parse(page_url, "search", parse_started, 0)
+                break
+
+            page_rows = []
+            for row in parsed_rows:
+                if not row["job_url"] or (portal["require_title"] and not row["job_title"]):
+                    continue
+                if not portal["title_matches"](row["job_title"], keyword_groups):
+                    continue
+                if row["job_url"] in seen_urls:
+                    continue
+
+                seen_urls.add(row["job_url"])
+                page_rows.append(row)
+
+            record_parse(page_url, "search", parse_started, len(page_rows))
+            if not page_rows:
+                break
+
+            if INCREMENTAL_CRAWL:
+                page_rows = drop_known_rows(page_rows)
+                if not page_rows:
+                    break
+
+            all_rows.extend(page_rows)
+
+        await cancel_search_tasks(search_tasks)
+        print(f"[Async] {domain} '{keyword}' -> detail extraction for {len(all_rows)} jobs")
+        fetch_detail = checkpointed_fetch(domain, portal["detail"])
+        details = await asyncio.gather(*[
+            asyncio.to_thread(fetch_detail, row)
+            if is_checkpointed(domain, row["job_url"]) or DETAIL_QUEUE.has(canonical_job_url(row["job_url"]))
+            else scheduler.fetch(row["job_url"], lambda row=row: fetch_detail(row))
+            for row in all_rows
+        ])
+        for row, detail_info in zip(all_rows, details):
+            row.update(detail_info)
+
+    except Exception as e:
+        await cancel_search_tasks(search_tasks)
+        print(f"Error occurred on {domain} scraping '{keyword}': {e}")
+        print(f"Skipping '{keyword}' on {domain}.")
+        return pd.DataFrame()
+
+    job_df = build_portal_frame(all_rows, domain)
+    print(f"[Done] Collected {len(job_df)} rows for '{keyword}' job search in {domain}")
+    return job_df
+
+
+async def crawl_all_portals_async(search_urls: dict) -> dict[str, pd.DataFrame]:
+    scheduler = DomainScheduler(ASYNC_DOMAIN_CONCURRENCY)
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=ASYNC_DOMAIN_CONCURRENCY * max(1, len(search_urls)))
+    )
+
+    tasks = {}
+    for domain, jobs in search_urls.items():
+        if domain not in ASYNC_PORTALS:
+            continue
+        for keyword, search_url in jobs:
+            tasks[(domain, keyword)] = asyncio.create_task(crawl_keyword_async(scheduler, domain, keyword, search_url))
+
+    await asyncio.gather(*tasks.values())
+
+    portal_frames = {}
+    for domain in search_urls:
+        frames = [task.result() for (task_domain, _), task in tasks.items() if task_domain == domain]
+        frames = [frame for frame in frames if not frame.empty]
+        if frames:
+            portal_frames[domain] = pd.concat(frames, ignore_index=True).drop_duplicates(subset=["job_url"])
         else:
-            print(f"{file.name} is empty (0 bytes). Skipping.")   
+            portal_frames[domain] = pd.DataFrame()
+    return portal_frames
 
-    if dataframes:
-        job_all_df = pd.concat(dataframes, ignore_index=True)
-    else:
+# %% [markdown]
+# ## Async Crawl Run (Clean & Export)
+
+# %%
+if RUN_SCRAPE and CRAWL_ENGINE == "async":
+    portal_frames = asyncio.run(crawl_all_portals_async(SEARCH_URLS))
+    export_portal_frames(portal_frames)
+
+# %% [markdown]
+# ## Task Queue Crawl Function
+
+# %%
+QUEUE_POLL_SECONDS = 2
+
+
+def queue_domains(search_urls: dict) -> list[str]:
+    return [domain for domain in search_urls if domain in ASYNC_PORTALS and (not QUEUE_DOMAINS or domain in QUEUE_DOMAINS)]
+
+
+def seed_queue_tasks(queue: CrawlTaskQueue, run_id: str, search_urls: dict) -> None:
+    # Page 1 of every keyword; already queued (another runner, or an earlier start of this run) is a no-op.
+    for domain in queue_domains(search_urls):
+        for keyword, search_url in search_urls[domain]:
+            queue.enqueue(run_id, "search", domain, search_url, keyword=keyword, page=1)
+
+
+def run_search_task(queue: CrawlTaskQueue, task: dict) -> dict:
+    # One search page with the stop rules of crawl_keyword_async: the next page is only queued when this one kept
+    # rows, and rows kept on the keyword's earlier pages count as seen. Kept rows queue their detail task.
+    domain, keyword, page_num, search_url = task["domain"], task["keyword"], task["page"], task["url"]
+    portal = ASYNC_PORTALS[domain]
+    keyword_groups = keyword_match_groups_from_query(keyword)
+    page_url = portal["page_url"](search_url, page_num)
+
+    try:
+        response = portal["search_get"](page_url, search_url)
+    except requests.HTTPError as http_err:
+        status_code = http_err.response.status_code if http_err.response is not None else None
+        if domain == "JobsDB" and status_code == 403:
+            print("[Warn] JobsDB returned 403 (Forbidden). Tip: set JOBSDB_PROXY_URL.")
+            return {"rows": [], "stop": "403"}
+        raise
+
+    if domain == "JobThai" and "nodata=true" in response.url.lower():
+        return {"rows": [], "stop": "no data"}
+
+    archive_page(page_url, response.text, "search", keyword, page_num)
+    parse_started = time.perf_counter()
+    parsed_rows = portal["parse_page"](response.text, page_num, keyword)
+    if not parsed_rows:
+        record_parse(page_url, "search", parse_started, 0)
+        return {"rows": [], "stop": "no cards"}
+
+    seen_urls = {
+        row["job_url"]
+        for earlier_page in queue.results(task["run_id"], "search", domain, keyword)
+        if earlier_page["page"] < page_num
+        for row in earlier_page["result"]["rows"]
+    }
+    page_rows = []
+    for row in parsed_rows:
+        if not row["job_url"] or (portal["require_title"] and not row["job_title"]):
+            continue
+        if not portal["title_matches"](row["job_title"], keyword_groups):
+            continue
+        if row["job_url"] in seen_urls:
+            continue
+
+        seen_urls.add(row["job_url"])
+        page_rows.append(row)
+
+    record_parse(page_url, "search", parse_started, len(page_rows))
+    if not page_rows:
+        return {"rows": [], "stop": "no keyword matches"}
+
+    if INCREMENTAL_CRAWL:
+        page_rows = drop_known_rows(page_rows)
+        if not page_rows:
+            return {"rows": [], "stop": "only known postings"}
+
+    for row in page_rows:
+        row.pop("raw_text", None)
+        queue.enqueue(task["run_id"], "detail", domain, canonical_job_url(row["job_url"]))
+    if page_num < portal["max_pages"]:
+        queue.enqueue(task["run_id"], "search", domain, search_url, keyword=keyword, page=page_num + 1)
+    return {"rows": page_rows, "stop": ""}
+
+
+def run_detail_task(task: dict) -> dict:
+    detail_info = ASYNC_PORTALS[task["domain"]]["detail"]({"job_url": task["url"]})
+    # Raise on an empty detail so the task is retried rather than stored as done with no detail.
+    if not has_detail_text(detail_info):
+        raise LookupError(f"no detail text extracted from {task['url']}")
+    return {key: value for key, value in detail_info.items() if key not in HEAVY_ROW_FIELDS}
+
+
+def run_queue_worker(queue: CrawlTaskQueue, run_id: str, worker_id: str) -> None:
+    # Works tasks until every task of the run (in QUEUE_DOMAINS) is done or failed.
+    domains = QUEUE_DOMAINS or None
+    while True:
+        task = queue.lease(run_id, worker_id, domains)
+        if task is None:
+            if queue.is_drained(run_id, domains):
+                return
+            # Other workers hold the remaining leases, or failed tasks are waiting out their retry delay.
+            time.sleep(QUEUE_POLL_SECONDS)
+            continue
+
+        try:
+            result = run_search_task(queue, task) if task["kind"] == "search" else run_detail_task(task)
+        except Exception as e:
+            print(f"[Queue] {task['kind']} {task['domain']} {task['url']} attempt {task['attempt']} failed: {e}")
+            queue.fail(task, worker_id, f"{type(e).__name__}: {e}")
+            continue
+        queue.complete(task, worker_id, result)
+
+
+def queue_portal_frames(queue: CrawlTaskQueue, run_id: str, search_urls: dict) -> dict[str, pd.DataFrame]:
+    # Rows of every finished search page (keywords in SEARCH_URLS order, pages in order) joined with their details.
+    details = {task["url"]: task["result"] for task in queue.results(run_id, "detail")}
+
+    portal_frames = {}
+    for domain in queue_domains(search_urls):
+        rows = []
+        for keyword, _ in search_urls[domain]:
+            for page in queue.results(run_id, "search", domain, keyword):
+                for row in page["result"]["rows"]:
+                    rows.append({**row, **details.get(canonical_job_url(row["job_url"]), {})})
+        portal_frames[domain] = build_portal_frame(rows, domain)
+    return portal_frames
+
+# %% [markdown]
+# ## Task Queue Crawl Run (Clean & Export)
+
+# %%
+if RUN_SCRAPE and CRAWL_ENGINE == "queue":
+    queue_run_id = QUEUE_RUN_ID or RUN_ID
+    task_queue = CrawlTaskQueue(TASK_QUEUE_PATH, lease_seconds=QUEUE_LEASE_SECONDS, max_attempts=QUEUE_MAX_ATTEMPTS)
+    seed_queue_tasks(task_queue, queue_run_id, SEARCH_URLS)
+
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    print(f"[Queue] run {queue_run_id}: {QUEUE_WORKERS} workers as {worker_id} -> {TASK_QUEUE_PATH}")
+    with ThreadPoolExecutor(max_workers=QUEUE_WORKERS) as executor:
+        list(executor.map(
+            lambda index: run_queue_worker(task_queue, queue_run_id, f"{worker_id}-{index}"),
+            range(QUEUE_WORKERS),
+        ))
+    print(f"[Queue] {task_queue.summary(queue_run_id)}")
+
+    if QUEUE_EXPORT:
+        export_portal_frames(queue_portal_frames(task_queue, queue_run_id, SEARCH_URLS))
+    task_queue.close()
+
+# %% [markdown]
+# ## Typed Snapshot Function
+
+# %%
+SNAPSHOT_CATEGORY_COLUMNS = ["domain", "keyword", "province_name"]
+
+
+def to_typed_snapshot(df: pd.DataFrame) -> pd.DataFrame:
+    typed = df.copy()
+
+    for column in SNAPSHOT_CATEGORY_COLUMNS:
+        if column in typed.columns:
+            typed[column] = typed[column].astype("category")
+
+    for column in ["min_salary", "max_salary"]:
+        if column in typed.columns:
+            typed[column] = pd.to_numeric(typed[column], errors="coerce")
+
+    if "posted_date" in typed.columns:
+        typed["posted_date"] = pd.to_datetime(typed["posted_date"], format="%m/%d/%Y", errors="coerce")
+
+    if "matched_skill_count" in typed.columns:
+        typed["matched_skill_count"] = pd.to_numeric(typed["matched_skill_count"], errors="coerce").fillna(0).astype("int16")
+
+    skill_columns = [column for column in typed.columns if column.startswith("skill_")]
+    for column in skill_columns:
+        typed[column] = pd.to_numeric(typed[column], errors="coerce").fillna(0).astype("int8")
+
+    return typed
+
+
+def write_typed_snapshot(df: pd.DataFrame, path: Path) -> None:
+    try:
+        to_typed_snapshot(df).to_parquet(path, index=False, compression="zstd")
+    except ImportError as e:
+        # A snapshot left over from an earlier run would be read by the dashboard in place of the new CSV.
+        path.unlink(missing_ok=True)
+        print(f"[Warn] Skipping {path.name} (removed any older copy): {e}")
+
+# %% [markdown]
+# ## Final output run (Concat all domain data)
+
+# %%
+if RUN_SCRAPE and (CRAWL_ENGINE != "queue" or QUEUE_EXPORT):
+    csv_files = sorted(SCRAPED_EACH_DIR.glob("*.csv"))
+
+    if not csv_files:
+        print(f"No CSV files found in: {SCRAPED_EACH_DIR.resolve()}")
         job_all_df = pd.DataFrame()
+    else:
+        dataframes = []
+
+        for file in csv_files:
+            if file.stat().st_size > 0:   # check file size
+                try:
+                    df = pd.read_csv(file)
+                    if not df.empty:
+                        dataframes.append(df)
+                    else:
+                        print(f"{file.name} has header but no rows.")
+                except Exception as e:
+                    print(f"Error reading {file.name}: {e}")
+            else:
+                print(f"{file.name} is empty (0 bytes). Skipping.")   
+
+        if dataframes:
+            job_all_df = pd.concat(dataframes, ignore_index=True)
+        else:
+            job_all_df = pd.DataFrame()
+
+        if CROSS_PORTAL_DEDUP and not job_all_df.empty:
+            job_all_df = assign_canonical_job_ids(job_all_df, DEDUP_THRESHOLD)
+            print(f"[Dedup] {dedup_summary(job_all_df)}")
+
+        run_id = RUN_ID
+        output_static = SCRAPED_ALL_DIR / "jobs_all_scraped.csv"
+
+        job_all_df.to_csv(output_static, index=False, encoding="utf-8-sig")
+        if KEEP_TIMESTAMPED_SNAPSHOTS:
+            job_all_df.to_csv(SCRAPED_ALL_DIR / f"jobs_all_scraped_{run_id}.csv", index=False, encoding="utf-8-sig")
+        write_typed_snapshot(job_all_df, SCRAPED_ALL_DIR / "jobs_all_scraped.parquet")
+
+        history_summary = JobHistoryStore(SCRAPED_ALL_DIR).record_run(run_id, job_all_df)
+        print(f"[History] {history_summary}")
+
+        print(f"Concatenated {len(csv_files)} files -> {len(job_all_df)} rows")
+
+if RUN_SCRAPE:
+    if DETAIL_CACHE is not None:
+        print(f"[Cache] {DETAIL_CACHE.summary()}")
+        DETAIL_CACHE.close()
 
-    output_static = SCRAPED_ALL_DIR / "jobs_all_scraped.csv"
-    output_timestamped = SCRAPED_ALL_DIR / f"jobs_all_scraped_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    if PAGE_ARCHIVE is not None:
+        print(f"[Archive] {PAGE_ARCHIVE.summary()}")
+        PAGE_ARCHIVE.close()
 
-    job_all_df.to_csv(output_static, index=False, encoding="utf-8-sig")
-    job_all_df.to_csv(output_timestamped, index=False, encoding="utf-8-sig")
+    print(f"[Detail] {DETAIL_QUEUE.summary()}")
+    print(f"[Rate] {RATE_CONTROLLER.summary()}")
+    print(f"[Pool] {HTTP_POOL.summary()}")
+    print(f"[Telemetry]\n{TELEMETRY.report()}")
+    if TELEMETRY.path is not None:
+        TELEMETRY.write_summary(TELEMETRY.path.with_name(f"{TELEMETRY.path.stem}_summary.json"))
+        print(f"[Telemetry] records -> {TELEMETRY.path}")
+    TELEMETRY.close()
 
-    print(f"Concatenated {len(csv_files)} files -> {len(job_all_df)} rows")
+    for checkpoint in ROW_CHECKPOINTS.values():
+        checkpoint.close()
 
 
@@ -0,0 +1,86 @@
+# End-to-end crawl throughput against the local portal stand-in (no real portal is contacted).
+# Record an archive once with `python Moss/portal_replay.py record` + PORTAL_BASE_URL, then e.g.:
+#   python Moss/benchmarks/bench_crawl_replay.py --archive Moss/portal_archive.sqlite3 \
+#       --latency-ms 150 --jitter-ms 50 --rate-429 0.02 --env DETAIL_WORKERS=4 CRAWL_ENGINE=async
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+MOSS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(MOSS_DIR))
+
+from portal_replay import FaultPlan, start_server, stop_server  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--archive", default=str(MOSS_DIR / "portal_archive.sqlite3"))
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-403", type=float, default=0.0)
+    parser.add_argument("--hosts-403", nargs="*", default=[])
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--rate-truncate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--env", nargs="*", default=[], help="scraper settings as NAME=value")
+    args = parser.parse_args()
+
+    if not Path(args.archive).exists():
+        sys.exit(f"Archive not found: {args.archive} (record one with portal_replay.py record)")
+
+    faults = FaultPlan(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_403=args.rate_403,
+        hosts_403=args.hosts_403,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        rate_truncate=args.rate_truncate,
+        seed=args.seed,
+    )
+    server = start_server(args.archive, mode="replay", faults=faults)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        env = {
+            **os.environ,
+            "PORTAL_BASE_URL": server.base_url,
+            "SCRAPE_OUTPUT_DIR": output_dir,
+            "HTTP_CACHE": "0",
+            **dict(item.split("=", 1) for item in args.env),
+        }
+        print(f"[Bench] replaying {args.archive} on {server.base_url} with {' '.join(args.env) or 'default settings'}")
+
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, str(MOSS_DIR / "Scrape_Prototype_run.py")],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        elapsed = time.perf_counter() - started
+        stop_server(server)
+
+        output_csv = Path(output_dir) / "Scraped_All" / "jobs_all_scraped.csv"
+        try:
+            rows = len(pd.read_csv(output_csv))
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            rows = 0
+
+    if result.returncode != 0:
+        print(result.stdout[-2000:])
+        print(result.stderr[-2000:])
+
+    requests_seen = sum(server.stats.values())
+    print(f"[Bench] exit={result.returncode} wall={elapsed:.1f}s rows={rows} requests={requests_seen} ({requests_seen / elapsed:.1f}/s)")
+    print(f"[Bench] server {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Parse time and output parity of the BeautifulSoup tree builders on the HTML fixtures.
+#   python Moss/benchmarks/bench_html_parser.py --backends html.parser lxml --repeat 20
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("HTTP_CACHE", "0")
+
+import Scrape_Prototype_run as scraper  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def read_fixture(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+def parse_search_pages() -> list[dict]:
+    rows = []
+
+    soup = scraper.make_soup(read_fixture("jobthai_search.html"))
+    for title_node in soup.select('h2[id^="job-card-item-"]'):
+        rows.append(scraper.parse_card_from_title(title_node, page_num=1, keyword="Data Analyst"))
+
+    soup = scraper.make_soup(read_fixture("jobsdb_search.html"))
+    for card in soup.select("article[data-testid='job-card'], article[data-automation='normalJob']"):
+        rows.append(scraper.parse_card(card, page_num=1, search_keyword="Data Analyst"))
+
+    soup = scraper.make_soup(read_fixture("jobbkk_search.html"))
+    for card in soup.select("div.joblist-pos.jobbkk-list-company"):
+        rows.append(scraper.parse_jobbkk_card(card, page_num=1, keyword="Data Analyst"))
+
+    return rows
+
+
+def parse_detail_pages() -> list:
+    # The detail extractors fetch through cached_get_text; serve the fixtures instead of the network.
+    pages = {
+        "https://www.jobthai.com/th/job/1": read_fixture("jobthai_detail.html"),
+        "https://th.jobsdb.com/th/job/1": read_fixture("jobsdb_detail.html"),
+        "https://jobbkk.com/jobs/detailurgent/1/1": read_fixture("jobbkk_detail.html"),
+    }
+    original = scraper.cached_get_text
+    scraper.cached_get_text = lambda job_url, cache_key, send: pages[job_url]
+    try:
+        return [
+            scraper.extract_detail_from_job_page("https://www.jobthai.com/th/job/1", headers=scraper.headers),
+            scraper.extract_job_detail_text("https://th.jobsdb.com/th/job/1", session=object()),
+            scraper.extract_jobbkk_detail("https://jobbkk.com/jobs/detailurgent/1/1", headers=scraper.headers),
+        ]
+    finally:
+        scraper.cached_get_text = original
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", default=["html.parser", "lxml"])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    backends = [backend for backend in args.backends if scraper.resolve_html_parser(backend) == backend]
+    timings = {backend: {"search": [], "detail": []} for backend in backends}
+    outputs = {}
+    # Backends alternate within every repetition and the medians are reported, so load spikes on a shared
+    # machine hit both sides instead of whichever backend happened to run during them.
+    for _ in range(args.repeat):
+        for backend in backends:
+            scraper.HTML_PARSER_BACKEND = backend
+            started = time.perf_counter()
+            search_rows = parse_search_pages()
+            timings[backend]["search"].append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            detail_rows = parse_detail_pages()
+            timings[backend]["detail"].append((time.perf_counter() - started) * 1000)
+            outputs[backend] = (search_rows, detail_rows)
+
+    for backend in backends:
+        search_ms = statistics.median(timings[backend]["search"])
+        detail_ms = statistics.median(timings[backend]["detail"])
+        print(f"{backend:>12}: search pages {search_ms:7.2f} ms | detail pages {detail_ms:7.2f} ms | rows={len(outputs[backend][0])}")
+
+    reference_backend, reference = next(iter(outputs.items()))
+    for backend, output in outputs.items():
+        if backend != reference_backend:
+            print(f"{backend} output identical to {reference_backend}: {output == reference}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Per-row cost of the vectorized JobsDB relative-date parser against the previous row-by-row apply.
+#   python Moss/benchmarks/bench_jobsdb_dates.py --sizes 1000 10000 100000
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("HTTP_CACHE", "0")
+
+import Scrape_Prototype_run as scraper  # noqa: E402
+from thai_dates import parse_relative_posted_dates  # noqa: E402
+
+UNITS = ["นาที", "ชั่วโมง", "วัน", "สัปดาห์", "เดือน"]
+
+
+def legacy_parse_jobsdb_relative_posted_date(value: str, now_dt: datetime) -> str:
+    text = scraper.clean_text(str(value or ""))
+    if not text:
+        return ""
+
+    for unit, step in [
+        ("ชั่วโมง", timedelta(hours=1)),
+        ("วัน", timedelta(days=1)),
+        ("นาที", timedelta(minutes=1)),
+        ("สัปดาห์", timedelta(days=7)),
+        ("เดือน", timedelta(days=30)),
+    ]:
+        match = re.search(rf"(\d+)\s*{unit}ที่ผ่านมา", text)
+        if match:
+            return (now_dt - step * int(match.group(1))).strftime("%m/%d/%Y")
+
+    return ""
+
+
+def build_column(size: int, seed: int = 7) -> pd.Series:
+    rng = random.Random(seed)
+    values = []
+    for _ in range(size):
+        roll = rng.random()
+        if roll < 0.05:
+            values.append("")
+        elif roll < 0.08:
+            values.append("30+ วันที่ผ่านมา")
+        else:
+            values.append(f"{rng.randint(1, 59)} {rng.choice(UNITS)}ที่ผ่านมา")
+    return pd.Series(values, dtype=object)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    now_dt = datetime.now()
+    print(f"{'rows':>8} {'apply us/row':>13} {'vector us/row':>14} {'speedup':>8} {'identical':>10}")
+
+    for size in args.sizes:
+        column = build_column(size)
+
+        started = time.perf_counter()
+        legacy = column.apply(legacy_parse_jobsdb_relative_posted_date, now_dt=now_dt)
+        legacy_latency = (time.perf_counter() - started) / size
+
+        started = time.perf_counter()
+        vectorized = parse_relative_posted_dates(column, now_dt=now_dt)
+        vector_latency = (time.perf_counter() - started) / size
+
+        identical = legacy.equals(vectorized.dt.strftime("%m/%d/%Y").fillna(""))
+        print(
+            f"{size:>8} {legacy_latency * 1e6:>13.2f} {vector_latency * 1e6:>14.2f} "
+            f"{legacy_latency / vector_latency:>7.1f}x {str(identical):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
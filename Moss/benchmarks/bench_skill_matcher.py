@@ -0,0 +1,92 @@
+# Per-document latency of the compiled SkillMatcher against the previous per-variant regex search.
+#   python Moss/benchmarks/bench_skill_matcher.py --sizes 1000 10000 100000
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("HTTP_CACHE", "0")
+
+import Scrape_Prototype_run as scraper  # noqa: E402
+from skill_matcher import SkillMatcher, normalize_for_skill_match  # noqa: E402
+
+FILLER_WORDS = [
+    "we", "are", "looking", "for", "a", "team", "player", "with", "experience", "in", "building",
+    "reports", "dashboards", "and", "models", "to", "support", "business", "decisions", "strong",
+    "communication", "skills", "bachelor", "degree", "or", "related", "field", "years", "of",
+    "work", "closely", "stakeholders", "ownership", "data", "quality", "ความรับผิดชอบ", "คุณสมบัติ",
+    "ปริญญาตรี", "สาขาที่เกี่ยวข้อง", "มีประสบการณ์", "ทำงาน", "เป็นทีม", "c#", "r&d", "s3-compatible",
+    "gitops", "apis", "sparkling", "restful", "etl/elt", "power-bi", "scikit-learn", "sql,",
+]
+
+
+def legacy_variant_matches_text(variant: str, normalized_text: str) -> bool:
+    variant_norm = normalize_for_skill_match(variant)
+    if not variant_norm:
+        return False
+    pattern = rf"(?<![a-z0-9]){re.escape(variant_norm).replace(r'\\ ', r'\\s+')}(?![a-z0-9])"
+    return re.search(pattern, normalized_text) is not None
+
+
+def legacy_extract_skills(text: str) -> dict:
+    normalized_text = normalize_for_skill_match(text)
+    matched = []
+
+    for skill_name, variants in scraper.SKILLS.items():
+        if any(legacy_variant_matches_text(variant, normalized_text) for variant in variants):
+            matched.append(skill_name)
+
+    skill_flags = {f"skill_{name}": int(name in matched) for name in scraper.SKILLS}
+
+    return {
+        "matched_skills": "|".join(matched),
+        "matched_skill_count": len(matched),
+        **skill_flags,
+    }
+
+
+def build_corpus(size: int, words_per_doc: int = 350, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    variants = [variant for variants in scraper.SKILLS.values() for variant in variants]
+    docs = []
+    for _ in range(size):
+        words = rng.choices(FILLER_WORDS, k=words_per_doc)
+        for _ in range(rng.randint(0, 12)):
+            variant = rng.choice(variants).strip()
+            words.insert(rng.randrange(len(words)), variant.upper() if rng.random() < 0.2 else variant)
+        docs.append(" ".join(words))
+    return docs
+
+
+def time_per_doc(extract, docs: list[str]) -> tuple[float, list[dict]]:
+    started = time.perf_counter()
+    results = [extract(doc) for doc in docs]
+    return (time.perf_counter() - started) / len(docs), results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    matcher = SkillMatcher(scraper.SKILLS)
+    print(f"compile: {(time.perf_counter() - started) * 1000:.2f} ms for {len(scraper.SKILLS)} skills")
+    print(f"{'docs':>8} {'legacy us/doc':>14} {'matcher us/doc':>15} {'speedup':>8} {'identical':>10}")
+
+    for size in args.sizes:
+        docs = build_corpus(size)
+        legacy_latency, legacy_results = time_per_doc(legacy_extract_skills, docs)
+        matcher_latency, matcher_results = time_per_doc(matcher.extract, docs)
+        print(
+            f"{size:>8} {legacy_latency * 1e6:>14.1f} {matcher_latency * 1e6:>15.1f} "
+            f"{legacy_latency / matcher_latency:>7.1f}x {str(legacy_results == matcher_results):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+# Offline benchmark of the parsing and cleaning hot paths on the HTML fixtures.
+# Every case runs at a fixed item count and reports per-item latency and traced peak allocation;
+# results are compared against baselines.json so a slowdown shows up before the scheduled scrape.
+# Latency is compared as relative_time: the case's time per item over a fixed pure-Python calibration loop timed
+# alongside it, the median over the repetitions, so a faster, slower or busier machine does not read as a change;
+# the "base" column is the baseline scaled to this machine. CPUs and Python versions still differ in relative
+# speed, so save the baselines again on a new runner or Python version (the suite warns when the Python version
+# differs) and after re-recording the fixtures.
+# The fixtures are synthetic (hand-written pages, see fixtures/sources.json) until record_fixtures.py replaces
+# them with recorded ones, so the numbers track changes in this repo's code, not real-page throughput.
+# Timings on shared runners still vary by tens of percent; --check is for before/after runs on one machine and
+# is not part of CI.
+#   python Moss/benchmarks/bench_suite.py                    compare against the stored baselines
+#   python Moss/benchmarks/bench_suite.py --check            exit 1 when a case regresses
+#   python Moss/benchmarks/bench_suite.py --save-baseline    record this machine's numbers
+import argparse
+import gc
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from itertools import cycle, islice
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("HTTP_CACHE", "0")
+
+import Scrape_Prototype_run as scraper  # noqa: E402
+from bench_html_parser import parse_detail_pages  # noqa: E402
+
+BENCH_DIR = Path(__file__).resolve().parent
+FIXTURES_DIR = BENCH_DIR / "fixtures"
+BASELINE_PATH = BENCH_DIR / "baselines.json"
+SOURCES_PATH = FIXTURES_DIR / "sources.json"
+RUNNER_KEY = "_runner"
+
+CARD_ITEMS = 1000
+PAGE_ITEMS = 50
+TEXT_ITEMS = 1000
+LOCATION_ITEMS = 10000
+CLEAN_ROWS = 10000
+CALIBRATION_ITEMS = 20000
+
+
+def read_fixture(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+def repeat_to(items: list, size: int) -> list:
+    return list(islice(cycle(items), size))
+
+
+def synthetic_fixtures() -> list[str]:
+    # Fixtures not recorded from portal pages (see record_fixtures.py).
+    sources = json.loads(SOURCES_PATH.read_text(encoding="utf-8")) if SOURCES_PATH.exists() else {}
+    return sorted(
+        path.name
+        for path in FIXTURES_DIR.glob("*.html")
+        if sources.get(path.name, {}).get("source", "synthetic") == "synthetic"
+    )
+
+
+def require_items(name: str, items: list) -> list:
+    if not items:
+        raise SystemExit(f"{name}: the parser found nothing in the fixture; re-record it with record_fixtures.py")
+    return items
+
+
+def load_inputs() -> dict:
+    jobthai_soup = scraper.make_soup(read_fixture("jobthai_search.html"))
+    jobsdb_soup = scraper.make_soup(read_fixture("jobsdb_search.html"))
+    jobbkk_soup = scraper.make_soup(read_fixture("jobbkk_search.html"))
+
+    jobthai_nodes = require_items("jobthai_search.html", jobthai_soup.select('h2[id^="job-card-item-"]'))
+    jobsdb_cards = require_items(
+        "jobsdb_search.html",
+        jobsdb_soup.select("article[data-testid='job-card'], article[data-automation='normalJob']"),
+    )
+    jobbkk_cards = require_items("jobbkk_search.html", jobbkk_soup.select("div.joblist-pos.jobbkk-list-company"))
+
+    jobthai_rows = [scraper.parse_card_from_title(node, page_num=1, keyword="Data Analyst") for node in jobthai_nodes]
+    jobsdb_rows = [scraper.parse_card(card, page_num=1, search_keyword="Data Analyst") for card in jobsdb_cards]
+    jobbkk_rows = [scraper.parse_jobbkk_card(card, page_num=1, keyword="Data Analyst") for card in jobbkk_cards]
+
+    detail_texts = [
+        scraper.clean_text(scraper.make_soup(read_fixture(name)).get_text("\n", strip=True))
+        for name in ["jobthai_detail.html", "jobsdb_detail.html", "jobbkk_detail.html"]
+    ]
+    # Detail pages in the wild are a few KB of text; pad the short fixtures with card text.
+    card_text = " ".join(row["raw_text"] for row in jobthai_rows + jobsdb_rows + jobbkk_rows)
+    detail_texts = [f"{text} {card_text}" for text in detail_texts]
+
+    jobthai_detail, jobsdb_detail_text, jobbkk_detail = parse_detail_pages()
+    jobsdb_detail = {"job_detail_text": jobsdb_detail_text, **scraper.extract_skills(jobsdb_detail_text)}
+
+    def scraped_frame(rows: list[dict], detail: dict, domain: str) -> pd.DataFrame:
+        # Search fields + detail fields shaped like the crawler output; URLs are made unique so
+        # the repeated rows survive the job_url de-duplication.
+        full_rows = [
+            {**row, **detail, "job_url": f"{row['job_url']}#{index}"}
+            for index, row in enumerate(repeat_to(rows, CLEAN_ROWS))
+        ]
+        return scraper.build_portal_frame(full_rows, domain)
+
+    locations = [row["location"] for row in jobthai_rows + jobsdb_rows + jobbkk_rows]
+    portal_frames = [
+        scraped_frame(jobthai_rows, jobthai_detail, "JobThai"),
+        scraped_frame(jobsdb_rows, jobsdb_detail, "JobsDB"),
+        scraped_frame(jobbkk_rows, jobbkk_detail, "JOBBKK"),
+    ]
+
+    return {
+        "jobthai_nodes": repeat_to(jobthai_nodes, CARD_ITEMS),
+        "jobsdb_cards": repeat_to(jobsdb_cards, CARD_ITEMS),
+        "jobbkk_cards": repeat_to(jobbkk_cards, CARD_ITEMS),
+        "jobthai_state_pages": repeat_to([read_fixture("jobthai_search_state.html")], PAGE_ITEMS),
+        "jobsdb_state_pages": repeat_to([read_fixture("jobsdb_search_state.html")], PAGE_ITEMS),
+        "detail_texts": repeat_to(detail_texts, TEXT_ITEMS),
+        "locations": repeat_to(locations, LOCATION_ITEMS),
+        "jobthai_df": portal_frames[0],
+        "jobsdb_df": portal_frames[1],
+        "jobbkk_df": portal_frames[2],
+        "all_df": pd.concat(portal_frames, ignore_index=True),
+    }
+
+
+def build_cases(inputs: dict) -> dict:
+    # name -> (item count, setup returning the argument, function run once per repetition)
+    def per_item(fn, items):
+        return len(items), lambda: items, lambda batch: [fn(item) for item in batch]
+
+    def per_frame(fn, frame):
+        return len(frame), frame.copy, fn
+
+    def per_page(parse_page, pages, fixture):
+        # One item per job on the page, to compare with the per-card parsers.
+        items = len(pages) * len(require_items(fixture, parse_page(pages[0], 1, "Data Analyst")))
+        return items, lambda: pages, lambda batch: [parse_page(page, 1, "Data Analyst") for page in batch]
+
+    def resolve_uncached(batch):
+        scraper.PROVINCE_RESOLVER._cache.clear()
+        return [scraper.guess_province_name(location) for location in batch]
+
+    return {
+        "parse_card_from_title": per_item(
+            lambda node: scraper.parse_card_from_title(node, page_num=1, keyword="Data Analyst"),
+            inputs["jobthai_nodes"],
+        ),
+        "parse_card": per_item(
+            lambda card: scraper.parse_card(card, page_num=1, search_keyword="Data Analyst"),
+            inputs["jobsdb_cards"],
+        ),
+        "parse_jobbkk_card": per_item(
+            lambda card: scraper.parse_jobbkk_card(card, page_num=1, keyword="Data Analyst"),
+            inputs["jobbkk_cards"],
+        ),
+        "parse_jobthai_search_page": per_page(
+            scraper.parse_jobthai_search_page, inputs["jobthai_state_pages"], "jobthai_search_state.html"
+        ),
+        "parse_jobsdb_search_page": per_page(
+            scraper.parse_jobsdb_search_page, inputs["jobsdb_state_pages"], "jobsdb_search_state.html"
+        ),
+        "extract_skills": per_item(scraper.extract_skills, inputs["detail_texts"]),
+        "guess_province_name": (len(inputs["locations"]), lambda: inputs["locations"], resolve_uncached),
+        "clean_data_jobthai": per_frame(scraper.clean_data_jobthai, inputs["jobthai_df"]),
+        "clean_data_jobsdb": per_frame(scraper.clean_data_jobsdb, inputs["jobsdb_df"]),
+        "clean_jobbkk_data": per_frame(scraper.clean_jobbkk_data, inputs["jobbkk_df"]),
+        "assign_canonical_job_ids": per_frame(scraper.assign_canonical_job_ids, inputs["all_df"]),
+    }
+
+
+def measure(items: int, setup, run, repeat: int, calibration) -> dict:
+    # Each repetition times the calibration loop and then the case back to back, so both see the same machine
+    # load; the case is scored by the median of the per-repetition ratios (relative_time).
+    calibration_items, calibration_setup, calibration_run = calibration
+    timings = []
+    calibration_timings = []
+    for _ in range(repeat):
+        for timed, count, prepare, work in (
+            (calibration_timings, calibration_items, calibration_setup, calibration_run),
+            (timings, items, setup, run),
+        ):
+            argument = prepare()
+            gc.collect()
+            started = time.perf_counter()
+            work(argument)
+            timed.append((time.perf_counter() - started) / count * 1e6)
+
+    # Allocation pass is separate, tracing slows the code down.
+    argument = setup()
+    gc.collect()
+    tracemalloc.start()
+    run(argument)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "items": items,
+        "us_per_item": statistics.median(timings),
+        "calibration_us_per_item": statistics.median(calibration_timings),
+        "relative_time": statistics.median(case / base for case, base in zip(timings, calibration_timings)),
+        "peak_bytes_per_item": peak / items,
+    }
+
+
+def calibration_case() -> tuple[int, object, object]:
+    # Fixed string, regex and dict work that no change in the repo touches; it only tracks machine speed.
+    words = [f"Data {index % 97} Analyst, Bangkok {index % 13}" for index in range(CALIBRATION_ITEMS)]
+
+    def run(batch):
+        counts = {}
+        for text in batch:
+            for token in re.split(r"[\s,]+", text.lower()):
+                counts[token] = counts.get(token, 0) + 1
+        return sorted(counts.items())
+
+    return len(words), lambda: words, run
+
+
+def load_baselines() -> dict:
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--baseline-repeat", type=int, default=21, help="repetitions for --save-baseline")
+    parser.add_argument("--cases", nargs="+", help="only run these cases")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any case is over the tolerance")
+    parser.add_argument("--time-tolerance", type=float, default=2.0, help="allowed relative_time ratio vs baseline")
+    parser.add_argument("--alloc-tolerance", type=float, default=1.25, help="allowed allocation ratio vs baseline")
+    args = parser.parse_args()
+
+    cases = build_cases(load_inputs())
+    if args.cases:
+        cases = {name: cases[name] for name in args.cases}
+
+    baselines = load_baselines()
+    results = {}
+    regressions = []
+
+    synthetic = synthetic_fixtures()
+    if synthetic:
+        print(f"[Bench] synthetic suite, fixtures not recorded from portal pages: {', '.join(synthetic)}")
+
+    runner = baselines.get(RUNNER_KEY, {})
+    if runner and runner.get("python") != platform.python_version():
+        print(
+            f"[Bench] baselines were saved on Python {runner['python']}, this is {platform.python_version()}; "
+            "save them again with --save-baseline on this runner"
+        )
+
+    calibration = calibration_case()
+    repeat = max(args.repeat, args.baseline_repeat) if args.save_baseline else args.repeat
+    print(f"{'case':<26} {'items':>6} {'us/item':>9} {'base':>9} {'ratio':>6} {'B/item':>9} {'base':>9} {'ratio':>6}")
+    for name, (items, setup, run) in cases.items():
+        result = measure(items, setup, run, repeat, calibration)
+        results[name] = result
+
+        baseline = baselines.get(name)
+        if baseline and "relative_time" in baseline:
+            # The baseline scaled to this machine's speed (and current load).
+            base_us = baseline["relative_time"] * result["calibration_us_per_item"]
+            time_ratio = result["relative_time"] / baseline["relative_time"]
+            alloc_ratio = result["peak_bytes_per_item"] / max(baseline["peak_bytes_per_item"], 1.0)
+            flag = ""
+            if time_ratio > args.time_tolerance or alloc_ratio > args.alloc_tolerance:
+                regressions.append(name)
+                flag = "  <- regression"
+            print(
+                f"{name:<26} {items:>6} {result['us_per_item']:>9.2f} {base_us:>9.2f} {time_ratio:>5.2f}x "
+                f"{result['peak_bytes_per_item']:>9.0f} {baseline['peak_bytes_per_item']:>9.0f} {alloc_ratio:>5.2f}x{flag}"
+            )
+        else:
+            print(
+                f"{name:<26} {items:>6} {result['us_per_item']:>9.2f} {'-':>9} {'-':>6} "
+                f"{result['peak_bytes_per_item']:>9.0f} {'-':>9} {'-':>6}"
+            )
+
+    if args.save_baseline:
+        baselines.update({name: {key: round(value, 4) for key, value in result.items()} for name, result in results.items()})
+        baselines[RUNNER_KEY] = {"python": platform.python_version()}
+        BASELINE_PATH.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Saved baselines -> {BASELINE_PATH}")
+
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
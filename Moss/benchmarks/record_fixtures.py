@@ -0,0 +1,114 @@
+# Refreshes the benchmark fixtures from pages recorded off the real portals, so the parsers are benchmarked
+# on the markup (and __NEXT_DATA__ state) the portals actually serve:
+#   python Moss/portal_replay.py record --archive portal_archive.sqlite3      then crawl through it (PORTAL_BASE_URL)
+#   python Moss/benchmarks/record_fixtures.py --replay-archive portal_archive.sqlite3
+# or from the page archive every scrape keeps:
+#   python Moss/benchmarks/record_fixtures.py --page-archive Moss/Archive/page_archive.sqlite3
+# Per portal the largest search page and the largest detail page are written; the search page also serves as
+# the __NEXT_DATA__ fixture. fixtures/sources.json records where every fixture came from. Re-save the
+# baselines afterwards (bench_suite.py --save-baseline): timings per item change with the pages.
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from page_archive import PageArchive  # noqa: E402
+from portal_replay import PortalArchive  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+SOURCES_PATH = FIXTURES_DIR / "sources.json"
+
+PORTAL_HOSTS = {"www.jobthai.com": "JobThai", "th.jobsdb.com": "JobsDB", "jobbkk.com": "JOBBKK"}
+# (domain, phase) -> fixture files written from that page.
+FIXTURE_FILES = {
+    ("JobThai", "search"): ["jobthai_search.html", "jobthai_search_state.html"],
+    ("JobThai", "detail"): ["jobthai_detail.html", "jobthai_detail_state.html"],
+    ("JobsDB", "search"): ["jobsdb_search.html", "jobsdb_search_state.html"],
+    ("JobsDB", "detail"): ["jobsdb_detail.html"],
+    ("JOBBKK", "search"): ["jobbkk_search.html"],
+    ("JOBBKK", "detail"): ["jobbkk_detail.html"],
+}
+
+
+def url_phase(path: str) -> str:
+    # JobThai/JobsDB postings live under /job/<id>, JOBBKK's under /jobs/detail...; everything else is a search page.
+    return "detail" if "/job/" in path or "/jobs/detail" in path else "search"
+
+
+def replay_pages(path: Path) -> list[dict]:
+    archive = PortalArchive(path)
+    recorded = datetime.fromtimestamp(path.stat().st_mtime).strftime("%Y-%m-%d")
+
+    pages = []
+    for key in archive.keys():
+        # Keys are the local request path: /<host>/<path>?<query>.
+        host, _, rest = key.lstrip("/").partition("/")
+        response = archive.get(key)
+        if host not in PORTAL_HOSTS or response["status"] != 200:
+            continue
+        url = f"https://{host}/{rest}"
+        pages.append({
+            "domain": PORTAL_HOSTS[host],
+            "phase": url_phase(urlparse(url).path),
+            "url": url,
+            "text": response["body"].decode("utf-8", errors="replace"),
+            "recorded": recorded,
+            "source": f"replay archive {path.name}",
+        })
+    archive.close()
+    return pages
+
+
+def archived_pages(path: Path) -> list[dict]:
+    archive = PageArchive(path)
+    pages = [
+        {
+            "domain": page["domain"],
+            "phase": page["phase"],
+            "url": page["url"],
+            "text": archive.text(page["digest"]),
+            "recorded": page["run_id"],
+            "source": f"page archive {path.name}",
+        }
+        for page in archive.pages()
+        if page["domain"] in PORTAL_HOSTS.values()
+    ]
+    archive.close()
+    return pages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--replay-archive", help="archive recorded by portal_replay.py record")
+    source.add_argument("--page-archive", help="page archive of a scrape (Moss/Archive/page_archive.sqlite3)")
+    parser.add_argument("--dry-run", action="store_true", help="only list the pages that would be written")
+    args = parser.parse_args()
+
+    pages = replay_pages(Path(args.replay_archive)) if args.replay_archive else archived_pages(Path(args.page_archive))
+    sources = json.loads(SOURCES_PATH.read_text(encoding="utf-8")) if SOURCES_PATH.exists() else {}
+
+    for (domain, phase), names in FIXTURE_FILES.items():
+        candidates = [page for page in pages if page["domain"] == domain and page["phase"] == phase]
+        if not candidates:
+            print(f"[Fixtures] no {domain} {phase} page in the archive, keeping {', '.join(names)}")
+            continue
+
+        page = max(candidates, key=lambda candidate: len(candidate["text"]))
+        print(f"[Fixtures] {domain} {phase}: {page['url']} ({len(page['text']) / 1024:.0f}KB) -> {', '.join(names)}")
+        if args.dry_run:
+            continue
+        for name in names:
+            (FIXTURES_DIR / name).write_text(page["text"], encoding="utf-8")
+            sources[name] = {"url": page["url"], "recorded": page["recorded"], "source": page["source"]}
+
+    if not args.dry_run:
+        SOURCES_PATH.write_text(json.dumps(sources, indent=2, sort_keys=True, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import math
+import threading
+import time
+from pathlib import Path
+
+# Telemetry records, one JSON object per line:
+#   {"kind": "request", "domain", "phase", "url_hash", "status", "bytes", "latency_ms", "retries", "error"}
+#   {"kind": "parse", "domain", "phase", "url_hash", "parse_ms", "rows_kept"}
+# A search page or detail page yields one of each; url_hash joins them. Detail pages served from
+# the HTTP cache only have a parse record.
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha1((url or "").encode("utf-8")).hexdigest()[:12]
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    # Nearest-rank percentile; enough for run summaries.
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class CrawlTelemetry:
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else None
+        self.records = []
+        self._lock = threading.Lock()
+        self._file = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+
+    def record(self, kind: str, **fields) -> None:
+        record = {"ts": round(time.time(), 3), "kind": kind, **fields}
+        with self._lock:
+            self.records.append(record)
+            if self._file is not None:
+                self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._file.flush()
+
+    def summary(self) -> dict:
+        # {domain: {phase: {...}}} with request latency percentiles, throughput and parse cost.
+        with self._lock:
+            records = list(self.records)
+
+        groups = {}
+        for record in records:
+            group = groups.setdefault(record["domain"], {}).setdefault(record["phase"], {"request": [], "parse": []})
+            group[record["kind"]].append(record)
+
+        summary = {}
+        for domain, phases in groups.items():
+            for phase, group in phases.items():
+                requests_ = group["request"]
+                parses = group["parse"]
+                latencies = [record["latency_ms"] for record in requests_]
+                timestamps = [record["ts"] for record in requests_ + parses]
+                wall_seconds = max(timestamps) - min(timestamps) if len(timestamps) > 1 else 0.0
+                rows_kept = sum(record["rows_kept"] for record in parses)
+
+                summary.setdefault(domain, {})[phase] = {
+                    "requests": len(requests_),
+                    "errors": sum(1 for record in requests_ if record["error"] or (record["status"] or 0) >= 400),
+                    "retries": sum(record["retries"] for record in requests_),
+                    "bytes": sum(record["bytes"] for record in requests_),
+                    "latency_p50_ms": round(percentile(latencies, 0.50), 1),
+                    "latency_p95_ms": round(percentile(latencies, 0.95), 1),
+                    "latency_total_s": round(sum(latencies) / 1000, 2),
+                    "parsed": len(parses),
+                    "parse_total_s": round(sum(record["parse_ms"] for record in parses) / 1000, 2),
+                    "rows_kept": rows_kept,
+                    "wall_s": round(wall_seconds, 2),
+                    "requests_per_s": round(len(requests_) / wall_seconds, 2) if wall_seconds else 0.0,
+                    "rows_per_s": round(rows_kept / wall_seconds, 2) if wall_seconds else 0.0,
+                }
+        return summary
+
+    def report(self) -> str:
+        lines = [
+            f"{'domain':<8} {'phase':<7} {'reqs':>5} {'err':>4} {'retry':>5} {'MB':>6} {'p50 ms':>7} "
+            f"{'p95 ms':>7} {'fetch s':>7} {'parse s':>7} {'rows':>5} {'req/s':>6} {'rows/s':>6}"
+        ]
+        for domain, phases in self.summary().items():
+            for phase, stats in phases.items():
+                lines.append(
+                    f"{domain:<8} {phase:<7} {stats['requests']:>5} {stats['errors']:>4} {stats['retries']:>5} "
+                    f"{stats['bytes'] / 1024 / 1024:>6.1f} {stats['latency_p50_ms']:>7.0f} {stats['latency_p95_ms']:>7.0f} "
+                    f"{stats['latency_total_s']:>7.1f} {stats['parse_total_s']:>7.1f} {stats['rows_kept']:>5} "
+                    f"{stats['requests_per_s']:>6.2f} {stats['rows_per_s']:>6.2f}"
+                )
+        return "\n".join(lines)
+
+    def write_summary(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.summary(), indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
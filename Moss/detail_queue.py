@@ -0,0 +1,40 @@
+import threading
+from concurrent.futures import Future
+
+
+class DetailFetchQueue:
+    # Run-wide memo of detail results keyed by canonical job URL. The first row that asks for a posting fetches
+    # it; every later row with the same key (another keyword, or a concurrent keyword in the async engine) waits
+    # for that fetch and gets a copy of its result, so each posting is fetched and skill-parsed once per run.
+    # Results are kept for the whole run, so callers should store only the output columns, not the page text.
+
+    def __init__(self):
+        self.stats = {"fetched": 0, "reused": 0}
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def has(self, key: str) -> bool:
+        with self._lock:
+            return key in self._futures
+
+    def fetch(self, key: str, fetch_detail) -> dict:
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._futures[key] = future
+                self.stats["fetched"] += 1
+            else:
+                self.stats["reused"] += 1
+
+        if owner:
+            try:
+                future.set_result(fetch_detail())
+            except BaseException as exc:
+                future.set_exception(exc)
+                raise
+        return dict(future.result())
+
+    def summary(self) -> str:
+        return f"{self.stats['fetched']} postings fetched, {self.stats['reused']} duplicate detail fetches saved"
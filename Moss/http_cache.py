@@ -0,0 +1,161 @@
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+
+class HttpCache:
+    # On-disk page cache keyed by normalized job URL. Bodies are zlib-compressed in SQLite;
+    # entries younger than ttl_seconds are served without a request, older ones are revalidated
+    # with If-None-Match / If-Modified-Since. Least recently used entries are evicted past max_bytes.
+
+    def __init__(self, cache_dir: str | Path, ttl_seconds: float = 24 * 3600, max_bytes: int = 200 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.stats = {"fresh_hits": 0, "revalidated": 0, "misses": 0, "stored": 0, "evicted": 0, "bytes_saved": 0}
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.cache_dir / "http_cache.sqlite3", check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT NOT NULL DEFAULT '',
+                last_modified TEXT NOT NULL DEFAULT '',
+                body BLOB NOT NULL,
+                raw_size INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+        self._conn.commit()
+        self.total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, etag, last_modified, body, raw_size, fetched_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+        url, etag, last_modified, body, raw_size, fetched_at = row
+        return {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "text": zlib.decompress(body).decode("utf-8"),
+            "raw_size": raw_size,
+            "fetched_at": fetched_at,
+        }
+
+    def is_fresh(self, entry: dict | None) -> bool:
+        return entry is not None and (time.time() - entry["fetched_at"]) < self.ttl_seconds
+
+    def conditional_headers(self, entry: dict | None) -> dict:
+        if entry is None:
+            return {}
+        extra = {}
+        if entry["etag"]:
+            extra["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            extra["If-Modified-Since"] = entry["last_modified"]
+        return extra
+
+    def mark_revalidated(self, key: str) -> None:
+        with self._lock:
+            now = time.time()
+            self._conn.execute("UPDATE entries SET fetched_at = ?, last_access = ? WHERE key = ?", (now, now, key))
+            self._conn.commit()
+
+    def store(self, key: str, url: str, text: str, etag: str = "", last_modified: str = "") -> None:
+        raw = text.encode("utf-8")
+        body = zlib.compress(raw, 6)
+        now = time.time()
+
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO entries (key, url, etag, last_modified, body, raw_size, size, fetched_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, url, etag or "", last_modified or "", body, len(raw), len(body), now, now),
+            )
+            self.total_bytes += len(body) - (previous[0] if previous else 0)
+            self.stats["stored"] += 1
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        while self.total_bytes > self.max_bytes:
+            victims = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access ASC LIMIT 64"
+            ).fetchall()
+            if not victims:
+                self.total_bytes = 0
+                return
+            for key, size in victims:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.total_bytes -= size
+                self.stats["evicted"] += 1
+                if self.total_bytes <= self.max_bytes:
+                    return
+
+    def _bump(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[name] += amount
+
+    def get_text(self, key: str, url: str, send) -> str:
+        # send(extra_headers) performs the real request and returns a requests.Response.
+        entry = self.get(key)
+        if self.is_fresh(entry):
+            self._bump("fresh_hits")
+            self._bump("bytes_saved", entry["raw_size"])
+            return entry["text"]
+
+        response = send(self.conditional_headers(entry))
+        if response.status_code == 304 and entry is not None:
+            self.mark_revalidated(key)
+            self._bump("revalidated")
+            self._bump("bytes_saved", entry["raw_size"])
+            return entry["text"]
+
+        if response.status_code == 304:
+            # Not Modified with nothing cached to serve (e.g. a proxy or session answered the request
+            # conditionally): ask again without validators rather than caching an empty body.
+            response = send({"Cache-Control": "no-cache"})
+            if response.status_code == 304:
+                raise RuntimeError(f"304 Not Modified without a cached copy: {url}")
+
+        response.raise_for_status()
+        self._bump("misses")
+        self.store(
+            key,
+            url,
+            response.text,
+            etag=response.headers.get("ETag", ""),
+            last_modified=response.headers.get("Last-Modified", ""),
+        )
+        return response.text
+
+    def summary(self) -> str:
+        return (
+            f"fresh_hits={self.stats['fresh_hits']} revalidated={self.stats['revalidated']} "
+            f"misses={self.stats['misses']} evicted={self.stats['evicted']} "
+            f"saved={self.stats['bytes_saved'] / 1024 / 1024:.1f}MB size={self.total_bytes / 1024 / 1024:.1f}MB"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
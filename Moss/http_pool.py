@@ -0,0 +1,93 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_PORTAL_SETTINGS = {"pool_size": 4, "hosts": 4, "retries": 3, "backoff_factor": 1.0}
+
+
+class PortalSessionPool:
+    # One keep-alive connection pool (HTTPAdapter) per portal, shared by every thread and session of that portal,
+    # so a crawl pays one TCP+TLS handshake per connection instead of one per page.
+    #   - pool_size caps the open connections per host; threads wait for a free one (pool_block) rather than
+    #     opening throwaway connections,
+    #   - only connections that could not be opened are retried inside the pool, with exponential backoff
+    #     (retries, backoff_factor); no request was sent yet, so this is safe. Read failures and 429/5xx go back
+    #     to the caller (read=0, status=0), whose retry loop is paced by the rate controller,
+    #   - requests.Session is not thread-safe, so each thread gets its own Session mounted on the shared adapter.
+    # Do not close these sessions: Session.close() closes the adapter, and with it the pool of every thread.
+
+    def __init__(self, portal_settings: dict[str, dict] | None = None):
+        self.portal_settings = portal_settings or {}
+        self._adapters = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def settings(self, domain: str) -> dict:
+        return {**DEFAULT_PORTAL_SETTINGS, **self.portal_settings.get(domain, {})}
+
+    def adapter(self, domain: str) -> HTTPAdapter:
+        with self._lock:
+            if domain not in self._adapters:
+                settings = self.settings(domain)
+                retry = Retry(
+                    total=settings["retries"],
+                    connect=settings["retries"],
+                    read=0,
+                    other=0,
+                    status=0,
+                    backoff_factor=settings["backoff_factor"],
+                    allowed_methods=frozenset(["GET", "HEAD"]),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                )
+                self._adapters[domain] = HTTPAdapter(
+                    pool_connections=settings["hosts"],
+                    pool_maxsize=settings["pool_size"],
+                    pool_block=True,
+                    max_retries=retry,
+                )
+            return self._adapters[domain]
+
+    def new_session(self, domain: str) -> requests.Session:
+        # A fresh session (own cookies) on the portal's shared pool.
+        session = requests.Session()
+        adapter = self.adapter(domain)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def session(self, domain: str) -> requests.Session:
+        # The calling thread's session for the portal.
+        sessions = self._local.__dict__.setdefault("sessions", {})
+        if domain not in sessions:
+            sessions[domain] = self.new_session(domain)
+        return sessions[domain]
+
+    def stats(self) -> dict[str, dict]:
+        # Per portal: requests sent on pooled connections and how many connections had to be opened for them.
+        with self._lock:
+            adapters = dict(self._adapters)
+
+        stats = {}
+        for domain, adapter in adapters.items():
+            managers = [adapter.poolmanager, *adapter.proxy_manager.values()]
+            pools = [manager.pools[key] for manager in managers for key in manager.pools.keys()]
+            requests_sent = sum(pool.num_requests for pool in pools)
+            connections = sum(pool.num_connections for pool in pools)
+            stats[domain] = {
+                "requests": requests_sent,
+                "new_connections": connections,
+                "reused": max(0, requests_sent - connections),
+            }
+        return stats
+
+    def summary(self) -> str:
+        return " | ".join(
+            f"{domain}: {counts['requests']} requests, {counts['new_connections']} new connections, "
+            f"{counts['reused']} reused ({counts['reused'] / counts['requests']:.0%})"
+            if counts["requests"]
+            else f"{domain}: no requests"
+            for domain, counts in self.stats().items()
+        )
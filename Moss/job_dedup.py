@@ -0,0 +1,257 @@
+import argparse
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from job_history import canonical_job_url
+
+# Cross-portal near-duplicate detection. The same posting listed on JobThai, JobsDB and JOBBKK (or re-posted
+# under a new URL) gets one canonical_job_id:
+#   1. each row becomes a document of its normalized title, company (legal form stripped), matched skills and,
+#      when the frame still has it, the detail text,
+#   2. MinHash signatures over the character 4-grams of the document estimate Jaccard similarity,
+#   3. LSH banding buckets rows that agree on a whole band, so only rows in the same bucket are compared,
+#   4. pairs with estimated similarity >= threshold are merged into clusters, but only when they also name the
+#      same company (legal form stripped), have nearly the same title on its own (word Jaccard >=
+#      TITLE_SIMILARITY_THRESHOLD, urgency/hiring words ignored), do not conflict on province and were posted
+#      within POSTED_DATE_WINDOW_DAYS of each other. Rows reach the dedup step without their detail text, so the
+#      document is mostly the long matched-skills string; without the title gate every data opening of one
+#      employer would look alike.
+# Everything runs on numpy arrays in row chunks, so a few hundred thousand historical rows take seconds.
+#   python Moss/job_dedup.py Moss/Scraped_All/jobs_all_scraped_*.csv -o deduped.csv
+
+SIGNATURE_SIZE = 64
+BANDS = 16
+SHINGLE_SIZE = 4
+SIMILARITY_THRESHOLD = 0.8
+CHUNK_ROWS = 50_000
+SEED = 20240229
+POSTED_DATE_WINDOW_DAYS = 14
+TITLE_SIMILARITY_THRESHOLD = 0.8
+
+COMPANY_FORM_PATTERN = (
+    r"บริษัท|บจก\.?|บมจ\.?|จำกัด|มหาชน|ห้างหุ้นส่วน"
+    r"|\b(?:co|ltd|company|limited|public|plc|inc|corp|corporation|thailand)\b\.?"
+)
+# Words portals add to the same title ("Data Analyst (ด่วน)" on JOBBKK is JobThai's "Data Analyst").
+TITLE_NOISE_PATTERN = r"ด่วนมาก|ด่วน|รับสมัคร|หลายอัตรา|\d+\s*อัตรา|\b(?:urgent(?:ly)?|hiring|wanted)\b"
+DOCUMENT_COLUMNS = ["job_title", "company", "matched_skills", "job_detail_text"]
+
+
+def normalize_job_text(values: pd.Series) -> pd.Series:
+    text = values.fillna("").astype(str).str.lower()
+    text = text.str.replace("[^0-9a-z\u0e00-\u0e7f]+", " ", regex=True)
+    return text.str.split().str.join(" ")
+
+
+def normalize_company(values: pd.Series) -> pd.Series:
+    return normalize_job_text(values.fillna("").astype(str).str.lower().str.replace(COMPANY_FORM_PATTERN, " ", regex=True))
+
+
+def title_words(values: pd.Series) -> list[frozenset]:
+    titles = values.fillna("").astype(str).str.lower().str.replace(TITLE_NOISE_PATTERN, " ", regex=True)
+    return [frozenset(title.split()) for title in normalize_job_text(titles)]
+
+
+def title_similarity(words: list[frozenset], lefts: np.ndarray, rights: np.ndarray) -> np.ndarray:
+    # Word Jaccard of each pair's titles; only called for the pairs that passed the cheaper guards.
+    similarity = np.zeros(len(lefts), dtype=np.float32)
+    for index, (left, right) in enumerate(zip(lefts.tolist(), rights.tolist())):
+        union = len(words[left] | words[right])
+        if union:
+            similarity[index] = len(words[left] & words[right]) / union
+    return similarity
+
+
+def job_documents(df: pd.DataFrame) -> pd.Series:
+    parts = []
+    for column in DOCUMENT_COLUMNS:
+        if column not in df.columns:
+            continue
+        parts.append(normalize_company(df[column]) if column == "company" else normalize_job_text(df[column]))
+
+    if not parts:
+        return pd.Series("", index=df.index)
+    return parts[0].str.cat(parts[1:], sep=" | ")
+
+
+def permutation_parameters(size: int = SIGNATURE_SIZE, seed: int = SEED) -> tuple[np.ndarray, np.ndarray]:
+    # Multiply-shift hashing: ((a * x + b) mod 2^64) >> 32 with odd a; a fixed seed keeps ids stable between runs.
+    generator = np.random.default_rng(seed)
+    multipliers = generator.integers(1, 2**63, size=size, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    offsets = generator.integers(0, 2**63, size=size, dtype=np.uint64)
+    return multipliers, offsets
+
+
+def shingle_hashes(documents: list[str], size: int = SHINGLE_SIZE) -> tuple[np.ndarray, np.ndarray]:
+    # (document index, 64-bit hash) of every character n-gram, computed over all documents at once.
+    padded = [document.ljust(size) for document in documents]
+    lengths = np.fromiter((len(document) for document in padded), dtype=np.int64, count=len(padded))
+    ends = np.cumsum(lengths)
+    codes = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+    count = len(codes) - size + 1
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        hashes = hashes * np.uint64(1_000_003) + codes[offset:offset + count]
+
+    owners = np.repeat(np.arange(len(padded)), lengths)[:count]
+    inside = np.arange(count) + size <= ends[owners]
+    return owners[inside], hashes[inside]
+
+
+def minhash_signatures(documents: list[str], size: int = SIGNATURE_SIZE, chunk_rows: int = CHUNK_ROWS) -> np.ndarray:
+    multipliers, offsets = permutation_parameters(size)
+    signatures = np.empty((len(documents), size), dtype=np.uint32)
+
+    for start in range(0, len(documents), chunk_rows):
+        chunk = documents[start:start + chunk_rows]
+        owners, hashes = shingle_hashes(chunk)
+        # owners is sorted and every (padded) document has at least one shingle.
+        segment_starts = np.searchsorted(owners, np.arange(len(chunk)))
+        for column in range(size):
+            permuted = (hashes * multipliers[column] + offsets[column]) >> np.uint64(32)
+            signatures[start:start + len(chunk), column] = np.minimum.reduceat(permuted, segment_starts)
+    return signatures
+
+
+def candidate_pairs(signatures: np.ndarray, bands: int = BANDS) -> tuple[np.ndarray, np.ndarray]:
+    # Rows sharing a band bucket are paired with the bucket's first row, which keeps the pair count linear
+    # even when hundreds of reposts land in one bucket.
+    rows_per_band = signatures.shape[1] // bands
+    lefts = []
+    rights = []
+    for band in range(bands):
+        block = signatures[:, band * rows_per_band:(band + 1) * rows_per_band].astype(np.uint64)
+        keys = np.zeros(len(block), dtype=np.uint64)
+        for column in range(rows_per_band):
+            keys = keys * np.uint64(0x9E3779B97F4A7C15) + block[:, column]
+
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        bucket_start = np.ones(len(order), dtype=bool)
+        bucket_start[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        leaders = order[np.maximum.accumulate(np.where(bucket_start, np.arange(len(order)), 0))]
+
+        paired = leaders != order
+        lefts.append(leaders[paired])
+        rights.append(order[paired])
+
+    if not lefts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    codes = np.sort(np.concatenate(lefts).astype(np.int64) * len(signatures) + np.concatenate(rights))
+    codes = codes[np.r_[True, codes[1:] != codes[:-1]]]
+    return codes // len(signatures), codes % len(signatures)
+
+
+def estimated_similarity(signatures: np.ndarray, lefts: np.ndarray, rights: np.ndarray, chunk_rows: int = CHUNK_ROWS) -> np.ndarray:
+    similarity = np.empty(len(lefts), dtype=np.float32)
+    for start in range(0, len(lefts), chunk_rows):
+        stop = start + chunk_rows
+        similarity[start:stop] = (signatures[lefts[start:stop]] == signatures[rights[start:stop]]).mean(axis=1)
+    return similarity
+
+
+def connected_labels(size: int, lefts: np.ndarray, rights: np.ndarray) -> np.ndarray:
+    # Min-label propagation with pointer jumping; labels[i] is the smallest row index in i's cluster.
+    labels = np.arange(size)
+    while True:
+        lowest = np.minimum(labels[lefts], labels[rights])
+        updated = labels.copy()
+        np.minimum.at(updated, lefts, lowest)
+        np.minimum.at(updated, rights, lowest)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def cluster_near_duplicates(df: pd.DataFrame, threshold: float = SIMILARITY_THRESHOLD) -> np.ndarray:
+    # Cluster label per row (position-based); rows without near duplicates keep their own position.
+    documents = job_documents(df)
+    if documents.empty:
+        return np.empty(0, dtype=np.int64)
+
+    signatures = minhash_signatures(documents.tolist())
+    lefts, rights = candidate_pairs(signatures)
+    keep = estimated_similarity(signatures, lefts, rights) >= threshold
+
+    # Rows without any text would all look identical.
+    blank = (documents.str.replace("|", "", regex=False).str.strip() == "").to_numpy()
+    keep &= ~blank[lefts] & ~blank[rights]
+
+    if "province_name" in df.columns:
+        # Same title and company in different provinces are separate openings.
+        provinces = df["province_name"].fillna("").astype(str).str.strip().to_numpy()
+        left_province = provinces[lefts]
+        right_province = provinces[rights]
+        keep &= (left_province == right_province) | (left_province == "") | (right_province == "")
+
+    if "company" in df.columns:
+        # Different employers never share a posting, however alike the titles and skills are.
+        companies = normalize_company(df["company"]).to_numpy()
+        keep &= companies[lefts] == companies[rights]
+
+    if "posted_date" in df.columns:
+        # A posting listed on several portals (or re-posted) is dated within a few days; undated rows never merge.
+        posted = pd.to_datetime(df["posted_date"], format="%m/%d/%Y", errors="coerce").to_numpy()
+        gap = np.abs(posted[lefts] - posted[rights])
+        keep &= ~np.isnat(gap) & (gap <= np.timedelta64(POSTED_DATE_WINDOW_DAYS, "D"))
+
+    if "job_title" in df.columns:
+        # The skills string outweighs the title in the document; "Data Engineer" and "Senior Data Engineer" at one
+        # employer are separate openings even when their skills match.
+        candidates = np.flatnonzero(keep)
+        words = title_words(df["job_title"])
+        keep[candidates] = title_similarity(words, lefts[candidates], rights[candidates]) >= TITLE_SIMILARITY_THRESHOLD
+
+    return connected_labels(len(documents), lefts[keep], rights[keep])
+
+
+def assign_canonical_job_ids(df: pd.DataFrame, threshold: float = SIMILARITY_THRESHOLD) -> pd.DataFrame:
+    # canonical_job_id is derived from the smallest canonical URL in the cluster, so it stays the same
+    # between runs as long as that posting is still in the cluster.
+    result = df.copy()
+    if result.empty:
+        result["canonical_job_id"] = pd.Series(dtype=str)
+        return result
+
+    labels = cluster_near_duplicates(result, threshold)
+    if "job_url" in result.columns:
+        keys = result["job_url"].fillna("").astype(str).map(canonical_job_url)
+    else:
+        keys = pd.Series("", index=result.index)
+    if (keys == "").any():
+        keys = keys.where(keys != "", job_documents(result))
+
+    clusters = pd.DataFrame({"label": labels, "key": keys.to_numpy()})
+    first_keys = clusters.sort_values("key").drop_duplicates("label").set_index("label")["key"]
+    cluster_ids = first_keys.map(lambda key: hashlib.sha1(key.encode("utf-8")).hexdigest()[:16])
+    result["canonical_job_id"] = cluster_ids.reindex(labels).to_numpy()
+    return result
+
+
+def dedup_summary(df: pd.DataFrame) -> str:
+    postings = df["canonical_job_id"].nunique()
+    cross_portal = (df.groupby("canonical_job_id")["domain"].nunique() > 1).sum() if "domain" in df.columns else 0
+    return f"{len(df)} rows -> {postings} distinct postings ({len(df) - postings} near duplicates, {cross_portal} listed on several portals)"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="+", help="snapshot CSVs, concatenated before clustering")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD)
+    args = parser.parse_args()
+
+    df = pd.concat([pd.read_csv(name, dtype=str, keep_default_na=False) for name in args.files], ignore_index=True)
+    df = assign_canonical_job_ids(df, args.threshold)
+    df.to_csv(args.output, index=False, encoding="utf-8-sig")
+    print(f"[Dedup] {dedup_summary(df)}")
+    print(f"[Dedup] wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
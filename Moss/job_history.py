@@ -0,0 +1,211 @@
+import argparse
+import csv
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlparse, urlunparse
+
+import pandas as pd
+
+HISTORY_FILE = "job_history.jsonl"
+RUNS_FILE = "job_history_runs.csv"
+RUNS_COLUMNS = ["run_id", "run_at", "rows", "added", "removed", "changed"]
+
+
+def canonical_job_url(job_url: str) -> str:
+    # Query strings and fragments only carry search/tracking state; scheme, host and path identify a posting.
+    if not job_url:
+        return ""
+
+    parsed = urlparse(str(job_url))
+    path = parsed.path.replace("/th/company/job/", "/th/job/").replace("/company/job/", "/job/")
+    return urlunparse((parsed.scheme, parsed.netloc, path, "", "", ""))
+
+
+def normalize_snapshot_values(df: pd.DataFrame) -> pd.DataFrame:
+    # Compare and store values as the text the CSV snapshot would contain.
+    return df.astype(object).where(df.notna(), "").astype(str)
+
+
+class JobHistoryStore:
+    # Append-only history of Scraped_All snapshots keyed by job URL.
+    # job_history.jsonl holds two kinds of lines:
+    #   {"run": id, "key": url, "set": {...}}   field values that changed for one job in that run
+    #   {"run": id, "columns": [...], "added": [...], "removed": [...]}   run record, written last
+    # A run only counts once its run record is on disk, so an interrupted write is ignored on replay.
+    # Storage grows with new postings and changed values, not with runs x jobs.
+
+    def __init__(self, history_dir: str | Path):
+        self.history_dir = Path(history_dir)
+        self.history_path = self.history_dir / HISTORY_FILE
+        self.runs_path = self.history_dir / RUNS_FILE
+        self._replay()
+
+    def _replay(self, until_run_id: str | None = None) -> None:
+        self.runs = []
+        self.members = []
+        self.values = {}
+        self.first_seen = {}
+        self.last_seen = {}
+        self.columns = []
+
+        if not self.history_path.exists():
+            return
+
+        pending = []
+        member_set = set()
+        with self.history_path.open("r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if "key" in record:
+                    pending.append(record)
+                    continue
+
+                run_id = record["run"]
+                for change in pending:
+                    if change["run"] == run_id:
+                        self.values.setdefault(change["key"], {}).update(change["set"])
+                pending = []
+
+                removed = set(record.get("removed", []))
+                self.members = [key for key in self.members if key not in removed]
+                member_set -= removed
+                for key in record.get("added", []):
+                    if key not in member_set:
+                        self.members.append(key)
+                        member_set.add(key)
+                    self.first_seen.setdefault(key, run_id)
+                for key in self.members:
+                    self.last_seen[key] = run_id
+
+                self.columns = record.get("columns", self.columns)
+                self.runs.append(run_id)
+                if until_run_id is not None and run_id == until_run_id:
+                    return
+
+        if until_run_id is not None and until_run_id not in self.runs:
+            raise KeyError(f"Unknown run_id: {until_run_id}")
+
+    def record_run(self, run_id: str, df: pd.DataFrame, run_at: datetime | None = None) -> dict:
+        if run_id in self.runs:
+            raise ValueError(f"run_id already recorded: {run_id}")
+
+        rows = normalize_snapshot_values(df)
+        columns = list(rows.columns)
+        rows["__key"] = rows["job_url"].map(canonical_job_url) if "job_url" in rows.columns else ""
+        rows = rows[rows["__key"] != ""].drop_duplicates(subset=["__key"], keep="first")
+
+        lines = []
+        run_keys = []
+        changed_count = 0
+        for record in rows.to_dict(orient="records"):
+            key = record.pop("__key")
+            run_keys.append(key)
+            previous = self.values.get(key, {})
+            changed = {column: value for column, value in record.items() if previous.get(column) != value}
+            if changed:
+                lines.append({"run": run_id, "key": key, "set": changed})
+                changed_count += int(bool(previous))
+
+        member_set = set(self.members)
+        run_key_set = set(run_keys)
+        added = [key for key in run_keys if key not in member_set]
+        removed = [key for key in self.members if key not in run_key_set]
+        lines.append({"run": run_id, "columns": columns, "added": added, "removed": removed})
+
+        self.history_dir.mkdir(parents=True, exist_ok=True)
+        with self.history_path.open("a", encoding="utf-8") as file:
+            file.write("".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines))
+
+        summary = {
+            "run_id": run_id,
+            "run_at": (run_at or datetime.now()).isoformat(timespec="seconds"),
+            "rows": len(run_keys),
+            "added": len(added),
+            "removed": len(removed),
+            "changed": changed_count,
+        }
+        write_header = not self.runs_path.exists() or self.runs_path.stat().st_size == 0
+        with self.runs_path.open("a", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=RUNS_COLUMNS)
+            if write_header:
+                writer.writeheader()
+            writer.writerow(summary)
+
+        self._replay()
+        return summary
+
+    def snapshot(self, run_id: str | None = None) -> pd.DataFrame:
+        # Rows present in the given run (default: latest) with their values as of that run.
+        if run_id is not None:
+            self._replay(until_run_id=run_id)
+        try:
+            rows = [self.values.get(key, {}) for key in self.members]
+            return pd.DataFrame(rows, columns=self.columns)
+        finally:
+            if run_id is not None:
+                self._replay()
+
+    def job_index(self) -> pd.DataFrame:
+        # Every job ever seen with its latest values, first_seen/last_seen run and whether it is listed in the latest run.
+        latest_members = set(self.members)
+        rows = []
+        for key, values in self.values.items():
+            rows.append({
+                **values,
+                "first_seen": self.first_seen.get(key, ""),
+                "last_seen": self.last_seen.get(key, ""),
+                "in_latest_run": key in latest_members,
+            })
+        return pd.DataFrame(rows)
+
+
+def run_id_from_snapshot_name(path: Path) -> str:
+    match = re.search(r"(\d{8}_\d{6})", path.stem)
+    return match.group(1) if match else ""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dir", default=str(Path(__file__).resolve().parent / "Scraped_All"))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="record timestamped snapshot CSVs as runs, oldest first")
+    import_parser.add_argument("files", nargs="+")
+
+    snapshot_parser = subparsers.add_parser("snapshot", help="rebuild the snapshot of one run as CSV")
+    snapshot_parser.add_argument("run_id")
+    snapshot_parser.add_argument("-o", "--output", required=True)
+
+    subparsers.add_parser("runs", help="list recorded runs")
+    args = parser.parse_args()
+
+    store = JobHistoryStore(args.dir)
+
+    if args.command == "import":
+        for file in sorted(Path(name) for name in args.files):
+            run_id = run_id_from_snapshot_name(file)
+            if not run_id or run_id in store.runs:
+                print(f"Skipping {file.name}")
+                continue
+            df = pd.read_csv(file, dtype=str, keep_default_na=False)
+            run_at = datetime.strptime(run_id, "%Y%m%d_%H%M%S")
+            print(store.record_run(run_id, df, run_at=run_at))
+    elif args.command == "snapshot":
+        store.snapshot(args.run_id).to_csv(args.output, index=False, encoding="utf-8-sig")
+        print(f"Wrote run {args.run_id} -> {args.output}")
+    elif args.command == "runs":
+        for run_id in store.runs:
+            print(run_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+import argparse
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Permanent, content-addressed archive of every page the crawler fetched, so any snapshot can be re-parsed
+# (reparse_archive.py) after a selector fix or a new field without touching the network.
+#   blobs:        page bodies keyed by sha256; a page that did not change between runs is stored once
+#   pages:        which URL was fetched in which run (portal, phase, keyword, page number) -> blob digest
+#   dictionaries: one compression dictionary per portal, trained on its first train_samples pages
+# Pages from one portal share most of their markup, so a trained dictionary compresses them far better
+# than compressing each page on its own. zstd dictionaries are used when the zstandard package is
+# installed; otherwise zlib with a preset dictionary built from the markup lines most pages share.
+
+TRAIN_SAMPLES = 64
+ZSTD_DICT_BYTES = 112 * 1024
+ZLIB_DICT_BYTES = 32 * 1024
+ZSTD_LEVEL = 10
+
+
+def train_zlib_dictionary(samples: list[bytes], size: int = ZLIB_DICT_BYTES) -> bytes:
+    # Lines found in at least half of the samples, most common last (zlib matches the end of the dictionary
+    # at the shortest distance).
+    document_counts = Counter()
+    for sample in samples:
+        document_counts.update(set(sample.splitlines(keepends=True)))
+
+    common = [line for line, count in document_counts.items() if count * 2 >= len(samples) and len(line) > 8]
+    common.sort(key=lambda line: (document_counts[line], len(line)))
+
+    dictionary = b""
+    for line in reversed(common):
+        if len(dictionary) + len(line) > size:
+            continue
+        dictionary = line + dictionary
+    return dictionary
+
+
+class PageArchive:
+    def __init__(self, path: str | Path, train_samples: int = TRAIN_SAMPLES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.train_samples = train_samples
+        self.codec = "zstd" if zstandard is not None else "zlib"
+        self.stats = {"pages": 0, "blobs": 0, "raw_bytes": 0, "stored_bytes": 0}
+
+        self._lock = threading.Lock()
+        self._dictionaries = {}
+        self._untrainable = set()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                dict_id INTEGER NOT NULL DEFAULT 0,
+                domain TEXT NOT NULL DEFAULT '',
+                raw_size INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                body BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                run_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                domain TEXT NOT NULL DEFAULT '',
+                phase TEXT NOT NULL DEFAULT '',
+                keyword TEXT NOT NULL DEFAULT '',
+                page INTEGER NOT NULL DEFAULT 0,
+                digest TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (run_id, url)
+            );
+            CREATE TABLE IF NOT EXISTS dictionaries (
+                dict_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                domain TEXT NOT NULL,
+                codec TEXT NOT NULL,
+                data BLOB NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_pages_url ON pages(url);
+            """
+        )
+        self._conn.commit()
+
+    def _dictionary(self, dict_id: int) -> tuple[str, bytes]:
+        if dict_id not in self._dictionaries:
+            codec, data = self._conn.execute(
+                "SELECT codec, data FROM dictionaries WHERE dict_id = ?", (dict_id,)
+            ).fetchone()
+            self._dictionaries[dict_id] = (codec, data)
+        return self._dictionaries[dict_id]
+
+    def _domain_dictionary_locked(self, domain: str) -> int:
+        # Returns the domain's dictionary id, training one once enough undictionaried pages are stored.
+        row = self._conn.execute(
+            "SELECT dict_id FROM dictionaries WHERE domain = ? AND codec = ? ORDER BY dict_id DESC LIMIT 1",
+            (domain, self.codec),
+        ).fetchone()
+        if row is not None:
+            return row[0]
+
+        samples = self._conn.execute(
+            "SELECT digest FROM blobs WHERE domain = ? AND dict_id = 0 ORDER BY rowid DESC LIMIT ?",
+            (domain, self.train_samples),
+        ).fetchall()
+        if len(samples) < self.train_samples or domain in self._untrainable:
+            return 0
+
+        sample_bodies = [self._read_locked(digest) for (digest,) in samples]
+        try:
+            if self.codec == "zstd":
+                data = zstandard.train_dictionary(ZSTD_DICT_BYTES, sample_bodies).as_bytes()
+            else:
+                data = train_zlib_dictionary(sample_bodies)
+        except Exception as e:
+            # zstd training fails on too little or too uniform sample data; store the pages without a
+            # dictionary for the rest of this run instead of failing the store.
+            data = b""
+            print(f"[Archive] could not train a {self.codec} dictionary for {domain or 'other'} pages: {e}")
+        if not data:
+            self._untrainable.add(domain)
+            return 0
+        cursor = self._conn.execute(
+            "INSERT INTO dictionaries (domain, codec, data, created_at) VALUES (?, ?, ?, ?)",
+            (domain, self.codec, data, time.time()),
+        )
+        print(f"[Archive] trained a {len(data) // 1024} KB {self.codec} dictionary for {domain or 'other'} pages")
+        return cursor.lastrowid
+
+    def _compress(self, raw: bytes, dict_id: int) -> bytes:
+        if self.codec == "zstd":
+            dict_data = zstandard.ZstdCompressionDict(self._dictionary(dict_id)[1]) if dict_id else None
+            return zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dict_data).compress(raw)
+        compressor = zlib.compressobj(9, zdict=self._dictionary(dict_id)[1]) if dict_id else zlib.compressobj(9)
+        return compressor.compress(raw) + compressor.flush()
+
+    def _decompress(self, codec: str, dict_id: int, body: bytes) -> bytes:
+        dict_data = self._dictionary(dict_id)[1] if dict_id else None
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("This archive was written with zstd; install the zstandard package to read it")
+            dictionary = zstandard.ZstdCompressionDict(dict_data) if dict_data else None
+            return zstandard.ZstdDecompressor(dict_data=dictionary).decompress(body)
+        decompressor = zlib.decompressobj(zdict=dict_data) if dict_data else zlib.decompressobj()
+        return decompressor.decompress(body) + decompressor.flush()
+
+    def _read_locked(self, digest: str) -> bytes:
+        codec, dict_id, body = self._conn.execute(
+            "SELECT codec, dict_id, body FROM blobs WHERE digest = ?", (digest,)
+        ).fetchone()
+        return self._decompress(codec, dict_id, body)
+
+    def store(self, run_id: str, url: str, text: str, domain: str = "", phase: str = "", keyword: str = "", page: int = 0) -> str:
+        raw = text.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+
+        with self._lock:
+            known = self._conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            if known is None:
+                dict_id = self._domain_dictionary_locked(domain)
+                body = self._compress(raw, dict_id)
+                self._conn.execute(
+                    "INSERT INTO blobs (digest, codec, dict_id, domain, raw_size, size, body) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (digest, self.codec, dict_id, domain, len(raw), len(body), body),
+                )
+                self.stats["blobs"] += 1
+                self.stats["raw_bytes"] += len(raw)
+                self.stats["stored_bytes"] += len(body)
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (run_id, url, domain, phase, keyword, page, digest, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, url, domain, phase, keyword, page, digest, time.time()),
+            )
+            self._conn.commit()
+            self.stats["pages"] += 1
+        return digest
+
+    def text(self, digest: str) -> str:
+        with self._lock:
+            return self._read_locked(digest).decode("utf-8")
+
+    def latest_text(self, url: str, run_id: str | None = None) -> str | None:
+        # The newest archived copy of url, fetched in run_id or earlier.
+        query = "SELECT digest FROM pages WHERE url = ?"
+        params = [url]
+        if run_id is not None:
+            query += " AND run_id <= ?"
+            params.append(run_id)
+        query += " ORDER BY run_id DESC, fetched_at DESC LIMIT 1"
+
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+            return self._read_locked(row[0]).decode("utf-8") if row is not None else None
+
+    def pages(self, run_id: str | None = None, phase: str | None = None) -> list[dict]:
+        query = "SELECT run_id, url, domain, phase, keyword, page, digest FROM pages WHERE 1 = 1"
+        params = []
+        if run_id is not None:
+            query += " AND run_id = ?"
+            params.append(run_id)
+        if phase is not None:
+            query += " AND phase = ?"
+            params.append(phase)
+        query += " ORDER BY run_id, domain, keyword, page, fetched_at"
+
+        columns = ["run_id", "url", "domain", "phase", "keyword", "page", "digest"]
+        with self._lock:
+            return [dict(zip(columns, row)) for row in self._conn.execute(query, params).fetchall()]
+
+    def runs(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT run_id FROM pages ORDER BY run_id")]
+
+    def size_summary(self) -> dict:
+        with self._lock:
+            blobs, raw_size, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(size), 0) FROM blobs"
+            ).fetchone()
+            pages = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        return {"pages": pages, "blobs": blobs, "raw_bytes": raw_size, "stored_bytes": size}
+
+    def summary(self) -> str:
+        ratio = self.stats["raw_bytes"] / self.stats["stored_bytes"] if self.stats["stored_bytes"] else 0.0
+        return (
+            f"pages={self.stats['pages']} new_blobs={self.stats['blobs']} "
+            f"raw={self.stats['raw_bytes'] / 1024 / 1024:.1f}MB stored={self.stats['stored_bytes'] / 1024 / 1024:.1f}MB "
+            f"ratio={ratio:.1f}x codec={self.codec}"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--archive", default=str(Path(__file__).resolve().parent / "Archive" / "page_archive.sqlite3"))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("runs", help="list archived runs with their page counts")
+    subparsers.add_parser("stats", help="archive size and compression ratio")
+    show_parser = subparsers.add_parser("show", help="print the newest archived copy of a URL")
+    show_parser.add_argument("url")
+    args = parser.parse_args()
+
+    archive = PageArchive(args.archive)
+    if args.command == "runs":
+        counts = Counter(page["run_id"] for page in archive.pages())
+        for run_id in archive.runs():
+            print(f"{run_id}  {counts[run_id]} pages")
+    elif args.command == "stats":
+        sizes = archive.size_summary()
+        ratio = sizes["raw_bytes"] / sizes["stored_bytes"] if sizes["stored_bytes"] else 0.0
+        print(
+            f"{sizes['pages']} pages, {sizes['blobs']} distinct bodies, "
+            f"{sizes['raw_bytes'] / 1024 / 1024:.1f}MB -> {sizes['stored_bytes'] / 1024 / 1024:.1f}MB ({ratio:.1f}x)"
+        )
+    elif args.command == "show":
+        text = archive.latest_text(args.url)
+        if text is None:
+            raise SystemExit(f"Not archived: {args.url}")
+        print(text)
+    archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+import argparse
+import random
+import sqlite3
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+
+# Local stand-in for the job portals. The scraper is pointed at it with PORTAL_BASE_URL, which
+# rewrites https://<host>/<path>?<query> to <base>/<host>/<path>?<query>.
+#   record: forwards each request to the real host and stores the response in the archive
+#   replay: serves archived responses only, optionally with injected latency and failures
+#     python Moss/portal_replay.py record --archive portal_archive.sqlite3
+#     python Moss/portal_replay.py replay --archive portal_archive.sqlite3 --latency-ms 200 --rate-429 0.05
+
+FORWARDED_HEADERS = ["User-Agent", "Accept", "Accept-Language", "Referer", "Cookie"]
+
+
+class PortalArchive:
+    # Responses keyed by the local request path ("/<host>/<path>?<query>"), bodies zlib-compressed.
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                content_type TEXT NOT NULL DEFAULT '',
+                location TEXT NOT NULL DEFAULT '',
+                body BLOB NOT NULL,
+                recorded_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, content_type, location, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, content_type, location, body = row
+        return {"status": status, "content_type": content_type, "location": location, "body": zlib.decompress(body)}
+
+    def store(self, key: str, status: int, content_type: str, location: str, body: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, status, content_type, location, body, recorded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, status, content_type, location, zlib.compress(body, 6), time.time()),
+            )
+            self._conn.commit()
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT key FROM responses ORDER BY key")]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class FaultPlan:
+    # Which failures the replay server injects. Rates are per request; hosts_403 always get 403,
+    # the way JobsDB answers requests from cloud runner IPs.
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        rate_403: float = 0.0,
+        hosts_403: list[str] | None = None,
+        rate_429: float = 0.0,
+        retry_after: int = 1,
+        rate_truncate: float = 0.0,
+        seed: int | None = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_403 = rate_403
+        self.hosts_403 = set(hosts_403 or [])
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.rate_truncate = rate_truncate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def delay_seconds(self) -> float:
+        if self.latency_ms <= 0 and self.jitter_ms <= 0:
+            return 0.0
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def pick(self, host: str) -> str:
+        if host in self.hosts_403 or self._roll() < self.rate_403:
+            return "403"
+        if self._roll() < self.rate_429:
+            return "429"
+        if self._roll() < self.rate_truncate:
+            return "truncate"
+        return ""
+
+
+class PortalServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, archive: PortalArchive, mode: str, faults: FaultPlan | None = None):
+        super().__init__(address, PortalHandler)
+        self.archive = archive
+        self.mode = mode
+        self.faults = faults or FaultPlan()
+        self.base_url = f"http://{self.server_address[0]}:{self.server_address[1]}"
+        self.stats = {"served": 0, "recorded": 0, "missing": 0, "403": 0, "429": 0, "truncate": 0}
+        self._stats_lock = threading.Lock()
+
+    def bump(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def local_location(self, location: str) -> str:
+        # Keep redirects (e.g. JobThai's nodata=true page) inside the stand-in server.
+        parsed = urlparse(location)
+        if not parsed.netloc:
+            return location
+        query = f"?{parsed.query}" if parsed.query else ""
+        return f"{self.base_url}/{parsed.netloc}{parsed.path or '/'}{query}"
+
+
+class PortalHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        key = self.path
+        host = key.lstrip("/").split("/", 1)[0]
+
+        if self.server.mode == "record":
+            entry = self._record(key, host)
+        else:
+            entry = self.server.archive.get(key)
+
+        if entry is None:
+            self.server.bump("missing")
+            self._send(404, b"not in archive", "text/plain")
+            return
+
+        if self.server.mode == "replay":
+            delay = self.server.faults.delay_seconds()
+            if delay:
+                time.sleep(delay)
+
+            fault = self.server.faults.pick(host)
+            if fault:
+                self.server.bump(fault)
+            if fault == "403":
+                self._send(403, b"Forbidden", "text/plain")
+                return
+            if fault == "429":
+                self._send(429, b"Too Many Requests", "text/plain", {"Retry-After": str(self.server.faults.retry_after)})
+                return
+            if fault == "truncate":
+                self._send(entry["status"], entry["body"], entry["content_type"], truncate=True)
+                return
+
+        self.server.bump("served")
+        extra_headers = {"Location": entry["location"]} if entry["location"] else {}
+        self._send(entry["status"], entry["body"], entry["content_type"], extra_headers)
+
+    def _record(self, key: str, host: str) -> dict | None:
+        upstream_url = f"https:/{key}"
+        forwarded = {name: self.headers[name] for name in FORWARDED_HEADERS if self.headers.get(name)}
+        try:
+            response = requests.get(upstream_url, headers=forwarded, timeout=30, allow_redirects=False)
+        except requests.RequestException as error:
+            print(f"[Replay] upstream error for {upstream_url}: {error}")
+            return None
+
+        location = self.server.local_location(response.headers.get("Location", ""))
+        entry = {
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", ""),
+            "location": location,
+            "body": response.content,
+        }
+        self.server.archive.store(key, **entry)
+        self.server.bump("recorded")
+        return entry
+
+    def _send(self, status: int, body: bytes, content_type: str, extra_headers: dict | None = None, truncate: bool = False) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type or "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        if truncate:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        # A truncated response announces the full length and then stops half way.
+        self.wfile.write(body[: len(body) // 2] if truncate else body)
+
+
+def start_server(archive_path: str | Path, mode: str = "replay", host: str = "127.0.0.1", port: int = 0, faults: FaultPlan | None = None) -> PortalServer:
+    # Serves on a background thread; port=0 picks a free port, see server.base_url.
+    server = PortalServer((host, port), PortalArchive(archive_path), mode, faults)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stop_server(server: PortalServer) -> None:
+    server.shutdown()
+    server.server_close()
+    server.archive.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--archive", default=str(Path(__file__).resolve().parent / "portal_archive.sqlite3"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-403", type=float, default=0.0)
+    parser.add_argument("--hosts-403", nargs="*", default=[], help="hosts that always get 403, e.g. th.jobsdb.com")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--rate-truncate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    faults = FaultPlan(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_403=args.rate_403,
+        hosts_403=args.hosts_403,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        rate_truncate=args.rate_truncate,
+        seed=args.seed,
+    )
+    server = PortalServer((args.host, args.port), PortalArchive(args.archive), args.mode, faults)
+    print(f"[Replay] {args.mode} on {server.base_url} archive={args.archive} ({server.archive.count()} responses)")
+    print(f"[Replay] run the scraper with PORTAL_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"[Replay] {server.stats}")
+        server.server_close()
+        server.archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import re
+
+import pandas as pd
+
+LOCATION_PREFIX_PATTERN = re.compile(r"^(เขต|อ\.|อำเภอ|จ\.|จังหวัด)\s*")
+LOCATION_SPLIT_PATTERN = re.compile(r",|\||/")
+
+
+def collapse_spaces(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "")).strip()
+
+
+class ProvinceResolver:
+    # Resolves a free-text location to a Thai province name with one compiled pattern per script:
+    #   1. Thai names (canonical first, then aliases) anywhere in the text,
+    #   2. English names and aliases as whole words in the lowercased text,
+    #   3. optionally the last comma/pipe/slash part with its เขต/อ./จ. prefix stripped.
+    # The first name in priority order that occurs wins, as with the old per-name scans; the
+    # lookahead patterns report overlapping hits, and names nested inside a hit are added back
+    # from a precomputed table. Results are memoized per location string.
+
+    def __init__(self, en_to_thai: dict[str, str], thai_aliases: dict[str, str] | None = None):
+        thai_targets = {}
+        for thai_name in en_to_thai.values():
+            thai_targets.setdefault(thai_name, thai_name)
+        for alias, thai_name in (thai_aliases or {}).items():
+            thai_targets.setdefault(alias, thai_name)
+
+        self.thai_targets = thai_targets
+        self.thai_priority = {name: index for index, name in enumerate(thai_targets)}
+        self.thai_pattern = self._compile(thai_targets, r"(?=({}))")
+        self.thai_nested = self._nested(thai_targets, lambda inner, outer: inner in outer)
+
+        self.english_targets = dict(en_to_thai)
+        self.english_priority = {name: index for index, name in enumerate(en_to_thai)}
+        self.english_pattern = self._compile(en_to_thai, r"\b(?=({})\b)")
+        self.english_nested = self._nested(
+            en_to_thai, lambda inner, outer: re.search(rf"\b{re.escape(inner)}\b", outer) is not None
+        )
+
+        self._cache = {}
+
+    @staticmethod
+    def _compile(names, template: str) -> re.Pattern:
+        # Longest first, so a name never shadows a longer one starting at the same position.
+        alternation = "|".join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+        return re.compile(template.format(alternation))
+
+    @staticmethod
+    def _nested(names, contains) -> dict[str, list[str]]:
+        return {
+            outer: [inner for inner in names if inner != outer and contains(inner, outer)]
+            for outer in names
+        }
+
+    @staticmethod
+    def _first_hit(pattern: re.Pattern, text: str, nested: dict, priority: dict) -> str:
+        hits = set()
+        for match in pattern.finditer(text):
+            name = match.group(1)
+            hits.add(name)
+            hits.update(nested[name])
+        return min(hits, key=priority.__getitem__) if hits else ""
+
+    def _resolve_uncached(self, location_text: str, fallback_to_tail: bool) -> str:
+        location_clean = collapse_spaces(location_text)
+        if not location_clean:
+            return ""
+
+        thai_hit = self._first_hit(self.thai_pattern, location_clean, self.thai_nested, self.thai_priority)
+        if thai_hit:
+            return self.thai_targets[thai_hit]
+
+        english_hit = self._first_hit(
+            self.english_pattern, location_clean.lower(), self.english_nested, self.english_priority
+        )
+        if english_hit:
+            return self.english_targets[english_hit]
+
+        if not fallback_to_tail:
+            return ""
+
+        parts = [collapse_spaces(part) for part in LOCATION_SPLIT_PATTERN.split(location_clean) if collapse_spaces(part)]
+        if not parts:
+            return ""
+        return LOCATION_PREFIX_PATTERN.sub("", parts[-1]).strip()
+
+    def resolve(self, location_text: str, fallback_to_tail: bool = True) -> str:
+        key = (location_text or "", fallback_to_tail)
+        result = self._cache.get(key)
+        if result is None:
+            result = self._resolve_uncached(key[0], fallback_to_tail)
+            self._cache[key] = result
+        return result
+
+    def resolve_series(self, values: pd.Series, fallback_to_tail: bool = True) -> pd.Series:
+        # Each distinct location is resolved once, then broadcast back to the column.
+        text = values.fillna("").astype(str)
+        resolved = {value: self.resolve(value, fallback_to_tail) for value in text.unique()}
+        return text.map(resolved)
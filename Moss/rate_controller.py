@@ -0,0 +1,119 @@
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+MAX_RETRY_AFTER_SECONDS = 300.0
+
+
+def parse_retry_after(value: str | None) -> float:
+    # Retry-After is either delay-seconds or an HTTP date.
+    if not value:
+        return 0.0
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), MAX_RETRY_AFTER_SECONDS)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return min(max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds()), MAX_RETRY_AFTER_SECONDS)
+
+
+def is_throttle_status(status: int | None) -> bool:
+    # None means the request failed without a response (timeout, reset).
+    return status is None or status in (403, 429) or status >= 500
+
+
+class AdaptiveRateController:
+    # Per-host request pacing with additive increase / multiplicative decrease:
+    #   - every healthy response raises the host's rate by increase_qps, up to max_qps,
+    #   - 403/429/5xx, failed requests and latency above latency_factor x the host's running
+    #     average multiply the rate by decrease_factor, down to min_qps,
+    #   - Retry-After blocks the host until it has passed.
+    # Requests reserve evenly spaced slots, so concurrent threads share one rate per host.
+
+    def __init__(
+        self,
+        initial_qps: float = 2.0,
+        min_qps: float = 0.2,
+        max_qps: float = 5.0,
+        increase_qps: float = 0.1,
+        decrease_factor: float = 0.5,
+        latency_factor: float = 2.0,
+    ):
+        self.initial_qps = initial_qps
+        self.min_qps = min_qps
+        self.max_qps = max_qps
+        self.increase_qps = increase_qps
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _state(self, url: str) -> dict:
+        host = urlparse(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = {
+                "rate": self.initial_qps,
+                "next_slot": 0.0,
+                "blocked_until": 0.0,
+                "latency_avg": None,
+                "requests": 0,
+                "backoffs": 0,
+                "retry_after_waits": 0,
+            }
+        return self._hosts[host]
+
+    def reserve(self, url: str) -> float:
+        # Claims the host's next slot and returns how long the caller has to wait for it.
+        with self._lock:
+            state = self._state(url)
+            now = time.monotonic()
+            start = max(now, state["next_slot"], state["blocked_until"])
+            state["next_slot"] = start + 1.0 / state["rate"]
+            state["requests"] += 1
+            return start - now
+
+    def wait(self, url: str) -> None:
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    def observe(self, url: str, status: int | None, latency_seconds: float, retry_after: float = 0.0) -> None:
+        with self._lock:
+            state = self._state(url)
+            now = time.monotonic()
+
+            latency_avg = state["latency_avg"]
+            slow = latency_avg is not None and latency_seconds > self.latency_factor * latency_avg
+
+            if is_throttle_status(status) or slow:
+                state["rate"] = max(self.min_qps, state["rate"] * self.decrease_factor)
+                state["backoffs"] += 1
+                state["next_slot"] = max(state["next_slot"], now + 1.0 / state["rate"])
+            else:
+                state["rate"] = min(self.max_qps, state["rate"] + self.increase_qps)
+
+            if status is not None and status < 400:
+                # The average follows slow drifts, so a portal that is simply slower today is not throttled forever.
+                state["latency_avg"] = latency_seconds if latency_avg is None else 0.8 * latency_avg + 0.2 * latency_seconds
+
+            if retry_after > 0:
+                state["blocked_until"] = max(state["blocked_until"], now + retry_after)
+                state["retry_after_waits"] += 1
+
+    def rate(self, url: str) -> float:
+        with self._lock:
+            return self._state(url)["rate"]
+
+    def summary(self) -> str:
+        with self._lock:
+            return " | ".join(
+                f"{host}: {state['rate']:.2f} qps, {state['requests']} requests, "
+                f"{state['backoffs']} backoffs, {state['retry_after_waits']} Retry-After waits"
+                for host, state in self._hosts.items()
+            )
@@ -0,0 +1,145 @@
+# Rebuilds a crawl run's Scraped_All snapshot from the page archive (page_archive.py) with the current
+# parse_*/extract_* functions, e.g. after a selector fix or a new field. Nothing is fetched: detail pages
+# missing from the archive come back empty, like a failed request would.
+#   python Moss/reparse_archive.py -o reparsed.csv                       latest archived run
+#   python Moss/reparse_archive.py --run 20260301_010203 -o reparsed.csv --workers 8
+# Search pages are parsed per (portal, keyword) and detail pages in chunks, both on a process pool.
+import argparse
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+DETAIL_CHUNK_ROWS = 50
+
+# Set before the scraper is imported (main process and workers): no HTTP cache, checkpoints or network.
+os.environ["HTTP_CACHE"] = "0"
+os.environ["CHECKPOINT_ROWS"] = "0"
+
+import Scrape_Prototype_run as scraper  # noqa: E402
+from page_archive import PageArchive  # noqa: E402
+
+_archive = None
+_run_id = None
+
+
+def archived_get_text(job_url: str, cache_key: str, send) -> str:
+    # Stands in for scraper.cached_get_text; detail pages were archived under their cache key.
+    html = _archive.latest_text(cache_key, _run_id)
+    if html is None:
+        raise LookupError(f"Not archived: {cache_key}")
+    return html
+
+
+def offline_get(url: str, *args, **kwargs):
+    raise LookupError(f"reparse does not fetch pages: {url}")
+
+
+def init_worker(archive_path: str, run_id: str) -> None:
+    global _archive, _run_id
+    _archive = PageArchive(archive_path)
+    _run_id = run_id
+    scraper.cached_get_text = archived_get_text
+    scraper.portal_get = offline_get
+
+
+def parse_search_group(domain: str, keyword: str, pages: list[dict]) -> list[dict]:
+    # Same row filter as the crawl loops: title match, required fields, first occurrence of each URL.
+    portal = scraper.ASYNC_PORTALS[domain]
+    keyword_groups = scraper.keyword_match_groups_from_query(keyword)
+
+    rows = []
+    seen_urls = set()
+    for page in pages:
+        html = _archive.text(page["digest"])
+        for row in portal["parse_page"](html, page["page"], keyword):
+            if not row["job_url"] or (portal["require_title"] and not row["job_title"]):
+                continue
+            if not portal["title_matches"](row["job_title"], keyword_groups):
+                continue
+            if row["job_url"] in seen_urls:
+                continue
+            seen_urls.add(row["job_url"])
+            rows.append(row)
+    return rows
+
+
+def extract_detail_chunk(domain: str, rows: list[dict]) -> list[dict]:
+    detail = scraper.ASYNC_PORTALS[domain]["detail"]
+    for row in rows:
+        row.update(detail(row))
+        row.pop("raw_text", None)
+    return rows
+
+
+def reparse_run(archive_path: Path, run_id: str, workers: int) -> pd.DataFrame:
+    init_worker(str(archive_path), run_id)
+    search_pages = _archive.pages(run_id=run_id, phase="search")
+
+    groups = {}
+    for page in search_pages:
+        if page["domain"] in scraper.ASYNC_PORTALS:
+            groups.setdefault((page["domain"], page["keyword"]), []).append(page)
+    print(f"[Reparse] run {run_id}: {len(search_pages)} search pages in {len(groups)} portal/keyword groups")
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(str(archive_path), run_id)) as executor:
+        group_futures = {key: executor.submit(parse_search_group, *key, pages) for key, pages in groups.items()}
+        rows_by_domain = {}
+        for (domain, _), future in group_futures.items():
+            rows_by_domain.setdefault(domain, []).extend(future.result())
+
+        chunk_futures = [
+            (domain, executor.submit(extract_detail_chunk, domain, rows[start:start + DETAIL_CHUNK_ROWS]))
+            for domain, rows in rows_by_domain.items()
+            for start in range(0, len(rows), DETAIL_CHUNK_ROWS)
+        ]
+        print(f"[Reparse] {sum(len(rows) for rows in rows_by_domain.values())} rows, {len(chunk_futures)} detail chunks on {workers} workers")
+        detailed = {domain: [] for domain in rows_by_domain}
+        for domain, future in chunk_futures:
+            detailed[domain].extend(future.result())
+
+    frames = []
+    for domain, rows in detailed.items():
+        clean_fn, _ = scraper.PORTAL_EXPORTS[domain]
+        scraped_df = scraper.build_portal_frame(rows, domain).drop_duplicates(subset=["job_url"])
+        if not scraped_df.empty:
+            # Round-trip through CSV: the crawl builds Scraped_All from the re-read per-portal CSVs.
+            csv_text = scraper.format_posted_dates(clean_fn(scraped_df)).to_csv(index=False)
+            frames.append(pd.read_csv(io.StringIO(csv_text)))
+
+    job_all_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if scraper.CROSS_PORTAL_DEDUP and not job_all_df.empty:
+        job_all_df = scraper.assign_canonical_job_ids(job_all_df, scraper.DEDUP_THRESHOLD)
+    return job_all_df
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--archive", default=str(scraper.ARCHIVE_DIR / "page_archive.sqlite3"))
+    parser.add_argument("--run", default="latest", help="archived run id, or 'latest'")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("-o", "--output", required=True)
+    args = parser.parse_args()
+
+    archive_path = Path(args.archive)
+    if not archive_path.exists():
+        raise SystemExit(f"Archive not found: {archive_path}")
+
+    archive = PageArchive(archive_path)
+    runs = archive.runs()
+    archive.close()
+    if not runs:
+        raise SystemExit("The archive has no runs yet")
+    run_id = runs[-1] if args.run == "latest" else args.run
+    if run_id not in runs:
+        raise SystemExit(f"Unknown run: {run_id} (archived: {', '.join(runs)})")
+
+    job_all_df = reparse_run(archive_path, run_id, max(1, args.workers))
+    job_all_df.to_csv(args.output, index=False, encoding="utf-8-sig")
+    print(f"[Reparse] wrote {len(job_all_df)} rows -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import json
+import threading
+from pathlib import Path
+
+
+class RowCheckpoint:
+    # Append-only JSON-lines file of finished rows (search fields + detail fields) for one portal.
+    # Each row is flushed as soon as it is written, so a crash loses at most the row in flight;
+    # with resume=True the rows already on disk are loaded and their URLs are not fetched again.
+
+    def __init__(self, path: str | Path, resume: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.rows = {}
+        self._lock = threading.Lock()
+
+        if resume and self.path.exists():
+            with self.path.open("r", encoding="utf-8") as file:
+                for line in file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash can leave a half-written last line.
+                        continue
+                    if row.get("job_url"):
+                        self.rows[row["job_url"]] = row
+
+        self._file = self.path.open("a" if resume else "w", encoding="utf-8")
+
+    def has(self, job_url: str) -> bool:
+        return job_url in self.rows
+
+    def get(self, job_url: str) -> dict | None:
+        return self.rows.get(job_url)
+
+    def append(self, row: dict) -> None:
+        line = json.dumps(row, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
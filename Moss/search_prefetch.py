@@ -0,0 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SearchPagePrefetcher:
+    # Keeps the next `window` search pages in flight on a small thread pool, so pages N+1.. are already
+    # downloading while page N is parsed. Pages are still handed out strictly in order by get(page_num), so the
+    # caller's loop and its stop conditions (no cards, no keyword matches, only known postings) are unchanged.
+    # Use it as a context manager around the page loop: on exit (break, return or an exception) close() cancels
+    # the requests that have not started and drops the responses of the ones already in flight, so pages past
+    # the stop page are never parsed, archived or kept and no pool threads are left behind.
+    # window <= 1 fetches each page on the calling thread when it is asked for, exactly like the plain loop.
+    # Requests are still paced by the rate controller, so prefetching overlaps latency rather than adding load;
+    # the cost is up to window - 1 wasted requests per keyword on the last page.
+
+    def __init__(self, fetch_page, max_pages: int, window: int):
+        self.fetch_page = fetch_page
+        self.max_pages = max_pages
+        self.window = window
+        self.stats = {"requested": 0, "cancelled": 0, "dropped": 0}
+        self._futures = {}
+        self._executor = ThreadPoolExecutor(max_workers=window) if window > 1 else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get(self, page_num: int):
+        # fetch_page(page_num)'s response, or its exception.
+        if self._executor is None:
+            self.stats["requested"] += 1
+            return self.fetch_page(page_num)
+
+        for ahead in range(page_num, min(page_num + self.window, self.max_pages + 1)):
+            if ahead not in self._futures:
+                self._futures[ahead] = self._executor.submit(self.fetch_page, ahead)
+                self.stats["requested"] += 1
+        return self._futures.pop(page_num).result()
+
+    def close(self) -> None:
+        if self._executor is None:
+            return
+        for future in self._futures.values():
+            self.stats["cancelled" if future.cancel() else "dropped"] += 1
+        self._futures.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
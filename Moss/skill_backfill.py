@@ -0,0 +1,207 @@
+# Recomputes matched_skills / matched_skill_count / skill_* with the current SKILLS table for every job ever
+# scraped, e.g. after a new skill was added, and rewrites the Scraped_All snapshots and the history store.
+#   python Moss/skill_backfill.py                  rewrite everything in place
+#   python Moss/skill_backfill.py --dry-run        only report how many rows would change
+# Detail text comes from the page archive (newest archived detail page, parsed with the current extractors)
+# and, for runs without the archive, from the row checkpoints. Jobs with no stored detail text keep their old
+# flags; skill columns that did not exist yet are 0 for them. Matching runs on a process pool, one chunk of
+# documents per task. Every file is written to a temporary file next to it and swapped in with os.replace,
+# so an interrupted backfill leaves the old file. Do not run it while a scrape is writing the same directory.
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+import reparse_archive
+from job_history import HISTORY_FILE, canonical_job_url
+from page_archive import PageArchive
+from row_checkpoint import RowCheckpoint
+
+scraper = reparse_archive.scraper
+
+DOCUMENT_CHUNK = 256
+SKILL_FIELDS = ["matched_skills", "matched_skill_count", *scraper.SKILL_COLUMNS]
+# Detail text fields the portal extractors match skills on (JobThai: detail + qualification,
+# JobsDB: detail, JOBBKK: full text).
+SKILL_TEXT_FIELDS = ["job_detail_text", "job_qualification_text", "job_detail_full_text"]
+
+
+def is_skill_field(column: str) -> bool:
+    return column in ("matched_skills", "matched_skill_count") or column.startswith("skill_")
+
+
+def collect_documents(archive_path: Path, checkpoint_dir: Path) -> list[tuple[str, str, str]]:
+    # (canonical job URL, source, value): source "archive" -> value is the archived detail page key,
+    # "text" -> value is the stored detail text.
+    documents = {}
+
+    for path in sorted(checkpoint_dir.glob("*_rows.jsonl")) if checkpoint_dir.exists() else []:
+        checkpoint = RowCheckpoint(path, resume=True)
+        checkpoint.close()
+        for job_url, row in checkpoint.rows.items():
+            text = " ".join(str(row[field]) for field in SKILL_TEXT_FIELDS if row.get(field))
+            if text:
+                documents[canonical_job_url(job_url)] = (canonical_job_url(job_url), "text", text)
+
+    if archive_path.exists():
+        archive = PageArchive(archive_path)
+        # Ordered by run, so the newest copy of each detail page wins.
+        for page in archive.pages(phase="detail"):
+            if page["domain"] in scraper.ASYNC_PORTALS:
+                key = canonical_job_url(page["url"])
+                documents[key] = (key, "archive", page["url"])
+        archive.close()
+
+    return list(documents.values())
+
+
+def init_worker(archive_path: str | None) -> None:
+    if archive_path is not None:
+        reparse_archive.init_worker(archive_path, None)
+
+
+def skill_chunk(documents: list[tuple[str, str, str]]) -> list[tuple[str, dict]]:
+    results = []
+    for key, source, value in documents:
+        if source == "archive":
+            detail = scraper.ASYNC_PORTALS[scraper.portal_domain(value)]["detail"]({"job_url": value})
+            skills = {field: detail[field] for field in SKILL_FIELDS}
+        else:
+            skills = scraper.extract_skills(value)
+        results.append((key, {field: str(skills[field]) for field in SKILL_FIELDS}))
+    return results
+
+
+def recompute_skills(documents: list[tuple[str, str, str]], archive_path: Path, workers: int) -> dict[str, dict]:
+    chunks = [documents[start:start + DOCUMENT_CHUNK] for start in range(0, len(documents), DOCUMENT_CHUNK)]
+    initargs = (str(archive_path) if archive_path.exists() else None,)
+
+    skills_by_key = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=initargs) as executor:
+        for results in executor.map(skill_chunk, chunks):
+            skills_by_key.update(results)
+    return skills_by_key
+
+
+def skill_column_order(columns: list[str]) -> list[str]:
+    # The current skill fields take the place of the old skill block; other columns keep their order.
+    base = [column for column in columns if not is_skill_field(column)]
+    first_skill = next((index for index, column in enumerate(columns) if is_skill_field(column)), len(columns))
+    insert_at = sum(1 for column in columns[:first_skill] if not is_skill_field(column))
+    return base[:insert_at] + SKILL_FIELDS + base[insert_at:]
+
+
+def backfill_frame(df: pd.DataFrame, skills_by_key: dict[str, dict]) -> tuple[pd.DataFrame, int]:
+    # df holds the snapshot as text (dtype=str); returns the rewritten frame and the number of changed rows.
+    result = df.copy()
+    for column in SKILL_FIELDS:
+        if column not in result.columns:
+            result[column] = "0" if column != "matched_skills" else ""
+
+    keys = result["job_url"].map(canonical_job_url) if "job_url" in result.columns else pd.Series("", index=result.index)
+    known = keys.isin(skills_by_key.keys())
+    if known.any():
+        recomputed = pd.DataFrame.from_dict(skills_by_key, orient="index", columns=SKILL_FIELDS)
+        result.loc[known, SKILL_FIELDS] = recomputed.reindex(keys[known]).to_numpy()
+
+    result = result[skill_column_order(list(df.columns))]
+    before = df.reindex(columns=SKILL_FIELDS)
+    changed = (before.to_numpy() != result[SKILL_FIELDS].to_numpy()).any(axis=1).sum()
+    return result, int(changed)
+
+
+def replace_file(path: Path, write) -> None:
+    temp_path = path.with_name(f"{path.name}.tmp")
+    write(temp_path)
+    os.replace(temp_path, path)
+
+
+def backfill_snapshots(snapshot_dir: Path, skills_by_key: dict[str, dict], dry_run: bool) -> None:
+    for path in sorted(snapshot_dir.glob("jobs_all_scraped*.csv")):
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        result, changed = backfill_frame(df, skills_by_key)
+        print(f"[Backfill] {path.name}: {changed}/{len(df)} rows changed")
+        if dry_run:
+            continue
+
+        replace_file(path, lambda temp_path: result.to_csv(temp_path, index=False, encoding="utf-8-sig"))
+        parquet_path = path.with_suffix(".parquet")
+        if parquet_path.exists():
+            replace_file(parquet_path, lambda temp_path: scraper.to_typed_snapshot(result).to_parquet(
+                temp_path, index=False, compression="zstd"
+            ))
+
+
+def backfill_history(history_dir: Path, skills_by_key: dict[str, dict], dry_run: bool) -> None:
+    # Skill values of recomputed jobs are dropped from every change record and set once, in the job's first
+    # recorded change, so every run replays with the new values. Other jobs get 0 for skill columns they lack.
+    history_path = history_dir / HISTORY_FILE
+    if not history_path.exists():
+        return
+
+    with history_path.open("r", encoding="utf-8") as file:
+        records = [json.loads(line) for line in file if line.strip()]
+    committed_runs = {record["run"] for record in records if "key" not in record}
+
+    lines = []
+    seen_keys = set()
+    changed_keys = 0
+    for record in records:
+        if "key" not in record:
+            record["columns"] = skill_column_order(record.get("columns", []))
+            lines.append(record)
+            continue
+        if record["run"] not in committed_runs:
+            lines.append(record)
+            continue
+
+        key = record["key"]
+        first = key not in seen_keys
+        seen_keys.add(key)
+        if key in skills_by_key:
+            values = {column: value for column, value in record["set"].items() if not is_skill_field(column)}
+            if first:
+                values.update(skills_by_key[key])
+                changed_keys += 1
+        else:
+            values = record["set"]
+            if first:
+                values.update({
+                    column: "0" if column != "matched_skills" else ""
+                    for column in SKILL_FIELDS
+                    if column not in values
+                })
+        if values:
+            lines.append({**record, "set": values})
+
+    print(f"[Backfill] {HISTORY_FILE}: recomputed skills for {changed_keys}/{len(seen_keys)} jobs")
+    if dry_run:
+        return
+    replace_file(history_path, lambda temp_path: temp_path.write_text(
+        "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines), encoding="utf-8"
+    ))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dir", default=str(scraper.SCRAPED_ALL_DIR), help="Scraped_All directory")
+    parser.add_argument("--archive", default=str(scraper.ARCHIVE_DIR / "page_archive.sqlite3"))
+    parser.add_argument("--checkpoints", default=str(scraper.CHECKPOINT_DIR))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    archive_path = Path(args.archive)
+    documents = collect_documents(archive_path, Path(args.checkpoints))
+    print(f"[Backfill] {len(documents)} jobs with stored detail text, {len(scraper.SKILLS)} skills")
+
+    skills_by_key = recompute_skills(documents, archive_path, max(1, args.workers))
+    backfill_snapshots(Path(args.dir), skills_by_key, args.dry_run)
+    backfill_history(Path(args.dir), skills_by_key, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import re
+
+
+def normalize_for_skill_match(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).strip()
+
+
+class SkillMatcher:
+    # Normalized text is lowercase [a-z0-9] tokens joined by single spaces, so the old
+    # (?<![a-z0-9])variant(?![a-z0-9]) search is the same as "the variant's tokens appear
+    # consecutively in the text". SKILLS is compiled once into a token index:
+    #   - one-token variants are looked up in the set of text tokens,
+    #   - multi-token variants are only checked when their first token occurs in the text.
+    # Every variant is tested independently, so overlapping variants of different skills
+    # ("sql server" / "sql") match exactly as before, which a single regex alternation would not.
+
+    def __init__(self, skills: dict[str, list[str]]):
+        self.skill_names = list(skills)
+        self.single_token = {}
+        self.multi_token = {}
+
+        for skill_name, variants in skills.items():
+            for variant in variants:
+                variant_norm = normalize_for_skill_match(variant)
+                if not variant_norm:
+                    continue
+
+                tokens = variant_norm.split(" ")
+                if len(tokens) == 1:
+                    self.single_token.setdefault(variant_norm, set()).add(skill_name)
+                else:
+                    self.multi_token.setdefault(tokens[0], []).append((f" {variant_norm} ", skill_name))
+
+    def match(self, text: str) -> list[str]:
+        normalized_text = normalize_for_skill_match(text)
+        if not normalized_text:
+            return []
+
+        tokens = set(normalized_text.split(" "))
+        found = set()
+
+        for token in tokens & self.single_token.keys():
+            found |= self.single_token[token]
+
+        padded_text = None
+        for token in tokens & self.multi_token.keys():
+            if padded_text is None:
+                padded_text = f" {normalized_text} "
+            for padded_variant, skill_name in self.multi_token[token]:
+                if skill_name not in found and padded_variant in padded_text:
+                    found.add(skill_name)
+
+        return [name for name in self.skill_names if name in found]
+
+    def extract(self, text: str) -> dict:
+        matched = self.match(text)
+        matched_set = set(matched)
+        skill_flags = {f"skill_{name}": int(name in matched_set) for name in self.skill_names}
+
+        return {
+            "matched_skills": "|".join(matched),
+            "matched_skill_count": len(matched),
+            **skill_flags,
+        }
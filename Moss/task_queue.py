@@ -0,0 +1,227 @@
+import argparse
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Persistent crawl task queue in one SQLite file, shared by every worker thread, process or runner pointed at it.
+#   search tasks: (run, portal, keyword, page) with the keyword's search URL
+#   detail tasks: (run, portal, job URL), one per posting per run whichever keyword found it
+# A worker leases one task at a time for lease_seconds. A lease that runs out (crashed or killed worker) makes
+# the task available again, so an interrupted crawl resumes where it stopped when it is started with the same
+# run id. Failed tasks wait attempt x retry_delay seconds and are retried until they have been leased
+# max_attempts times, then marked failed.
+# Enqueueing is idempotent (the task key is unique), so several runners can seed the same run.
+# Runners on different machines need a file system with working SQLite locking (not most network shares).
+
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 3
+RETRY_DELAY_SECONDS = 30
+
+
+class CrawlTaskQueue:
+    def __init__(
+        self,
+        path: str | Path,
+        lease_seconds: float = LEASE_SECONDS,
+        max_attempts: int = MAX_ATTEMPTS,
+        retry_delay: float = RETRY_DELAY_SECONDS,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                keyword TEXT NOT NULL DEFAULT '',
+                page INTEGER NOT NULL DEFAULT 0,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT NOT NULL DEFAULT '',
+                lease_expires REAL NOT NULL DEFAULT 0, -- leased: lease end; pending: not before (retry delay)
+                result TEXT NOT NULL DEFAULT '',
+                error TEXT NOT NULL DEFAULT '',
+                updated_at REAL NOT NULL,
+                UNIQUE (run_id, kind, domain, keyword, page, url)
+            );
+            CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(run_id, status, kind);
+            """
+        )
+
+    def enqueue(self, run_id: str, kind: str, domain: str, url: str, keyword: str = "", page: int = 0) -> bool:
+        # False when the task already exists (done, leased or waiting).
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO tasks (run_id, kind, domain, keyword, page, url, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, kind, domain, keyword, page, url, time.time()),
+            )
+            return cursor.rowcount == 1
+
+    def _domain_filter(self, domains: list[str] | None) -> tuple[str, list]:
+        if not domains:
+            return "", []
+        return f" AND domain IN ({', '.join('?' for _ in domains)})", list(domains)
+
+    def lease(self, run_id: str, worker_id: str, domains: list[str] | None = None) -> dict | None:
+        # Claims the oldest available task (search pages before details, so pagination keeps moving).
+        domain_sql, domain_params = self._domain_filter(domains)
+        with self._lock:
+            now = time.time()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Tasks whose last allowed lease ran out without a result.
+                self._conn.execute(
+                    "UPDATE tasks SET status = 'failed', error = 'lease expired', updated_at = ? "
+                    "WHERE run_id = ? AND status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                    (now, run_id, now, self.max_attempts),
+                )
+                row = self._conn.execute(
+                    "SELECT task_id, kind, domain, keyword, page, url, attempts FROM tasks "
+                    "WHERE run_id = ? AND status IN ('pending', 'leased') AND lease_expires <= ?"
+                    f"{domain_sql} ORDER BY kind = 'detail', task_id LIMIT 1",
+                    [run_id, now, *domain_params],
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+
+                task_id, kind, domain, keyword, page, url, attempts = row
+                self._conn.execute(
+                    "UPDATE tasks SET status = 'leased', attempts = attempts + 1, lease_owner = ?, lease_expires = ?, "
+                    "updated_at = ? WHERE task_id = ?",
+                    (worker_id, now + self.lease_seconds, now, task_id),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return {
+            "task_id": task_id,
+            "run_id": run_id,
+            "kind": kind,
+            "domain": domain,
+            "keyword": keyword,
+            "page": page,
+            "url": url,
+            "attempt": attempts + 1,
+        }
+
+    def complete(self, task: dict, worker_id: str, result) -> bool:
+        # False when the lease was lost (expired and taken over); the other worker's result counts.
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET status = 'done', result = ?, error = '', lease_expires = 0, updated_at = ? "
+                "WHERE task_id = ? AND status = 'leased' AND lease_owner = ?",
+                (json.dumps(result, ensure_ascii=False, default=str), time.time(), task["task_id"], worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, task: dict, worker_id: str, error: str) -> None:
+        status = "failed" if task["attempt"] >= self.max_attempts else "pending"
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE tasks SET status = ?, error = ?, lease_expires = ?, updated_at = ? "
+                "WHERE task_id = ? AND status = 'leased' AND lease_owner = ?",
+                (status, error[:500], now + task["attempt"] * self.retry_delay, now, task["task_id"], worker_id),
+            )
+
+    def is_drained(self, run_id: str, domains: list[str] | None = None) -> bool:
+        # No task is waiting or leased, i.e. every task is done or failed.
+        domain_sql, domain_params = self._domain_filter(domains)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT COUNT(*) FROM tasks WHERE run_id = ? AND status IN ('pending', 'leased'){domain_sql}",
+                [run_id, *domain_params],
+            ).fetchone()
+        return row[0] == 0
+
+    def results(self, run_id: str, kind: str, domain: str | None = None, keyword: str | None = None) -> list[dict]:
+        query = "SELECT domain, keyword, page, url, result FROM tasks WHERE run_id = ? AND kind = ? AND status = 'done'"
+        params = [run_id, kind]
+        if domain is not None:
+            query += " AND domain = ?"
+            params.append(domain)
+        if keyword is not None:
+            query += " AND keyword = ?"
+            params.append(keyword)
+        query += " ORDER BY domain, keyword, page, task_id"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {"domain": domain, "keyword": keyword, "page": page, "url": url, "result": json.loads(result)}
+            for domain, keyword, page, url, result in rows
+        ]
+
+    def failed_tasks(self, run_id: str) -> list[dict]:
+        columns = ["kind", "domain", "keyword", "page", "url", "attempts", "error"]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM tasks WHERE run_id = ? AND status = 'failed' ORDER BY task_id",
+                (run_id,),
+            ).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def progress(self, run_id: str) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, status, COUNT(*) FROM tasks WHERE run_id = ? GROUP BY kind, status", (run_id,)
+            ).fetchall()
+        progress = {}
+        for kind, status, count in rows:
+            progress.setdefault(kind, {})[status] = count
+        return progress
+
+    def summary(self, run_id: str) -> str:
+        return " | ".join(
+            f"{kind}: " + ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+            for kind, counts in sorted(self.progress(run_id).items())
+        )
+
+    def runs(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT run_id FROM tasks ORDER BY run_id")]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queue", default=str(Path(__file__).resolve().parent / "Queue" / "crawl_queue.sqlite3"))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("runs", help="list queued runs with their progress")
+    failed_parser = subparsers.add_parser("failed", help="list the failed tasks of a run")
+    failed_parser.add_argument("run_id")
+    args = parser.parse_args()
+
+    queue = CrawlTaskQueue(args.queue)
+    if args.command == "runs":
+        for run_id in queue.runs():
+            print(f"{run_id}  {queue.summary(run_id)}")
+    elif args.command == "failed":
+        for task in queue.failed_tasks(args.run_id):
+            print(
+                f"{task['kind']} {task['domain']} {task['keyword']!r} page={task['page']} "
+                f"attempts={task['attempts']} {task['url']}: {task['error']}"
+            )
+    queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import sys
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from job_dedup import assign_canonical_job_ids  # noqa: E402
+
+SKILLS = "python|sql & database|excel|powerbi|tableau|spark|aws|etl|airflow|docker|statistics|git"
+
+
+def job_row(title: str, company: str = "บริษัท ไทยดาต้า จำกัด", domain: str = "JobThai", index: int = 0, **values) -> dict:
+    return {
+        "domain": domain,
+        "job_title": title,
+        "company": company,
+        "province_name": "กรุงเทพมหานคร",
+        "posted_date": "02/24/2026",
+        "matched_skills": SKILLS,
+        "job_url": f"https://www.jobthai.com/th/job/{index}",
+        **values,
+    }
+
+
+class CanonicalJobIdTest(unittest.TestCase):
+    def test_distinct_titles_at_one_employer_stay_separate(self):
+        titles = [
+            "Data Analyst",
+            "Data Engineer",
+            "Senior Data Engineer",
+            "BI Developer",
+            "Marketing Data Analyst",
+            "Data Analytics Specialist",
+        ]
+        df = pd.DataFrame([job_row(title, index=index) for index, title in enumerate(titles)])
+        self.assertEqual(assign_canonical_job_ids(df)["canonical_job_id"].nunique(), len(titles))
+
+    def test_same_posting_on_several_portals_is_merged(self):
+        df = pd.DataFrame([
+            job_row("Data Analyst", index=1),
+            job_row("Data Analyst", company="ไทยดาต้า จำกัด", domain="JobsDB", job_url="https://th.jobsdb.com/th/job/9?ref=x"),
+            job_row(
+                "Data Analyst (ด่วน)",
+                domain="JOBBKK",
+                job_url="https://jobbkk.com/jobs/detailurgent/5/5",
+                posted_date="02/26/2026",
+            ),
+        ])
+        self.assertEqual(assign_canonical_job_ids(df)["canonical_job_id"].nunique(), 1)
+
+    def test_other_employer_province_or_date_stay_separate(self):
+        df = pd.DataFrame([
+            job_row("Data Analyst", index=1),
+            job_row("Data Analyst", company="KBTG", index=2),
+            job_row("Data Analyst", province_name="ชลบุรี", index=3),
+            job_row("Data Analyst", posted_date="12/01/2025", index=4),
+        ])
+        self.assertEqual(assign_canonical_job_ids(df)["canonical_job_id"].nunique(), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import page_archive  # noqa: E402
+from page_archive import PageArchive  # noqa: E402
+
+
+class DictionaryTrainingTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archive = PageArchive(Path(self.tmp.name) / "archive.sqlite3", train_samples=3)
+        self.archive.codec = "zlib"
+
+    def tearDown(self):
+        self.archive.close()
+        self.tmp.cleanup()
+
+    def test_failed_training_stores_pages_without_dictionary(self):
+        with mock.patch.object(page_archive, "train_zlib_dictionary", side_effect=ValueError("sample too small")) as train:
+            digests = [self.archive.store("run", f"https://x/{i}", f"<p>{i}</p>", domain="JobsDB") for i in range(6)]
+
+        self.assertEqual([self.archive.text(digest) for digest in digests], [f"<p>{i}</p>" for i in range(6)])
+        # Training is attempted once per run, not on every later page.
+        self.assertEqual(train.call_count, 1)
+
+    def test_uniform_pages_without_common_lines_store_without_dictionary(self):
+        digests = [self.archive.store("run", f"https://x/{i}", f"<p>{i}</p>", domain="JobsDB") for i in range(6)]
+
+        self.assertEqual([self.archive.text(digest) for digest in digests], [f"<p>{i}</p>" for i in range(6)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+from datetime import datetime
+
+import pandas as pd
+
+# Column-wise parsers for the posted_date formats the portals use. Each takes the raw text
+# column and returns datetime64 dates (midnight), with NaT where the text does not parse.
+
+THAI_MONTHS = {
+    "ม.ค.": 1,
+    "ก.พ.": 2,
+    "มี.ค.": 3,
+    "เม.ย.": 4,
+    "พ.ค.": 5,
+    "มิ.ย.": 6,
+    "ก.ค.": 7,
+    "ส.ค.": 8,
+    "ก.ย.": 9,
+    "ต.ค.": 10,
+    "พ.ย.": 11,
+    "ธ.ค.": 12,
+}
+THAI_SHORT_DATE_PATTERN = r"^(\d{1,2})\s+([ก-๙\.]+)\s+(\d{2})$"
+
+RELATIVE_UNIT_SECONDS = {
+    "นาที": 60,
+    "ชั่วโมง": 3600,
+    "วัน": 86400,
+    "สัปดาห์": 7 * 86400,
+    "เดือน": 30 * 86400,
+}
+RELATIVE_DATE_PATTERN = r"(\d+)\s*(นาที|ชั่วโมง|วัน|สัปดาห์|เดือน)ที่ผ่านมา"
+
+
+def as_text(values: pd.Series) -> pd.Series:
+    return values.fillna("").astype(str)
+
+
+def parse_thai_short_dates(values: pd.Series) -> pd.Series:
+    # JobThai: "5 ก.พ. 69" -> day, Thai month abbreviation, two-digit Buddhist-era year (2569 B.E. = 2026).
+    parts = as_text(values).str.strip().str.extract(THAI_SHORT_DATE_PATTERN)
+
+    date_parts = pd.DataFrame({
+        "year": pd.to_numeric(parts[2], errors="coerce") + 2500 - 543,
+        "month": parts[1].map(THAI_MONTHS),
+        "day": pd.to_numeric(parts[0], errors="coerce"),
+    })
+    # Invalid days (31 ก.พ.) and unknown months become NaT.
+    return pd.to_datetime(date_parts, errors="coerce")
+
+
+def parse_jobbkk_posted_dates(values: pd.Series) -> pd.Series:
+    # JOBBKK: "05/02/2026 14:30", already in A.D.
+    parsed = pd.to_datetime(as_text(values), format="%d/%m/%Y %H:%M", errors="coerce")
+    return parsed.dt.normalize()
+
+
+def parse_relative_posted_dates(values: pd.Series, now_dt: datetime | None = None) -> pd.Series:
+    # JobsDB: "3 วันที่ผ่านมา". One reference time for the whole column, so rows scraped around
+    # midnight agree on "today".
+    reference = pd.Timestamp(now_dt or datetime.now())
+    parts = as_text(values).str.extract(RELATIVE_DATE_PATTERN)
+
+    amounts = pd.to_numeric(parts[0], errors="coerce")
+    unit_seconds = parts[1].map(RELATIVE_UNIT_SECONDS)
+    offsets = pd.to_timedelta(amounts * unit_seconds, unit="s")
+
+    return (reference - offsets).dt.normalize()
+
+
+def parse_iso_dates(values: pd.Series) -> pd.Series:
+    # Page-state timestamps ("2026-02-24T06:00:00.000Z"), taken as Bangkok calendar days; NaT for other text.
+    text = as_text(values)
+    iso_text = text.where(text.str.match(r"^\d{4}-\d{2}-\d{2}"))
+    absolute = pd.to_datetime(iso_text, format="ISO8601", errors="coerce", utc=True)
+    return absolute.dt.tz_convert("Asia/Bangkok").dt.tz_localize(None).dt.normalize()
+
+
+def parse_jobsdb_posted_dates(values: pd.Series, now_dt: datetime | None = None) -> pd.Series:
+    # JobsDB rows carry the ISO listingDate from the page state, or the relative card text when the
+    # page was parsed from HTML.
+    return parse_iso_dates(values).fillna(parse_relative_posted_dates(values, now_dt))
+
+
+def parse_jobthai_posted_dates(values: pd.Series) -> pd.Series:
+    # JobThai rows carry the ISO postedDate from __NEXT_DATA__, or "5 ก.พ. 69" from the card HTML.
+    return parse_iso_dates(values).fillna(parse_thai_short_dates(values))
@@ -15,8 +15,13 @@ def get_latest_scrape_datetime_text(scraped_dir: Path) -> str:
     date_pattern = re.compile(r"(\d{8})(?:_(\d{6}))?")
     latest_dt = None
 
-    for csv_path in scraped_dir.glob("*.csv"):
-        match = date_pattern.search(csv_path.stem)
+    names = [csv_path.stem for csv_path in scraped_dir.glob("*.csv")]
+    runs_path = scraped_dir / "job_history_runs.csv"
+    if runs_path.exists():
+        names += pd.read_csv(runs_path, dtype=str)["run_id"].dropna().tolist()
+
+    for name in names:
+        match = date_pattern.search(name)
         if not match:
             continue
 
@@ -126,8 +131,19 @@ date_range = st.sidebar.date_input(
 
 
 
-# ตัวดึงข้อมูลจากไฟล์ CSV
-df = pd.read_csv(Path("Moss/Scraped_All/jobs_all_scraped.csv"))
+# ตัวดึงข้อมูล (ใช้ Parquet ถ้ามี เร็วกว่า CSV)
+snapshot_parquet = Path("Moss/Scraped_All/jobs_all_scraped.parquet")
+snapshot_csv = Path("Moss/Scraped_All/jobs_all_scraped.csv")
+# A Parquet snapshot older than the CSV is stale (the last run could not write it).
+if snapshot_parquet.exists() and (
+    not snapshot_csv.exists() or snapshot_parquet.stat().st_mtime >= snapshot_csv.stat().st_mtime
+):
+    df = pd.read_parquet(snapshot_parquet)
+    # Categoricals would keep unused categories in value_counts/map below.
+    for column in df.select_dtypes("category").columns:
+        df[column] = df[column].astype(object)
+else:
+    df = pd.read_csv(snapshot_csv)
 
 df["mid_salary"] = df[["min_salary","max_salary"]].mean(axis=1)
 df_all = df.copy()
@@ -312,7 +328,13 @@ st.title(
 c1,c2,c3,c4 = st.columns(4)
 
 #จำนวนงานทั้งหมด
-c1.metric("Total Jobs", len(df_show))
+# The same posting on several portals shares one canonical_job_id.
+df_postings = (
+    df_show.drop_duplicates(subset=["canonical_job_id"])
+    if "canonical_job_id" in df_show.columns
+    else df_show
+)
+c1.metric("Total Jobs", len(df_postings))
 
 #ค่าเฉลี่ยเงินเดือน
 avg = df_show["mid_salary"].mean()
@@ -503,7 +525,7 @@ with g2:
     if len(skill_cols) == 0:
         st.info("No skill columns found")
     else:
-        skill_counts = df_show[skill_cols].sum().sort_values(ascending=False)
+        skill_counts = df_postings[skill_cols].sum().sort_values(ascending=False)
         skill_counts = skill_counts[skill_counts > 0]
 
         if len(skill_counts) > top_skill_n: